@@ -6,6 +6,8 @@ import os
 from tkinter import filedialog, Tk
 from openpyxl import Workbook
 import xlsxwriter
+from models.modulus import secant_modulus_windows
+from utils.helpers import interpolate_at
 
 class YoungModulusAnalyzer:
     def __init__(self):
@@ -75,26 +77,7 @@ class YoungModulusAnalyzer:
         S1 = S[Start:Finish + 1]
 
         w = 2 * int(np.ceil(sr))
-        n = len(F1) // w
-
-        Pr = np.zeros(n)
-        E1 = np.zeros(n)
-        Eps1 = np.zeros(n)
-
-        for i in range(n):
-            idx1 = i * w
-            idx2 = (i + 1) * w - 1
-            if idx2 >= len(F1):
-                idx2 = len(F1) - 1
-
-            Pr[i] = (F1[idx1] + F1[idx2]) / 2 / self.area * 1e-6
-            delta_F = F1[idx2] - F1[idx1]
-            delta_S = S1[idx2] - S1[idx1]
-
-            if delta_S != 0:
-                E1[i] = (delta_F / self.area * 1e-6) / (delta_S / self.initial_height)
-
-            Eps1[i] = (S1[idx1] + S1[idx2]) / 2 / self.initial_height
+        Pr, E1, Eps1 = secant_modulus_windows(F1, S1, self.area, self.initial_height, w)
 
         if len(Pr) > 0:
             Pr = Pr - Pr[0]
@@ -205,17 +188,11 @@ class YoungModulusAnalyzer:
             'Young\'s Modulus, MPa': E1
         })
 
-        def find_nearest(value):
-            idx = (np.abs(Eps1 * 100 - value)).argmin()
-            return Pr[idx], Eps1[idx] * 100, E1[idx]
-
-        p5, eps5, e5 = find_nearest(5)
-        p10, eps10, e10 = find_nearest(10)
-        p20, eps20, e20 = find_nearest(20)
+        levels = interpolate_at(Eps1 * 100, [5, 10, 20], {'MPa': E1})
 
         Result2 = pd.DataFrame({
             '%': [5, 10, 20],
-            'MPa': [e5, e10, e20]
+            'MPa': levels['MPa']
         })
 
 if __name__ == "__main__":
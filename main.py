@@ -1,9 +1,12 @@
 import sys
+import multiprocessing
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtGui import QFont
 from views.main_window import YoungModulusApp
 
 if __name__ == "__main__":
+    # Пакетная обработка запускает процессы, в том числе из собранного .exe
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
     
@@ -0,0 +1,141 @@
+import argparse
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+from models.data_processor import DataProcessor
+from models.figures import ResultFigures
+from models.report_generator import save_results
+
+SUMMARY_FILE = 'Сводная_таблица.xlsx'
+# Файлы больше этого размера обрабатываются потоково (только таблица циклов)
+STREAM_FILE_SIZE = 512 * 2**20
+
+
+def process_specimen(file_path, params, output_dir):
+    """
+    Полная обработка одного образца в отдельном процессе: расчёт, рисунки,
+    Excel и протокол Word в папке Результаты_<имя> - та же выгрузка, что и
+    сохранение в окне (save_results). params - геометрия, масса, шаблон, а также
+    настройки окна: settings (DataProcessor.settings), style (оформление графиков),
+    save_C_stat. Возвращает строку сводной таблицы.
+    """
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    summary = {'Образец': name, 'Файл': file_path}
+    try:
+        width = params['width']
+        length = params['length']
+        initial_height = params['height']
+
+        processor = DataProcessor()
+        processor.apply_settings(params.get('settings', {}))
+        # Каждый файл читается один раз, кэш только занял бы место
+        processor.loader.cache.max_size_mb = 0
+        save_path = os.path.join(output_dir, f"Результаты_{name}")
+        os.makedirs(save_path, exist_ok=True)
+        if params.get('stream') or os.path.getsize(file_path) > STREAM_FILE_SIZE:
+            return process_long_specimen(processor, file_path, params, save_path, summary)
+
+        processor.analyze(file_path, width, length, initial_height)
+
+        figures = ResultFigures(style=params.get('style'))
+        figures.render(processor, name)
+        sample = {'name': name, 'width': width, 'length': length, 'height': initial_height,
+                  'mass': params.get('mass'), 'protocol': params.get('protocol')}
+        save_results(processor, figures, save_path, name, sample, params.get('template', 'ДС'),
+                     params.get('save_C_stat', False))
+
+        summary.update({
+            'Точек': processor.record.length,
+            'Коэффициент формы': processor.form_factor,
+            'Циклов': len(processor.cycles),
+            'Макс. нагрузка, Н': float(np.max(processor.forse__)),
+            'Макс. удельное давление, МПа': float(np.nanmax(processor.stress)),
+            'Макс. отн. деформация, %': float(np.nanmax(processor.strain)) * 100,
+            'Средний модуль упругости, МПа': float(np.mean(processor.E1)) if processor.E1 is not None and len(processor.E1) else np.nan,
+            'Ошибка': '',
+        })
+    except Exception as e:
+        summary['Ошибка'] = str(e)
+    return summary
+
+
+def process_long_specimen(processor, file_path, params, save_path, summary):
+    """
+    Потоковая обработка длинной записи (DataProcessor.process_stream): в память
+    не загружается весь файл, поэтому вместо рисунков и протокола сохраняется
+    только таблица итогов по циклам.
+    """
+    cycles = processor.process_stream(file_path, params['width'], params['length'], params['height'])
+    cycles.to_excel(os.path.join(save_path, f"{summary['Образец']}_циклы.xlsx"), index=False)
+    summary.update({
+        'Точек': int(cycles['Конец'].iloc[-1]) if len(cycles) else 0,
+        'Коэффициент формы': processor.form_factor,
+        'Циклов': len(cycles),
+        'Макс. нагрузка, Н': float(cycles['Макс. нагрузка, Н'].max()) if len(cycles) else np.nan,
+        'Макс. удельное давление, МПа': float(cycles['Макс. удельное давление, МПа'].max()) if len(cycles) else np.nan,
+        'Макс. отн. деформация, %': float(cycles['Макс. отн. деформация, %'].max()) if len(cycles) else np.nan,
+        'Средний модуль упругости, МПа': np.nan,
+        'Ошибка': '',
+    })
+    return summary
+
+
+def run_batch(folder, params, output_dir=None, workers=None, progress=None, should_cancel=None):
+    """
+    Обрабатывает все .txt файлы папки в пуле процессов и сохраняет сводную таблицу.
+    progress(готово, всего, строка_сводки) вызывается по завершении каждого образца.
+    should_cancel() -> True снимает ещё не начатые образцы, в сводную таблицу
+    попадают только обработанные.
+    """
+    files = sorted(glob.glob(os.path.join(folder, '*.txt')))
+    output_dir = output_dir or folder
+    os.makedirs(output_dir, exist_ok=True)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(process_specimen, f, params, output_dir) for f in files]
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            summary = future.result()
+            results.append(summary)
+            status = summary['Ошибка'] or 'готово'
+            print(f"[{len(results)}/{len(files)}] {summary['Образец']}: {status}")
+            if progress is not None:
+                progress(len(results), len(files), summary)
+            if should_cancel is not None and should_cancel():
+                # Уже запущенные образцы дорабатываются и попадают в сводку, остальные снимаются
+                for pending in futures:
+                    pending.cancel()
+
+    summary = pd.DataFrame(results)
+    if len(summary):
+        summary = summary.sort_values('Образец').reset_index(drop=True)
+        summary.to_excel(os.path.join(output_dir, SUMMARY_FILE), index=False)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетная обработка папки с файлами испытаний")
+    parser.add_argument('folder', help="Папка с .txt файлами")
+    parser.add_argument('--width', type=float, required=True, help="Ширина образца, мм")
+    parser.add_argument('--length', type=float, required=True, help="Длина образца, мм")
+    parser.add_argument('--height', type=float, required=True, help="Высота образца, мм")
+    parser.add_argument('--mass', type=float, default=None, help="Масса образца")
+    parser.add_argument('--template', default='ДС', choices=['ДС', 'НИИСФ'])
+    parser.add_argument('--output', default=None, help="Папка для результатов (по умолчанию папка данных)")
+    parser.add_argument('--workers', type=int, default=None, help="Число процессов (по умолчанию все ядра)")
+    parser.add_argument('--stream', action='store_true',
+                        help="Потоковая обработка всех файлов: только таблица циклов "
+                             f"(файлы больше {STREAM_FILE_SIZE // 2**20} МБ - всегда)")
+    args = parser.parse_args()
+
+    params = {'width': args.width, 'length': args.length, 'height': args.height,
+              'mass': args.mass, 'template': args.template, 'stream': args.stream}
+    run_batch(args.folder, params, args.output, args.workers)
+
+
+if __name__ == '__main__':
+    main()
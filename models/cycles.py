@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+
+class CycleTable:
+    """
+    Таблица циклов нагружения на массивах. Для цикла k: начало start[k], верхний пик
+    peak[k], впадина разгрузки valley[k] и конец end[k] (индексы после обрезки,
+    конец не входит в цикл). Строится один раз на расчёт, графики и выгрузки
+    берут границы и итоги циклов отсюда.
+    """
+
+    def __init__(self, peaks_upper, peaks_lower, length):
+        upper = np.asarray(peaks_upper, dtype=np.int64)
+        lower = np.asarray(peaks_lower, dtype=np.int64)
+        n = min(len(upper), len(lower))
+        # reduceat в summarize требует строго возрастающих начал: цикл, начало которого
+        # не правее начала предыдущего (совпавшие после сдвига впадины), отбрасывается
+        # вместе со своим пиком
+        keep = np.ones(n, dtype=bool)
+        if n > 1:
+            keep[1:] = lower[1:n] > np.maximum.accumulate(lower[:n])[:-1]
+        self.start = lower[:n][keep]
+        self.peak = upper[:n][keep]
+        n = len(self.start)
+        # Цикл заканчивается началом следующего, последний - концом записи
+        self.end = np.append(self.start[1:], length).astype(np.int64) if n else np.empty(0, dtype=np.int64)
+        self.valley = self.end - 1
+        self.max_force = np.empty(0)
+        self.max_displacement = np.empty(0)
+        self.max_stress = np.empty(0)
+        self.max_strain = np.empty(0)
+        self.loop_area = np.empty(0)  # площадь петли гистерезиса, Н·мм
+        self.loading_energy = np.empty(0)  # работа нагружения до пика, Н·мм
+        self.secant_stiffness = np.empty(0)  # (F пика - F начала) / (S пика - S начала), Н/мм
+
+    def __len__(self):
+        return len(self.start)
+
+    def bounds(self, k):
+        """Срез отсчётов цикла k"""
+        return slice(int(self.start[k]), int(self.end[k]))
+
+    def summarize(self, force, displacement, stress, strain):
+        """
+        Итоги по всем циклам без построения графиков: максимумы по отрезкам одним
+        reduceat, площади и работа - разностями накопленной суммы трапеций,
+        впадины разгрузки - одним reduceat по склеенным участкам [пик, конец).
+        """
+        if not len(self):
+            return
+        self.max_force = np.maximum.reduceat(force, self.start)
+        self.max_displacement = np.maximum.reduceat(displacement, self.start)
+        self.max_stress = np.maximum.reduceat(stress, self.start)
+        self.max_strain = np.maximum.reduceat(strain, self.start)
+
+        # Интеграл F dS от 0 до каждого отсчёта
+        work = np.zeros(len(force))
+        np.cumsum(np.diff(displacement) * (force[1:] + force[:-1]) / 2, out=work[1:])
+        last = self.end - 1
+        # Петля замыкается отрезком от последней точки цикла к первой
+        closing = (displacement[self.start] - displacement[last]) * (force[self.start] + force[last]) / 2
+        self.loop_area = np.abs(work[last] - work[self.start] + closing)
+        self.loading_energy = work[self.peak] - work[self.start]
+        delta_S = displacement[self.peak] - displacement[self.start]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.secant_stiffness = np.where(delta_S != 0,
+                                             (force[self.peak] - force[self.start]) / delta_S, np.nan)
+        self.find_valleys(displacement)
+
+    def find_valleys(self, displacement):
+        """
+        Впадина цикла - первый минимум перемещения на участке разгрузки [пик, конец)
+        (как np.argmin, NaN считается минимумом). Участки склеиваются в один массив,
+        минимумы - одним reduceat, первое совпадение в каждом участке - через np.unique.
+        Цикл с пустым участком оставляет впадину в последней точке.
+        """
+        lengths = self.end - self.peak
+        found = lengths > 0
+        if not found.any():
+            return
+        first, lengths = self.peak[found], lengths[found]
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        segment = np.repeat(np.arange(len(first)), lengths)
+        index = np.arange(offsets[-1] + lengths[-1]) - offsets[segment] + first[segment]
+        values = displacement[index]
+        lowest = np.minimum.reduceat(values, offsets)
+        hits = np.flatnonzero((values == lowest[segment]) | np.isnan(values))
+        _, first_hit = np.unique(segment[hits], return_index=True)
+        self.valley[found] = index[hits[first_hit]]
+
+    def to_frame(self):
+        """Таблица итогов для выгрузки в Excel"""
+        return pd.DataFrame({
+            'Цикл': np.arange(1, len(self) + 1),
+            'Начало': self.start,
+            'Пик': self.peak,
+            'Впадина': self.valley,
+            'Конец': self.end,
+            'Макс. нагрузка, Н': self.max_force,
+            'Макс. перемещение, мм': self.max_displacement,
+            'Макс. удельное давление, МПа': self.max_stress,
+            'Макс. отн. деформация, %': self.max_strain * 100,
+            'Площадь петли, Н·мм': self.loop_area,
+            'Рассеянная энергия, Дж': self.loop_area / 1000,
+            'Работа нагружения, Дж': self.loading_energy / 1000,
+            'Секущая жёсткость, Н/мм': self.secant_stiffness,
+        })
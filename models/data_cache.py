@@ -0,0 +1,96 @@
+import hashlib
+import os
+import numpy as np
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".plotlab", "cache")
+
+
+class DataCache:
+    """Кэш разобранных файлов испытаний в формате .npy (по хэшу содержимого и размеру)"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_size_mb=500):
+        self.cache_dir = cache_dir
+        self.max_size_mb = max_size_mb
+
+    @property
+    def enabled(self):
+        return self.max_size_mb > 0
+
+    def key(self, file_path, chunk_size=1 << 20):
+        """Ключ кэша: blake2b содержимого файла + размер в байтах"""
+        digest = hashlib.blake2b(digest_size=16)
+        size = 0
+        with open(file_path, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                size += len(chunk)
+        return f"{digest.hexdigest()}_{size}"
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key + ".npy")
+
+    def get(self, key):
+        """Возвращает отображённый в память массив (столбцы x строки) или None"""
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            data = np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        # Обновляем время доступа для вытеснения давно не использованных записей
+        os.utime(path)
+        return data
+
+    def put(self, key, data):
+        """Сохраняет массив (столбцы x строки) и вытесняет старые записи сверх лимита"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.path(key)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, np.ascontiguousarray(data))
+        os.replace(tmp_path, path)
+        self.evict(keep=path)
+
+    def size_bytes(self):
+        return sum(size for _, _, size in self.entries())
+
+    def entries(self):
+        """Список (путь, время доступа, размер) всех записей кэша"""
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".npy"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            stat = os.stat(path)
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def evict(self, keep=None):
+        """Удаляет самые старые записи, пока кэш больше max_size_mb"""
+        limit = self.max_size_mb * 1024 * 1024
+        entries = sorted(self.entries(), key=lambda e: e[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= limit:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError as e:
+                # Файл может быть открыт (отображён в память) в текущем сеансе
+                print(f"Не удалось удалить запись кэша {path}: {e}")
+
+    def clear(self):
+        for path, _, _ in self.entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
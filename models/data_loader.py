@@ -0,0 +1,98 @@
+import time
+import numpy as np
+import pandas as pd
+from models.data_cache import DataCache
+
+# Столбцы файла испытательной машины, которые использует анализ:
+# 0 - нагрузка (Н), 2 - перемещение (мм), 3 - время (с)
+DATA_COLUMNS = (0, 2, 3)
+
+
+class DataLoader:
+    """Быстрая загрузка .txt файлов испытательной машины (табуляция, десятичная запятая)"""
+
+    def __init__(self, columns=DATA_COLUMNS, cache=None):
+        self.columns = list(columns)
+        self.cache = cache if cache is not None else DataCache()
+        self.from_cache = False
+        self.rows = 0
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    def read_csv_options(self):
+        """Параметры парсера: сразу float64, только нужные столбцы, без regex-замены запятых"""
+        return dict(sep="\t", header=None, usecols=self.columns, decimal=",",
+                    dtype=np.float64, engine="c")
+
+    def load(self, file_path):
+        """Читает файл и возвращает DataFrame со столбцами 0, 2, 3"""
+        start = time.perf_counter()
+        self.from_cache = False
+        key = None
+        if self.cache.enabled:
+            try:
+                key = self.cache.key(file_path)
+                data = self.cache.get(key)
+            except OSError as e:
+                print(f"Кэш недоступен: {e}")
+                key, data = None, None
+            if data is not None:
+                # Столбцы отображаются в память без повторного разбора файла
+                df = pd.DataFrame(data.T, columns=self.columns, copy=False)
+                self.from_cache = True
+                self.report(df, start)
+                return df
+
+        df = self.parse(file_path)
+        if key is not None:
+            try:
+                self.cache.put(key, df.values.T)
+            except OSError as e:
+                print(f"Не удалось записать кэш: {e}")
+        self.report(df, start)
+        return df
+
+    def parse(self, file_path):
+        """Разбирает исходный .txt файл"""
+        try:
+            df = pd.read_csv(file_path, **self.read_csv_options())
+        except ValueError:
+            # В файле встречается точка как разделитель дробной части
+            if hasattr(file_path, "seek"):
+                file_path.seek(0)
+            df = pd.read_csv(file_path, sep="\t", header=None, usecols=self.columns, dtype=str)
+            df = df.replace(",", ".", regex=True).astype(np.float64)
+        return df
+
+    def iter_chunks(self, file_path, chunksize=200_000):
+        """Читает файл блоками по chunksize строк, выдаёт массивы (строки x столбцы 0, 2, 3)"""
+        if self.cache.enabled:
+            try:
+                data = self.cache.get(self.cache.key(file_path))
+            except OSError:
+                data = None
+            if data is not None:
+                for begin in range(0, data.shape[1], chunksize):
+                    yield np.array(data[:, begin:begin + chunksize].T)
+                return
+
+        yielded = 0
+        try:
+            for df in pd.read_csv(file_path, chunksize=chunksize, **self.read_csv_options()):
+                yield df.values
+                yielded += len(df)
+        except ValueError:
+            # Точка как разделитель дробной части: дочитываем файл медленным путём
+            reader = pd.read_csv(file_path, sep="\t", header=None, usecols=self.columns, dtype=str,
+                                 skiprows=yielded, chunksize=chunksize)
+            for df in reader:
+                yield df.replace(",", ".", regex=True).astype(np.float64).values
+
+    def report(self, df, start):
+        self.elapsed = time.perf_counter() - start
+        self.rows = len(df)
+        source = "из кэша" if self.from_cache else "из файла"
+        print(f"Загружено {self.rows} строк {source} за {self.elapsed:.3f} с ({self.rows_per_sec:.0f} строк/с)")
@@ -1,118 +1,490 @@
 import numpy as np
 import pandas as pd
 from scipy.ndimage import median_filter, gaussian_filter1d
-from scipy.interpolate import interp1d
 from scipy.signal import find_peaks
 import math
+import os
+import time
+from models.data_loader import DataLoader
+from models.cycles import CycleTable
+from models.test_record import TestRecord
+from models.streaming import RunningStats, CycleStream
+from models.modulus import SecantModulusEngine, rolling_slope, savgol_slope
+from utils.helpers import (sustained_minimum, find_sustained_crossings, interpolate_at,
+                           interpolate_nans, remove_spikes)
+
+# Этапы analyze() по порядку и их названия для индикатора хода расчёта
+STAGE_TITLES = {
+    'load': 'Загрузка',
+    'despike': 'Выбросы',
+    'trim': 'Обрезка',
+    'stress_strain': 'Давление и деформация',
+    'modulus': 'Модуль упругости',
+    'peaks': 'Пики',
+    'cycles': 'Циклы',
+    'strain_filter': 'Сглаживание деформации',
+    'windowed_modulus': 'Модуль по окнам',
+}
+
+# Настройки расчёта из окна настроек (атрибуты DataProcessor и SecantModulusEngine),
+# см. DataProcessor.settings/apply_settings
+PROCESSOR_SETTINGS = ('median_filter_size', 'gaussian_sigma', 'modulus_kernel', 'derivative_window',
+                      'median_filter_size_dist', 'gaussian_sigma_dist_value', 'load_threshold',
+                      'despike', 'despike_window', 'despike_threshold', 'c_stat_thresholds',
+                      'modulus_levels', 'compact_storage')
+ENGINE_SETTINGS = ('window_seconds', 'window', 'stride', 'overlap', 'cycle_index', 'skip_windows')
+
+
+class AnalysisCancelled(Exception):
+    """Расчёт прерван между этапами (см. DataProcessor.analyze)"""
 
 class DataProcessor:
     def __init__(self):
-        self.df = None
+        self.loader = DataLoader()
+        self.modulus_engine = SecantModulusEngine()
+        self.record = None  # TestRecord: все каналы открытого испытания
+        self.compact_storage = True  # хранить каналы во float32 (False - float64)
         self.young_modulus_final = None
         self.stress = None
         self.strain = None
         self.time = None
         self.time_ = None
         self.strain_ = None
+        self.forse__ = None
+        self.displacement__ = None
+        self.strain_percent = None  # относительная деформация в %
+        self.strain_pocent = None  # то же после сглаживания
+        self.area = None
         self.form_factor = None
-        self.locs = []
+        self.cycles = CycleTable([], [], 0)  # таблица циклов нагружения
         self.peaks_upper = []
         self.peaks_lower = []
         self.selected_peaks = []
         self.linear_regions = []
         self.median_filter_size = 50
+        self.modulus_kernel = 'gradient'  # ключ из MODULUS_KERNELS
+        self.derivative_window = 51  # окно регрессии / Савицкого-Голея (точки)
         self.gaussian_sigma = 2
         self.median_filter_size_dist = 1
         self.gaussian_sigma_dist_value = 0.1
+        self.load_threshold = 20  # порог нагрузки начала испытания (Н)
+        self.despike = False  # фильтр выбросов (Хампеля) по нагрузке и перемещению
+        self.despike_window = 11  # окно фильтра выбросов (точки)
+        self.despike_threshold = 5.0  # порог выброса в масштабированных MAD
+        self.repaired = {}  # исправлено выбросов по каналам
+        self.c_stat_thresholds = [(625, 8750)]  # пары порогов C_stat (Н)
+        self.modulus_levels = [5, 10, 20]  # уровни деформации (%) для таблицы модуля
+        self.cycle_results = None
+        self.timings = {}
+        self.stage_keys = {}  # ключи входных данных этапов analyze()
+        self.recomputed = set()
+        self.on_stage = None  # on_stage(этап, выполнено, всего) после каждого этапа analyze()
+        self.should_cancel = None  # should_cancel() -> True прерывает analyze() перед этапом
+        self.E1 = None
+        self.Eps1 = None
+        self.Pr = None
+
+    def settings(self):
+        """Настройки расчёта словарём (передаются в процессы пакетной обработки)"""
+        settings = {name: getattr(self, name) for name in PROCESSOR_SETTINGS}
+        settings['modulus_engine'] = {name: getattr(self.modulus_engine, name) for name in ENGINE_SETTINGS}
+        return settings
+
+    def apply_settings(self, settings):
+        """Применяет настройки из settings(); отсутствующие в словаре не меняются"""
+        for name, value in settings.items():
+            if name == 'modulus_engine':
+                for key, engine_value in value.items():
+                    if key not in ENGINE_SETTINGS:
+                        raise ValueError(f"Неизвестная настройка модуля по окнам: {key}")
+                    setattr(self.modulus_engine, key, engine_value)
+            elif name in PROCESSOR_SETTINGS:
+                setattr(self, name, value)
+            else:
+                raise ValueError(f"Неизвестная настройка расчёта: {name}")
 
     def load_data(self, file_path):
         try:
-            self.df = pd.read_csv(file_path, sep="\t", header=None)
-            self.df.replace(",", ".", regex=True, inplace=True)
-            self.df = self.df.astype(float)
+            df = self.loader.load(file_path)
+            # Каналы копируются в одну компактную запись, DataFrame не хранится
+            self.record = TestRecord(df.values.T, np.float32 if self.compact_storage else np.float64)
             return True
         except Exception as e:
             raise Exception(f"Не удалось загрузить файл: {str(e)}")
 
-    def process_data(self, width, length, initial_height):
+    def analyze(self, file_path, width, length, initial_height, on_stage=None, should_cancel=None):
+        """
+        Полный расчёт без Qt по этапам: загрузка -> выбросы -> обрезка -> напряжение/деформация ->
+        сглаженный модуль -> пики -> циклы -> модуль по окнам. Каждый этап запоминает
+        ключ своих входных данных и пересчитывается, только если ключ изменился
+        (ключ этапа включает ключи предыдущих). Возвращает множество пересчитанных
+        этапов, длительность этапов (с) сохраняется в self.timings.
+        on_stage/should_cancel - ход расчёта и его прерывание (AnalysisCancelled) для
+        запуска в фоновом потоке.
+        """
+        self.on_stage = on_stage
+        self.should_cancel = should_cancel
         try:
-            self.form_factor = width / initial_height
+            return self.run_stages(file_path, width, length, initial_height)
+        finally:
+            self.on_stage = None
+            self.should_cancel = None
 
-            # Данные со столбцов
-            force = self.df[0].values  # нагрузка (Н)
-            displacement = self.df[2].values  # перемещение (мм)
-            self.time_ = self.df[3].values  # время (с)
-
-            # Параметры образца
-            area = width * length  # мм²
-            area_m2 = area * 1e-6  # м²
-
-            # Расчет деформации и напряжения
-            with np.errstate(divide='ignore', invalid='ignore'):
-                self.strain_ = displacement / initial_height  # относительная деформация
-                stress = (force / area_m2) * 1e-6  # удельное давление (Па)
-            
-            strain_ = displacement / initial_height  # удельное давление (Па)
-            
-            # Фильтрация некорректных значений
-            valid_mask = (self.strain_ > 0) & (stress > 0) & ~np.isnan(self.strain_) & ~np.isnan(stress)
-            
-            # Применяем маску ко всем соответствующим массивам
-            self.strain = strain_
-            self.stress = stress
-            self.time = self.time_
-
-            self.strain = self.interpolate_nans(self.strain)
-            self.stress = self.interpolate_nans(self.stress)
-
-            # Расчет модуля Юнга (производная σ по ε)
-            with np.errstate(divide='ignore', invalid='ignore'):
-                young_modulus = np.gradient(self.stress, self.strain)
-
-            young_modulus_interp = self.interpolate_nans(young_modulus)
-            
-            window_size = min(self.median_filter_size, len(young_modulus_interp)//4 or 1)
-            young_modulus_median = median_filter(young_modulus_interp, size=window_size)
-            self.young_modulus_final = young_modulus_median
-           
-            # Находим циклы нагружения
-            self.find_loading_cycles()
-            self.find_peaks()
+    def run_stages(self, file_path, width, length, initial_height):
+        self.recomputed = set()
+        self.timings = {}
+        try:
+            stat = os.stat(file_path)
+            load_key = (file_path, stat.st_mtime_ns, stat.st_size, self.compact_storage)
+        except OSError as e:
+            raise Exception(f"Не удалось загрузить файл: {str(e)}")
+        # Выбросы исправляются в загруженной записи на месте, поэтому смена
+        # параметров фильтра требует повторной загрузки
+        raw_key = (load_key, self.despike and (self.despike_window, self.despike_threshold))
+        trim_key = (raw_key, self.load_threshold)
+        geometry_key = (trim_key, width, length, initial_height)
 
-            return True
+        self.run_stage('load', raw_key, self.load_data, file_path)
+        try:
+            self.run_stage('despike', raw_key, self.despike_record)
+            self.run_stage('trim', trim_key, self.trim_data)
+            self.run_stage('stress_strain', geometry_key, self.compute_stress_strain,
+                           width, length, initial_height)
+            self.run_stage('modulus', (geometry_key, self.modulus_kernel, self.derivative_window,
+                                       self.median_filter_size, self.gaussian_sigma),
+                           self.compute_young_modulus)
+            self.run_stage('peaks', geometry_key, self.find_peaks)
+            self.run_stage('cycles', geometry_key, self.find_loading_cycles)
+            self.run_stage('strain_filter',
+                           (geometry_key, self.median_filter_size_dist, self.gaussian_sigma_dist_value),
+                           self.filter_strain)
+        except AnalysisCancelled:
+            raise
         except Exception as e:
             raise Exception(f"Ошибка при обработке данных: {str(e)}")
+        self.run_stage('windowed_modulus',
+                       (raw_key, width * length, initial_height, self.modulus_engine.key()),
+                       self.compute_windowed_modulus, width, length, initial_height)
+        if 'trim' in self.recomputed:
+            self.memory_report()
+        return self.recomputed
+
+    def memory_report(self):
+        """Память записи испытания и оценка прежней раскладки (DataFrame + копии во float64)"""
+        used, legacy = self.record.footprint()
+        print(f"Память записи: {used / 2**20:.1f} МБ ({self.record.dtype}), "
+              f"прежняя раскладка: {legacy / 2**20:.1f} МБ")
+        return used, legacy
+
+    def run_stage(self, name, key, func, *args):
+        """Выполняет этап, если его входные данные изменились с прошлого расчёта"""
+        if self.should_cancel is not None and self.should_cancel():
+            # Ключи выполненных этапов остаются верными, следующий расчёт продолжит с этого места
+            raise AnalysisCancelled(f"Расчёт прерван перед этапом '{STAGE_TITLES[name]}'")
+        changed = self.stage_keys.get(name) != key
+        if changed:
+            # Ключ сбрасывается заранее: после ошибки этап будет пересчитан
+            self.stage_keys.pop(name, None)
+            start = time.perf_counter()
+            func(*args)
+            self.timings[name] = time.perf_counter() - start
+            self.stage_keys[name] = key
+            self.recomputed.add(name)
+        if self.on_stage is not None:
+            self.on_stage(name, list(STAGE_TITLES).index(name) + 1, len(STAGE_TITLES))
+        return changed
+
+    def despike_record(self):
+        """
+        Необязательный фильтр Хампеля по нагрузке и перемещению (на месте, до обрезки).
+        Число исправленных точек по каналам сохраняется в self.repaired.
+        """
+        self.repaired = {}
+        if not self.despike:
+            return self.repaired
+        for index, name in ((0, 'force'), (1, 'displacement')):
+            _, self.repaired[name] = remove_spikes(self.record.raw[index], self.despike_threshold,
+                                                   self.despike_window, inplace=True)
+        print(f"Исправлено выбросов: нагрузка - {self.repaired['force']}, "
+              f"перемещение - {self.repaired['displacement']}")
+        return self.repaired
+
+    def trim_data(self):
+        """Обрезает запись до начала испытания и переносит начало отсчёта"""
+        record = self.record
+
+        # Находим первый индекс, где нагрузка (Н) превышает порог 5 точек подряд.
+        # Каналы записи могут быть уже сдвинуты прежней обрезкой - сдвигаем порог
+        threshold = self.load_threshold - record.origin[0]
+        start_index = max(find_sustained_crossings(record.raw[0], [threshold], starts=[1])[0, 0], 0)
+
+        # Переносим начало отсчёта на start_index, обрезанные каналы - представления записи
+        record.trim(start_index)
+        self.time_ = record.time  # время (с)
+        self.displacement__ = record.displacement  # перемещение (мм)
+        self.forse__ = record.force  # нагрузка (Н)
+        self.time = self.time_
+
+        print(f"Обрезано {start_index} начальных точек. Начальная нагрузка: {self.forse__[0]:.2f} Н")
+
+    def compute_stress_strain(self, width, length, initial_height):
+        # Параметры образца
+        self.form_factor = float(width / initial_height)
+        area = width * length  # мм²
+        area_m2 = area * 1e-6  # м²
+        self.area = area
+
+        # Расчет деформации и напряжения (в каналы записи)
+        record = self.record
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.divide(self.displacement__, initial_height, out=record.strain)  # относительная деформация
+            np.multiply(self.forse__, 1e-6 / area_m2, out=record.stress)  # удельное давление (МПа)
+        self.strain_ = self.strain = record.strain
+        self.stress = record.stress
+
+    def compute_young_modulus(self):
+        """
+        Модуль Юнга как производная σ по ε. Ядро 'gradient' - np.gradient со
+        сглаживанием (медиана + Гаусс); 'regression' и 'savgol' сразу дают
+        сглаженную производную за один проход по окну derivative_window.
+        """
+        # Производная во float64, даже если каналы хранятся во float32
+        strain = np.asarray(self.strain, dtype=np.float64)
+        stress = np.asarray(self.stress, dtype=np.float64)
+        if self.modulus_kernel in ('regression', 'savgol'):
+            kernel = rolling_slope if self.modulus_kernel == 'regression' else savgol_slope
+            young_modulus = kernel(strain, stress, self.derivative_window)
+            return self.store_young_modulus(self.interpolate_nans(young_modulus, inplace=True))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            young_modulus = np.gradient(stress, strain)
+
+        # Временный массив градиента заполняется на месте, inf - как пропуски
+        young_modulus_interp = self.interpolate_nans(young_modulus, inplace=True)
+
+        window_size = min(self.median_filter_size, len(young_modulus_interp)//4 or 1)
+        young_modulus_median = median_filter(young_modulus_interp, size=window_size)
+        return self.store_young_modulus(gaussian_filter1d(young_modulus_median, sigma=self.gaussian_sigma))
+
+    def store_young_modulus(self, young_modulus):
+        self.record.young_modulus[:] = young_modulus
+        self.young_modulus_final = self.record.young_modulus
+        return self.young_modulus_final
+
+    def filter_strain(self):
+        """Относительная деформация в процентах (один раз на расчёт) и её сглаженная версия"""
+        record = self.record
+        self.strain_percent = self.translate_units(self.strain, 100, out=record.strain_percent)
+        record.strain_smooth[:] = self.apply_filters(self.strain_percent)
+        self.strain_pocent = record.strain_smooth
+
+    def compute_windowed_modulus(self, width, length, initial_height):
+        """Модуль упругости по окнам на выбранном цикле (E1, Eps1, Pr), пустые - если пиков мало"""
+        record = self.record
+        result = self.modulus_engine.run(record.raw[0], record.raw[1], record.raw[2],
+                                         width * length, initial_height, force_origin=record.origin[0])
+        if result is None:
+            result = np.array([]), np.array([]), np.array([])
+        self.E1, self.Eps1, self.Pr = result
+
+    def process_stream(self, file_path, width, length, initial_height, chunksize=200_000):
+        """
+        Потоковая обработка длинных записей: файл читается блоками, в памяти
+        держится только текущий блок и итоги незавершённого цикла. Границы циклов -
+        как у analyze() (find_peaks + adjust_lower_peaks). Возвращает таблицу
+        итогов по циклам (также сохраняется в self.cycle_results).
+        """
+        try:
+            self.form_factor = width / initial_height
+            area_m2 = width * length * 1e-6
+
+            start, origin = self.find_stream_start(file_path, chunksize)
+            print(f"Обрезано {start} начальных точек")
+
+            # Первый проход: СКО деформации для порога prominence (как в find_peaks)
+            stats = RunningStats()
+            for _, chunk in self.iter_trimmed(file_path, start, origin, chunksize):
+                stats.update(chunk[:, 1] / initial_height)
+
+            # Второй проход: границы циклов и итоги по каждому циклу
+            cycles = CycleStream(stats.std / 2, initial_height, area_m2)
+            for offset, chunk in self.iter_trimmed(file_path, start, origin, chunksize):
+                cycles.feed(offset, chunk)
+            self.cycle_results = pd.DataFrame(cycles.finish(), columns=CycleTable([], [], 0).to_frame().columns)
+            print(f"Обработано {cycles.total} точек, циклов: {len(self.cycle_results)}")
+            return self.cycle_results
+        except Exception as e:
+            raise Exception(f"Ошибка при потоковой обработке данных: {str(e)}")
+
+    def find_stream_start(self, file_path, chunksize, run=5):
+        """
+        Ищет начало испытания блоками: первый индекс (>= 1), где нагрузка
+        превышает load_threshold run точек подряд. Возвращает (индекс, строка начала).
+        """
+        carry = np.empty((0, 3))
+        first_row = None
+        base = 0
+        for chunk in self.loader.iter_chunks(file_path, chunksize):
+            if first_row is None and len(chunk):
+                first_row = chunk[0].copy()
+            block = np.concatenate((carry, chunk))
+            if len(block) >= run:
+                window_min = sustained_minimum(block[:, 0], run)
+                full = window_min[:len(block) - run + 1] > self.load_threshold
+                idx = np.flatnonzero(full)
+                idx = idx[idx + base >= 1]
+                if idx.size:
+                    return base + int(idx[0]), block[idx[0]].copy()
+            keep = min(run - 1, len(block))
+            carry = block[len(block) - keep:]
+            base += len(block) - keep
+
+        # Конец файла: окна короче run точек
+        above = carry[:, 0] > self.load_threshold
+        for i in range(len(carry)):
+            if base + i >= 1 and above[i:].all():
+                return base + i, carry[i].copy()
+        if first_row is None:
+            raise ValueError("Файл не содержит данных")
+        return 0, first_row
+
+    def iter_trimmed(self, file_path, start, origin, chunksize):
+        """Выдаёт (индекс после обрезки, блок) с отсчётами от start, смещёнными на origin"""
+        offset = 0
+        for chunk in self.loader.iter_chunks(file_path, chunksize):
+            begin = offset
+            offset += len(chunk)
+            if offset <= start:
+                continue
+            chunk = chunk[max(start - begin, 0):] - origin
+            yield max(begin - start, 0), chunk
 
     def find_loading_cycles(self):
-        """Находит циклы нагружения в данных"""
-        peaks, _ = find_peaks(self.df[0].values, prominence=np.std(self.df[0].values)/2)
-        self.locs = peaks.tolist()
-        
-        if len(self.locs) > 5:
-            self.locs = self.locs[:5]
+        """Таблица циклов нагружения по найденным пикам (на обрезанных данных)"""
+        self.cycles = CycleTable(self.peaks_upper, self.peaks_lower, len(self.forse__))
+        self.cycles.summarize(self.forse__, self.displacement__, self.stress, self.strain)
+        return self.cycles
 
     def find_peaks(self):
         """Находит пики в данных"""
-        self.peaks_upper, _ = find_peaks(self.strain_, prominence=np.nanstd(self.strain_)/2)
-        
-        adjusted_peaks = []
-        for peak in self.peaks_lower:
-            grad = np.gradient(self.strain_)
-            rise_point = np.where(grad[peak:] > 0)[0]
-            if len(rise_point) > 0:
-                adjusted_peaks.append(peak + rise_point[0])
-
-        self.peaks_lower = np.array(adjusted_peaks)
+        prominence = np.nanstd(self.strain_)/2
+        self.peaks_upper, _ = find_peaks(self.strain_, prominence=prominence)
+        self.peaks_lower, _ = find_peaks(-self.strain_, prominence=prominence)
+
+        self.peaks_lower = self.adjust_lower_peaks(self.strain_, self.peaks_lower)
         self.peaks_lower = np.insert(self.peaks_lower, 0, 0)
 
-    def interpolate_nans(self, data):
-        mask = ~np.isnan(data)
-        indices = np.arange(len(data))
-        interp = interp1d(indices[mask], data[mask], kind='linear', fill_value="extrapolate")
-        return interp(indices)
+    def adjust_lower_peaks(self, data, peaks_lower):
+        """
+        Сдвигает каждую впадину к первой следующей точке, где производная положительна.
+        Градиент считается один раз, точки подъёма для всех впадин ищутся одним searchsorted.
+        Впадины, после которых подъёма нет, отбрасываются.
+        """
+        peaks_lower = np.asarray(peaks_lower, dtype=int)
+        rise_points = np.flatnonzero(np.gradient(data) > 0)
+        j = np.searchsorted(rise_points, peaks_lower)
+        return rise_points[j[j < len(rise_points)]]
+
+    def interpolate_nans(self, data, inf='nan', inplace=False):
+        """Заполнение NaN/inf (см. utils.helpers.interpolate_nans)"""
+        return interpolate_nans(data, inf=inf, inplace=inplace)
+
+    def modulus_at(self, targets, by='strain', per_cycle=False):
+        """
+        Удельное давление, деформация и модуль упругости на заданных уровнях
+        деформации (%, by='strain') или давления (МПа, by='stress'), в точке первого
+        достижения уровня. По умолчанию - по модулю на окнах (E1, Eps1, Pr),
+        per_cycle=True - по участку нагружения каждого цикла. Возвращает таблицу
+        (строка на уровень и цикл).
+        """
+        names = ('Удельное давление, МПа', 'Отн. деформация, %', 'Модуль упругости, МПа')
+        if per_cycle:
+            stress, strain, modulus = self.stress, self.strain_percent, self.young_modulus_final
+            segments = [slice(int(start), int(peak) + 1)
+                        for start, peak in zip(self.cycles.start, self.cycles.peak)]
+        else:
+            stress, strain, modulus = self.Pr, self.Eps1, self.E1
+            segments = [slice(None)]
+        key = stress if by == 'stress' else strain
+        targets = np.atleast_1d(np.asarray(targets, dtype=float))
+
+        frames = []
+        for number, segment in enumerate(segments, 1):
+            values = interpolate_at(key[segment], targets, dict(zip(names, (stress[segment], strain[segment],
+                                                                          modulus[segment]))))
+            frame = pd.DataFrame({'Уровень': targets, **values})
+            if per_cycle:
+                frame.insert(0, 'Цикл', number)
+            frames.append(frame)
+        if not frames:
+            return pd.DataFrame(columns=['Цикл', 'Уровень', *names])
+        return pd.concat(frames, ignore_index=True)
+
+    def threshold_pairs(self, thresholds=None):
+        """Пары порогов нагрузки C_stat (нижний, верхний) в Н как массив (пары x 2)"""
+        pairs = self.c_stat_thresholds if thresholds is None else thresholds
+        return np.asarray(pairs, dtype=float).reshape(-1, 2)
+
+    def static_stiffness(self, thresholds=None):
+        """
+        Статическая жёсткость C_stat (Н/мм²) для всех циклов и пар порогов нагрузки
+        (нижний, верхний) в Н. Пересечения порогов 5 точек подряд на участке
+        нагружения ищутся одним проходом для всех порогов и циклов.
+        Возвращает массив (пары порогов x циклы), NaN - цикл не дошёл до порога
+        или пара нулевой ширины (нижний порог равен верхнему), или перемещение
+        между порогами нулевое.
+        """
+        pairs = self.threshold_pairs(thresholds)
+        levels, position = np.unique(pairs, return_inverse=True)
+        position = position.reshape(pairs.shape)
+
+        crossings = find_sustained_crossings(self.forse__, levels,
+                                             starts=self.cycles.start + 1, stops=self.cycles.peak - 5)
+        low, high = crossings[position[:, 0]], crossings[position[:, 1]]
+        reached = (low >= 0) & (high >= 0) & (pairs[:, 1] != pairs[:, 0])[:, None]
+        delta_S = self.displacement__[np.where(reached, high, 0)] - self.displacement__[np.where(reached, low, 0)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            stiffness = (pairs[:, 1] - pairs[:, 0])[:, None] / (delta_S * self.area)
+        return np.where(reached & (delta_S != 0), stiffness, np.nan)
+
+    def C_stat(self, save_dir, thresholds=None):
+        """
+        Статическая жёсткость по циклам между порогами нагрузки (по умолчанию
+        self.c_stat_thresholds). Таблица записывается в результаты_циклов.xlsx один раз.
+        """
+        pairs = self.threshold_pairs(thresholds)
+        stiffness = self.static_stiffness(pairs)
+        empty = pairs[:, 0] == pairs[:, 1]
+        for low, high in pairs[empty]:
+            print(f"Пара порогов C_stat {low:g}-{high:g} Н нулевой ширины: результат не рассчитывается")
+
+        # Столбец "Результат" для одной пары порогов, иначе по столбцу на пару
+        columns = {}
+        for (low, high), values in zip(pairs, stiffness):
+            name = 'Результат' if len(pairs) == 1 else f'Результат {low:g}-{high:g} Н'
+            columns[name] = ['' if np.isnan(v) else f"{v:.3f}".replace('.', ',') for v in values]
+            print(f"C_stat {low:g}-{high:g} Н по циклам, H/mm2: {np.round(values, 4)}")
+        missed = int(np.isnan(stiffness[~empty]).any(axis=0).sum())
+        if missed:
+            print(f"Циклов, не дошедших до порога нагрузки: {missed}")
+        df = pd.DataFrame(columns)
+
+        try:
+            df.to_excel(save_dir + '/результаты_циклов.xlsx', index=False)
+        except PermissionError as e:
+            print(f"Ошибка доступа к файлу: {e}")
+        return df
+
+    def translate_units(self, data, units, out=None):
+        """Перевод единиц одним векторным умножением (out=data - на месте)"""
+        return np.multiply(data, units, out=out)
 
-    def translate_units(self, data, units):
-        return np.array([i * units for i in data])
+    def valid_peaks(self):
+        """Верхние и нижние пики в пределах записи (одна маска на массив)"""
+        length = len(self.stress)
+        upper = np.asarray(self.peaks_upper, dtype=int)
+        lower = np.asarray(self.peaks_lower, dtype=int)
+        return upper[upper < length], lower[lower < length]
 
     def apply_filters(self, data):
         window_size = min(self.median_filter_size_dist, len(data)//4 or 1)
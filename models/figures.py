@@ -0,0 +1,297 @@
+import math
+import os
+import numpy as np
+from matplotlib.figure import Figure
+from utils.helpers import interpolate_at
+
+# Оформление графиков по умолчанию (как в окне программы)
+DEFAULT_STYLE = {
+    'fontsize': 10,
+    'linewidth': 2,
+    'fontweight': 'bold',
+    'is_title': True,  # заголовки графиков
+    'is_filling': True,  # заливка петель циклов
+    'line_modul_y': False,  # построение линейных участков на графике деформации
+}
+SAVE_SIZE = (14, 9)  # размер фигур в файлах, дюймы
+OVERVIEW_COLORS = ['k', 'g', 'r', 'b', 'm', 'c', 'c', 'c']
+CYCLE_COLORS = ['k', 'g', 'r', 'b', 'm', 'c', 'y', 'w']
+
+
+def find_coordinat(target_values, stress, strain):
+    """Точка (давление, деформация) первого достижения первого из уровней деформации target_values"""
+    values = interpolate_at(strain, target_values, {'stress': stress, 'strain': strain})
+    found = np.flatnonzero(~np.isnan(values['stress']))
+    if found.size:
+        return values['stress'][found[0]], values['strain'][found[0]]
+
+
+class ResultFigures:
+    """
+    Графики результатов без Qt: основные графики (figure1), модуль упругости (figure3),
+    нагружение (figure4) и циклы нагружения (figure6), а также отдельные графики петель.
+    Оси и линии создаются один раз, render подставляет в них данные процессора.
+    Окно программы передаёт фигуры своих холстов и bind с прореживанием для экрана,
+    пакетная обработка - новые фигуры без прореживания.
+    """
+
+    def __init__(self, figure1=None, figure3=None, figure4=None, figure6=None, style=None, bind=None):
+        self.figure1 = figure1 or Figure(figsize=SAVE_SIZE)
+        self.figure3 = figure3 or Figure(figsize=SAVE_SIZE)
+        self.figure4 = figure4 or Figure(figsize=SAVE_SIZE)
+        self.figure6 = figure6 or Figure(figsize=SAVE_SIZE)
+        self.style = dict(DEFAULT_STYLE, **(style or {}))
+        # bind(линия, x, y) подставляет данные в линию (окно - с прореживанием)
+        self.bind = bind or (lambda line, x, y: line.set_data(x, y))
+        self.axes = {}
+        self.lines = {}
+        self.cycle_lines = []
+        self.overlays = []  # маркеры пиков и их легенды (окно рисует их поверх фона)
+        self.setup_axes()
+
+    @property
+    def label(self):
+        return dict(fontsize=self.style['fontsize'], fontweight=self.style['fontweight'])
+
+    def title(self, name, processor):
+        return f'{name} Коэффициент формы q = {processor.form_factor:.2f}' if self.style['is_title'] else ''
+
+    def setup_axes(self):
+        """
+        Оси, подписи и линии основных графиков создаются один раз на фигуру, при новом
+        расчёте линиям только подставляются данные.
+        """
+        label = self.label
+        linewidth = self.style['linewidth']
+
+        # Основные графики: давление и деформация во времени
+        ax = self.axes['stress'] = self.figure1.add_subplot(211)
+        self.add_line('stress', ax, 'k-', linewidth=linewidth)
+        ax.set_xlabel('Время, С', **label)
+        ax.set_ylabel('Удельное давление, МПа', **label)
+        ax.grid(True, linestyle='--', alpha=0.6)
+        ax = self.axes['strain'] = self.figure1.add_subplot(212)
+        self.add_line('strain', ax, 'k-', linewidth=linewidth)
+        ax.set_xlabel('Время, С', **label)
+        ax.set_ylabel('Относительная деформация, %', **label)
+        ax.grid(True, linestyle='--', alpha=0.6)
+
+        # Тот же холст, участок между выбранными пиками (скрыт до выбора пика)
+        ax = self.axes['peak_strain'] = self.figure1.add_subplot(211)
+        self.add_line('peak_strain', ax, 'k-', linewidth=linewidth, label="Данные")
+        ax.set_xlabel('Удельное давление, МПа', **label)
+        ax.set_ylabel('Относительная деформация, %', **label)
+        ax.grid(True)
+        ax = self.axes['peak_modulus'] = self.figure1.add_subplot(212)
+        self.add_line('peak_modulus', ax, 'k-', linewidth=linewidth, label="Данные")
+        ax.set_xlabel('Удельное давление, МПа', **label)
+        ax.set_ylabel('Модуль упругости, МПа', **label)
+        ax.grid(True)
+
+        for name in ('stress', 'strain', 'peak_strain', 'peak_modulus'):
+            ax = self.axes[name]
+            self.add_line(f'{name}_upper', ax, 'ro', label='Верхние пики')
+            self.add_line(f'{name}_lower', ax, 'go', label='Нижние пики')
+            legend = ax.legend()
+            self.overlays += [self.lines[f'{name}_upper'], self.lines[f'{name}_lower'], legend]
+        self.show_view('main')
+
+        # Модуль упругости и деформация от давления
+        ax = self.axes['E1'] = self.figure3.add_subplot(211)
+        self.add_line('E1', ax, 'k-', linewidth=linewidth)
+        ax.set_xlabel('Удельное давление, МПа', **label)
+        ax.set_ylabel('Модуль упругости, МПа', **label)
+        ax.grid(True, linestyle='--', alpha=0.6)
+        ax = self.axes['Eps1'] = self.figure3.add_subplot(212)
+        self.add_line('Eps1', ax, 'k-', linewidth=linewidth)
+        ax.set_xlabel('Удельное давление, МПа', **label)
+        ax.set_ylabel('Относительная деформация, %', **label)
+        ax.grid(True, linestyle='--', alpha=0.6)
+        # Построение линейных участков (видно при line_modul_y)
+        self.lines['x_7'] = ax.axvline(x=0, visible=False)
+        self.lines['x_20'] = ax.axvline(x=0, visible=False)
+        self.add_line('segment_start', ax, 'y', visible=False)
+        self.add_line('segment_middle', ax, 'r', visible=False)
+        self.add_line('segment_end', ax, 'g', visible=False)
+
+        # Нагружение: перемещение и нагрузка во времени
+        ax = self.axes['displacement'] = self.figure4.add_subplot(111)
+        self.add_line('displacement', ax, 'b', label='Смещение (мм)', linewidth=linewidth)
+        ax.set_ylabel('Перемещение, мм', color='blue', **label)
+        ax.set_xlabel('Время, с', **label)
+        ax.grid(True)
+        ax = self.axes['force'] = self.axes['displacement'].twinx()
+        self.add_line('force', ax, 'r', label='Нагрузка (Н)', linewidth=linewidth)
+        ax.set_ylabel('Нагрузка, Н', color='red', **label)
+
+        # Циклы нагружения: линии циклов пересоздаются, оси остаются
+        ax = self.axes['cycles'] = self.figure6.add_subplot(111)
+        ax.set_xlabel('Перемещение, мм', **label)
+        ax.set_ylabel('Нагрузка, Н', **label)
+        ax.grid(True, linestyle='--', alpha=0.6)
+
+    def add_line(self, name, ax, *args, **kwargs):
+        """Пустая постоянная линия, данные подставляются через set_line"""
+        self.lines[name], = ax.plot([], [], *args, **kwargs)
+        return self.lines[name]
+
+    def set_line(self, name, x, y):
+        self.bind(self.lines[name], x, y)
+
+    def plot_line(self, ax, x, y, *args, **kwargs):
+        """ax.plot, данные подставляются через bind"""
+        line, = ax.plot([], [], *args, **kwargs)
+        self.bind(line, x, y)
+        return line
+
+    def show_view(self, view):
+        """Переключает первую фигуру между графиками во времени ('main') и участком между пиками ('peak')"""
+        for name in ('stress', 'strain'):
+            self.axes[name].set_visible(view == 'main')
+        for name in ('peak_strain', 'peak_modulus'):
+            self.axes[name].set_visible(view == 'peak')
+
+    def set_peaks_visible(self, visible):
+        """Маркеры пиков и их легенды"""
+        for name in ('stress', 'strain', 'peak_strain', 'peak_modulus'):
+            self.lines[f'{name}_upper'].set_visible(visible)
+            self.lines[f'{name}_lower'].set_visible(visible)
+            self.axes[name].get_legend().set_visible(visible)
+
+    def rescale(self, *names):
+        """Пределы осей по новым данным (в том числе после ручного зума)"""
+        for name in names:
+            ax = self.axes[name]
+            ax.relim(visible_only=True)
+            ax.set_autoscale_on(True)
+            ax.autoscale_view()
+
+    def render(self, processor, name, show_peaks=False):
+        """Подставляет рассчитанные данные процессора во все линии (name - подпись образца)"""
+        p = processor
+        label = self.label
+        title = self.title(name, p)
+
+        # График 1: Удельное давление и относительная деформация vs Время (все данные)
+        self.show_view('main')
+        self.axes['stress'].set_title(title, **label)
+        self.set_line('stress', p.time, p.stress)
+        self.set_line('strain', p.time, p.strain_percent)
+        if len(p.peaks_upper) > 0 and len(p.peaks_lower) > 0:
+            peaks_upper, peaks_lower = p.valid_peaks()
+        else:
+            peaks_upper = peaks_lower = []
+        for line, values in (('stress', p.stress), ('strain', p.strain_percent)):
+            self.lines[f'{line}_upper'].set_data(p.time[peaks_upper], values[peaks_upper])
+            self.lines[f'{line}_lower'].set_data(p.time[peaks_lower], values[peaks_lower])
+        self.set_peaks_visible(show_peaks)
+        self.rescale('stress', 'strain')
+
+        # График 3.1: Модуль Юнга vs Удельное давление
+        self.axes['E1'].set_title(title, **label)
+        self.set_line('E1', p.Pr, p.E1)
+        # График 3.2: Относительная деформация vs Удельное давление (все данные)
+        self.set_line('Eps1', p.Pr, p.Eps1)
+        self.plot_construction(p.Pr, p.Eps1)
+        self.rescale('E1', 'Eps1')
+        for axis in ('E1', 'Eps1'):
+            self.axes[axis].set_xlim(left=0)
+            self.axes[axis].set_ylim(bottom=0)
+        self.figure3.tight_layout()
+
+        # График 4: нагружение и циклы нагружения
+        self.plot_overview(p, name)
+
+    def plot_construction(self, stress, strain):
+        """Линейные участки деформации (до 7 %, 7-20 %, после 20 %) при line_modul_y"""
+        construction = ('x_7', 'x_20', 'segment_start', 'segment_middle', 'segment_end')
+        for name in construction:
+            self.lines[name].set_visible(False)
+        if not self.style['line_modul_y'] or strain.size <= 15 or max(strain) <= 30:
+            return
+        x_7, y_7 = find_coordinat([7, 8, 9, 10, 11, 12, 6, 13, 5], stress, strain)
+        x_20, y_20 = find_coordinat([20, 19, 18, 21, 22, 23], stress, strain)
+        self.lines['x_20'].set_xdata([x_20, x_20])
+        self.lines['x_7'].set_xdata([x_7, x_7])
+        self.lines['segment_middle'].set_data([x_7, x_20], [y_7, y_20])
+        self.lines['segment_end'].set_data([x_20, stress[-1]], [y_20, strain[-1]])
+        self.lines['segment_start'].set_data([stress[0], x_7], [strain[0], y_7])
+        for name in construction:
+            self.lines[name].set_visible(True)
+
+    def plot_overview(self, processor, name):
+        """Перемещение и нагрузка во времени (figure4) и петли всех циклов (figure6)"""
+        p = processor
+        label = self.label
+        ax2 = self.axes['cycles']
+        for line in self.cycle_lines:
+            line.remove()
+        self.cycle_lines = []
+        if ax2.get_legend() is not None:
+            ax2.get_legend().remove()
+        Forse, Disp, Time = p.forse__, p.displacement__, p.time
+        # Верхний график: перемещение и нагрузка (дополнительная ось Y) во времени
+        ax1 = self.axes['displacement']
+        self.set_line('displacement', Time, Disp)
+        self.set_line('force', Time, Forse)
+        self.rescale('displacement', 'force')
+        ax1.set_ylim([0, math.ceil(np.max(Disp) + 0.5)])
+        ax1.set_title(self.title(name, p), **label)
+        if len(p.cycles) < 1:
+            print(f"Недостаточно данных для построения графика {name}")
+            return
+        # Циклы нагружения
+        for k in range(len(p.cycles)):
+            cycle = p.cycles.bounds(k)
+            self.cycle_lines.append(self.plot_line(ax2, Disp[cycle], Forse[cycle],
+                                                   OVERVIEW_COLORS[k % len(OVERVIEW_COLORS)],
+                                                   label=f'Цикл {k+1}', linewidth=self.style['linewidth']))
+        self.rescale('cycles')
+        ax2.legend(loc='lower right')
+        ax2.set_title('Циклы нагружения' if self.style['is_title'] else '', **label)
+
+    def draw_cycle(self, figure, processor, k, decimate=True):
+        """График петли цикла k на фигуре (decimate - данные через bind, иначе все точки)"""
+        p = processor
+        label = self.label
+        i = k + 1
+        color = CYCLE_COLORS[k % len(CYCLE_COLORS)]
+        cycle = p.cycles.bounds(k)
+
+        ax = figure.add_subplot(111)
+        if decimate:
+            line = self.plot_line(ax, p.displacement__[cycle], p.forse__[cycle], color=color,
+                                  label=f'Цикл {i}', linewidth=self.style['linewidth'])
+        else:
+            line, = ax.plot(p.displacement__[cycle], p.forse__[cycle], color=color,
+                            label=f'Цикл {i}', linewidth=self.style['linewidth'])
+        x, y = line.get_data()
+
+        if self.style['is_filling']:
+            # Заливка по замкнутому контуру петли
+            ax.fill_between(np.append(x, x[0]), np.append(y, y[0]), color=color, alpha=0.2, linewidth=0)
+
+        if self.style['is_title']:
+            ax.set_title(f'Цикл {i} (Площадь: {p.cycles.loop_area[k]:.2f})', **label)
+        ax.set_xlabel('Перемещение, мм', **label)
+        ax.set_ylabel('Сила, Н', **label)
+        ax.grid(True, linestyle='--', alpha=0.7)
+        figure.tight_layout(pad=3.0)
+
+    def save(self, save_path, processor, decimate_cycles=False):
+        """Сохраняет все фигуры и графики циклов в PNG, возвращает пути графиков циклов"""
+        for figure, file_name in ((self.figure1, "Основные_графики.png"),
+                                  (self.figure6, "Циклы_нагружения.png"),
+                                  (self.figure3, "Модуль_упругости.png"),
+                                  (self.figure4, "Нагруж.png")):
+            figure.set_size_inches(SAVE_SIZE)
+            figure.savefig(os.path.join(save_path, file_name), dpi=300, bbox_inches='tight')
+        # Графики циклов строятся по одному только для сохранения
+        cycle_images = []
+        for k in range(len(processor.cycles)):
+            cycle_path = os.path.join(save_path, f"Цикл_{k + 1}.png")
+            figure = Figure(figsize=SAVE_SIZE)
+            self.draw_cycle(figure, processor, k, decimate=decimate_cycles)
+            figure.savefig(cycle_path, dpi=300, bbox_inches='tight')
+            cycle_images.append(cycle_path)
+        return cycle_images
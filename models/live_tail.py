@@ -0,0 +1,219 @@
+import io
+import os
+import numpy as np
+from models.data_loader import DataLoader
+from models.streaming import RunningStats, CycleTracker
+from utils.helpers import sustained_minimum
+
+
+class GrowingArray:
+    """Массив с запасом ёмкости: дописывание блоков без копирования всей записи"""
+
+    def __init__(self, columns, capacity=65536):
+        self.data = np.empty((capacity, columns))
+        self.size = 0
+
+    def append(self, block):
+        needed = self.size + len(block)
+        if needed > len(self.data):
+            capacity = max(needed, 2 * len(self.data))
+            data = np.empty((capacity, self.data.shape[1]))
+            data[:self.size] = self.data[:self.size]
+            self.data = data
+        self.data[self.size:needed] = block
+        self.size = needed
+
+    @property
+    def view(self):
+        return self.data[:self.size]
+
+
+class MinMaxDecimator:
+    """
+    Прореживание растущей записи для экрана (как utils.helpers.minmax_indices), которое
+    обновляется только по новым отсчётам. Для заполненных корзин запоминаются индексы
+    минимума и максимума каждого ряда; когда корзин становится больше нормы, соседние
+    сливаются попарно и размер корзины удваивается. Кадр стоит O(новые точки + одна
+    корзина + число корзин), а не O(вся запись).
+    """
+
+    def __init__(self, max_points, series=1):
+        self.max_points = max_points
+        self.per_bucket = 1 + 2 * series
+        self.buckets = max(1, max_points // self.per_bucket)
+        self.reset()
+
+    def reset(self):
+        self.size = 1  # отсчётов в корзине
+        self.done = 0  # заполненных корзин
+        self.lows = None  # по рядам: индексы минимумов заполненных корзин
+        self.highs = None
+
+    def update(self, *series):
+        """Индексы точек для вывода по текущей длине рядов (slice(None) - все точки)"""
+        length = len(series[0])
+        if self.max_points <= 0 or length <= max(self.max_points, self.per_bucket):
+            return slice(None)
+        if self.lows is None or self.done * self.size > length:
+            # Первый кадр или файл перезаписан с начала
+            self.reset()
+            self.lows = [np.empty(0, dtype=np.int64) for _ in series]
+            self.highs = [np.empty(0, dtype=np.int64) for _ in series]
+            while length // self.size > self.buckets:
+                self.size *= 2
+
+        full = length // self.size
+        if full > self.done:
+            begin, end = self.done * self.size, full * self.size
+            starts = np.arange(begin, end, self.size)
+            for k, values in enumerate(series):
+                block = values[begin:end].reshape(-1, self.size)
+                self.lows[k] = np.concatenate((self.lows[k], starts + block.argmin(axis=1)))
+                self.highs[k] = np.concatenate((self.highs[k], starts + block.argmax(axis=1)))
+            self.done = full
+        while self.done > self.buckets:
+            self.merge(series)
+
+        tail = self.done * self.size
+        picks = [np.arange(0, tail, self.size), [length - 1], *self.lows, *self.highs]
+        if tail < length:
+            picks.append([tail])
+            for values in series:
+                rest = values[tail:]
+                picks.append([tail + rest.argmin(), tail + rest.argmax()])
+        return np.unique(np.concatenate(picks))
+
+    def merge(self, series):
+        """Удваивает размер корзины: из каждой пары корзин остаются общий минимум и максимум"""
+        pairs = self.done // 2
+        rows = np.arange(pairs)
+        for k, values in enumerate(series):
+            low = self.lows[k][:2 * pairs].reshape(pairs, 2)
+            high = self.highs[k][:2 * pairs].reshape(pairs, 2)
+            self.lows[k] = low[rows, values[low].argmin(axis=1)]
+            self.highs[k] = high[rows, values[high].argmax(axis=1)]
+        # Непарная последняя корзина снова входит в незаполненный хвост
+        self.size *= 2
+        self.done = pairs
+
+
+class LiveTail:
+    """
+    Слежение за файлом, который ещё дописывает испытательная машина.
+    При каждом опросе разбираются только новые байты: массивы дописываются,
+    а поиск циклов продолжается только на новом хвосте.
+    """
+
+    def __init__(self, file_path, width, length, initial_height, load_threshold=20, run=5,
+                 min_prominence=0.005):
+        self.file_path = file_path
+        self.initial_height = initial_height
+        self.area_m2 = width * length * 1e-6
+        self.form_factor = width / initial_height
+        self.load_threshold = load_threshold
+        self.run = run
+        # Нижняя граница порога пиков, пока СКО по короткой записи ещё мало
+        self.min_prominence = min_prominence
+        self.loader = DataLoader()
+        self.reset()
+
+    def reset(self):
+        self.offset = 0  # позиция в файле (байты)
+        self.remainder = b""  # неполная последняя строка
+        self.rows = 0  # строк прочитано (до обрезки)
+        self.pending = np.empty((0, 3))  # хвост до начала испытания
+        self.origin = None  # строка начала испытания
+
+        self.samples = GrowingArray(3)  # нагрузка, перемещение, время (после обрезки)
+        self.derived = GrowingArray(2)  # отн. деформация (%), удельное давление (МПа)
+        self.stats = RunningStats()
+        self.tracker = None
+        self.peaks_upper = []
+        self.peaks_lower = [0]
+
+    @property
+    def force(self):
+        return self.samples.view[:, 0]
+
+    @property
+    def displacement(self):
+        return self.samples.view[:, 1]
+
+    @property
+    def time(self):
+        return self.samples.view[:, 2]
+
+    @property
+    def strain_percent(self):
+        return self.derived.view[:, 0]
+
+    @property
+    def stress(self):
+        return self.derived.view[:, 1]
+
+    def poll(self):
+        """Читает дописанные байты. Возвращает количество новых точек после обрезки"""
+        if os.path.getsize(self.file_path) < self.offset:
+            # Файл перезаписан с начала
+            self.reset()
+        with open(self.file_path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read()
+        if not data:
+            return 0
+        self.offset += len(data)
+
+        data = self.remainder + data
+        end = data.rfind(b"\n")
+        if end < 0:
+            self.remainder = data
+            return 0
+        self.remainder = data[end + 1:]
+        block = self.loader.parse(io.BytesIO(data[:end + 1])).values
+        if not len(block):
+            return 0
+        first = self.rows
+        self.rows += len(block)
+
+        if self.origin is None:
+            block = self.find_start(block, first)
+            if block is None:
+                return 0
+        return self.extend(block - self.origin)
+
+    def find_start(self, block, first):
+        """Ждёт, пока нагрузка превысит порог run точек подряд (как при обычной обрезке)"""
+        base = first - len(self.pending)
+        block = np.concatenate((self.pending, block))
+        if len(block) >= self.run:
+            window_min = sustained_minimum(block[:, 0], self.run)
+            full = window_min[:len(block) - self.run + 1] > self.load_threshold
+            idx = np.flatnonzero(full)
+            idx = idx[idx + base >= 1]
+            if idx.size:
+                self.origin = block[idx[0]].copy()
+                self.pending = None
+                print(f"Обрезано {base + int(idx[0])} начальных точек")
+                return block[idx[0]:]
+        self.pending = block[-(self.run - 1):]
+        return None
+
+    def extend(self, block):
+        """Дописывает точки и продолжает поиск циклов только по новому хвосту"""
+        offset = self.samples.size
+        self.samples.append(block)
+        strain = block[:, 1] / self.initial_height
+        # Расчётные каналы считаются только для нового блока
+        self.derived.append(np.column_stack((strain * 100, (block[:, 0] / self.area_m2) * 1e-6)))
+        self.stats.update(strain)
+        prominence = max(self.stats.std / 2, self.min_prominence)
+        if self.tracker is None:
+            self.tracker = CycleTracker(prominence)
+        # Порог уточняется по мере накопления записи
+        self.tracker.prominence = prominence
+        for kind, idx in self.tracker.feed(strain, offset):
+            if kind == 'peak':
+                self.peaks_upper.append(idx)
+            else:
+                self.peaks_lower.append(idx)
+        return len(block)
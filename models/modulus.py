@@ -0,0 +1,149 @@
+import numpy as np
+from scipy.signal import find_peaks, savgol_filter
+
+# Расчёт кривой модуля упругости dσ/dε
+MODULUS_KERNELS = {
+    'gradient': 'Производная + медиана + Гаусс',
+    'regression': 'Скользящая регрессия',
+    'savgol': 'Савицкий-Голей',
+}
+
+
+def secant_modulus_windows(force, displacement, area, initial_height, window, stride=None):
+    """
+    Секущий модуль по окнам длиной window отсчётов с шагом stride
+    (stride = window - окна без перекрытия). Все окна считаются одним
+    векторным проходом. Возвращает (Pr, E1, Eps1).
+    """
+    stride = window if stride is None else stride
+    n = (len(force) - window) // stride + 1 if len(force) >= window else 0
+    idx1 = np.arange(n) * stride
+    idx2 = idx1 + window - 1
+
+    F1, F2 = force[idx1], force[idx2]
+    S1, S2 = displacement[idx1], displacement[idx2]
+
+    Pr = (F1 + F2) / 2 / area * 1e-6
+    delta_S = S2 - S1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        E1 = np.where(delta_S != 0, ((F2 - F1) / area * 1e-6) / (delta_S / initial_height), 0.0)
+    Eps1 = (S1 + S2) / 2 / initial_height
+    return Pr, E1, Eps1
+
+
+def rolling_slope(x, y, window):
+    """
+    Наклон прямой МНК y(x) в окне window точек с центром в каждой точке
+    (у краёв окно укорачивается). Суммы по окнам берутся из накопленных сумм,
+    поэтому расчёт - один векторный проход. Где x в окне почти не меняется,
+    наклон не определён (NaN).
+    """
+    n = len(x)
+    # Центрирование уменьшает потерю точности в накопленных суммах
+    x = x - np.mean(x)
+    y = y - np.mean(y)
+    lo = np.clip(np.arange(n) - window // 2, 0, n)
+    hi = np.clip(np.arange(n) + (window - 1) // 2 + 1, 0, n)
+    count = hi - lo
+
+    def window_sum(values):
+        total = np.concatenate(([0.0], np.cumsum(values)))
+        return total[hi] - total[lo]
+
+    sx, sy = window_sum(x), window_sum(y)
+    sxx = count * window_sum(x * x) - sx * sx
+    sxy = count * window_sum(x * y) - sx * sy
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(sxx > 1e-9 * np.max(sxx), sxy / sxx, np.nan)
+
+
+def savgol_slope(x, y, window, polyorder=2):
+    """dy/dx как отношение производных Савицкого-Голея по номеру отсчёта"""
+    window = max(window | 1, polyorder + 2 | 1)
+    if window > len(x):
+        return np.full(len(x), np.nan)
+    dx = savgol_filter(x, window, polyorder, deriv=1)
+    dy = savgol_filter(y, window, polyorder, deriv=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(np.abs(dx) > 1e-9 * np.max(np.abs(dx)), dy / dx, np.nan)
+
+
+class SecantModulusEngine:
+    """
+    Модуль упругости по окнам на одном цикле нагружения (E1, Eps1, Pr).
+    По умолчанию окна по 2 секунды без перекрытия на втором цикле.
+    """
+
+    def __init__(self, window_seconds=2.0, window=None, stride=None, overlap=0.0,
+                 cycle_index=1, skip_windows=3):
+        self.window_seconds = window_seconds
+        self.window = window  # длина окна в отсчётах (вместо window_seconds)
+        self.stride = stride  # шаг окон в отсчётах (вместо overlap)
+        self.overlap = overlap  # доля перекрытия соседних окон, 0 <= overlap < 1
+        self.cycle_index = cycle_index
+        self.skip_windows = skip_windows  # пропуск начала цикла (в длинах окна)
+
+    def key(self):
+        """Параметры расчёта (для проверки, нужен ли пересчёт)"""
+        return (self.window_seconds, self.window, self.stride, self.overlap,
+                self.cycle_index, self.skip_windows)
+
+    def window_size(self, sr):
+        if self.window:
+            return int(self.window)
+        return int(np.ceil(sr * self.window_seconds))
+
+    def stride_size(self, window):
+        if self.stride:
+            return int(self.stride)
+        return max(1, int(round(window * (1 - self.overlap))))
+
+    def select_cycle(self, S):
+        """Границы (Start, Finish) анализируемого цикла по пикам перемещения"""
+        peaks, _ = find_peaks(S, height=0.5 * np.max(S))
+        if len(peaks) < 3:
+            return None
+        cycle_index = min(max(self.cycle_index, 1), len(peaks) - 1)
+        cycle_length = peaks[cycle_index] - peaks[cycle_index - 1]
+        Start = peaks[cycle_index] - cycle_length + 1
+        Finish = peaks[cycle_index]
+        return Start, Finish
+
+    def run(self, force, displacement, time, area, initial_height, force_origin=0.0):
+        """
+        Расчёт по исходным столбцам файла. Важны только разности отсчётов, поэтому
+        столбцы можно передать со сдвинутым началом отсчёта: force_origin - сдвиг
+        нагрузки (нагрузка файла = force + force_origin). Возвращает (E1, Eps1, Pr)
+        в единицах графиков (МПа, %, МПа) или None, если пиков меньше трёх.
+        """
+        k = np.argmax(force > -force_origin)
+        # Полная длина нужна только перемещению (поиск цикла), нагрузка - на одном цикле
+        S = np.subtract(displacement[k:], displacement[k], dtype=np.float64)
+        duration = float(time[-1]) - float(time[k])
+        sr = len(S) / duration if duration != 0 else 10
+
+        bounds = self.select_cycle(S)
+        if bounds is None:
+            print("Недостаточно пиков для анализа (3 минимум)")
+            return None
+        Start, Finish = bounds
+
+        window = self.window_size(sr)
+        stride = self.stride_size(window)
+        F = np.subtract(force[k + Start:k + Finish + 1], force[k], dtype=np.float64)
+        Pr, E1, Eps1 = secant_modulus_windows(F, S[Start:Finish + 1], area, initial_height, window, stride)
+
+        if len(Pr) > 0:
+            Pr = Pr - Pr[0]
+
+        # Пропускаем начало цикла и берём вторую половину окон
+        skip = int(np.ceil(self.skip_windows * window / stride))
+        Pr, E1, Eps1 = Pr[skip:], E1[skip:], Eps1[skip:]
+        half = int(len(Pr) / 2)
+        Eps1, E1, Pr = Eps1[half:], E1[half:], Pr[half:]
+
+        if Pr.size > 2:
+            Eps1 = Eps1 - Eps1[0]
+            Pr = Pr - np.min(Pr)
+
+        return E1 * 1_000_000, Eps1 * 100, Pr * 1_000_000
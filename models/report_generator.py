@@ -1,7 +1,41 @@
 from docxtpl import DocxTemplate, InlineImage
 from docx.shared import Cm
 import datetime
+import os
 from pathlib import Path
+import pandas as pd
+
+TEMPLATE_DIR = Path(__file__).parent.parent / 'views'
+TEMPLATES = {
+    'ДС': 'VibraTable_Template_DS.docx',
+    'НИИСФ': 'VibraTable_Template_NIISF.docx',
+}
+
+
+def save_modulus_table(E1, Eps1, Pr, file_name, cycles=None, levels=None):
+    """
+    Сохраняет таблицу модуля упругости в Excel
+    :param E1: Удельная нагрузка (МПа)
+    :param Eps1: Относительная деформация (%)
+    :param Pr: Модуль упругости (Estat, МПа)
+    :param cycles: итоги по циклам (DataFrame), пишутся на лист "Циклы"
+    :param levels: модуль на уровнях деформации (DataFrame), лист "Модуль по уровням"
+    """
+    df = pd.DataFrame({
+        'Удельная нагрузка, МПа': E1,
+        'Отн. деф-я, %': Eps1,
+        'Estat, МПа': Pr
+    })
+    if not file_name.endswith('.xlsx'):
+        file_name += '.xlsx'
+    with pd.ExcelWriter(file_name) as writer:
+        df.to_excel(writer, index=False)
+        if cycles is not None:
+            cycles.to_excel(writer, sheet_name='Циклы', index=False)
+        if levels is not None:
+            levels.to_excel(writer, sheet_name='Модуль по уровням', index=False)
+    return file_name
+
 
 class VibraTableReportGenerator:
     def __init__(self):
@@ -13,9 +47,11 @@ class VibraTableReportGenerator:
         year, month, day = self.data.split('-')
         return f'«{day}» {months[int(month)-1]} {year}'
 
-    def number_protocol(self):
+    def number_protocol(self, template_name='ДС'):
         year, month, day = self.data.split('-')
-        return f'ДС-0{month}-{year}-'
+        if template_name == 'ДС':
+            return f'ДС-0{month}-{year}-'
+        return f'0{month}-{year}-'
 
     def safe_image(self, path_, width, doc, savedir):
         savedir = Path(savedir)
@@ -61,4 +97,61 @@ class VibraTableReportGenerator:
             print(f"✅ Документ сохранён: {output_path}")
             return output_path
         except Exception as e:
-            raise Exception(f"🚨 Ошибка при сохранении: {e}")
\ No newline at end of file
+            raise Exception(f"🚨 Ошибка при сохранении: {e}")
+
+    def generate_protocol(self, name, a, b, h, mass, protocol, savedir,
+                          cycle_images=(), template_name='ДС'):
+        """Заполняет шаблон протокола рисунками из savedir и сохраняет .docx"""
+        self.data = datetime.datetime.now().strftime('%Y-%m-%d')
+        template_path = TEMPLATE_DIR / TEMPLATES.get(template_name, TEMPLATES['ДС'])
+        doc = DocxTemplate(template_path)
+        savedir = str(savedir)
+
+        list_cycle = [{'image': InlineImage(doc, str(path), width=Cm(20)), 'count': i}
+                      for i, path in enumerate(cycle_images, 1)]
+        context = {
+            'name': name,
+            'test_date': self.transform_date(),
+            'a': a,
+            'b': b,
+            'h': h,
+            'mass': mass,
+            'loads': ['Модуль_упругости', 'Основные_графики', 'Нагруж'],
+            'protocol': protocol,
+            'num_protocol': self.number_protocol(template_name),
+            'load_pic': InlineImage(doc, savedir + '/Модуль_упругости.png', width=Cm(20)),
+            'cycles_pic': InlineImage(doc, savedir + '/Нагруж.png', width=Cm(20)),
+            'elastic_pic': InlineImage(doc, savedir + '/Основные_графики.png', width=Cm(20)),
+            'list_cyrcle': list_cycle,
+        }
+        doc.render(context=context)
+
+        year = self.data[:4]
+        if protocol is not None:
+            output_path = f'{savedir}/ДС-003-{year}-В{protocol}.docx'
+        else:
+            output_path = f'{savedir}/ДС-003-{year}-В_{name}.docx'
+        doc.save(output_path)
+        return output_path
+
+
+def save_results(processor, figures, save_path, file_name, sample, template_name='ДС',
+                 save_C_stat=False, decimate_cycles=False, report_generator=None):
+    """
+    Сохраняет результаты испытания в папку save_path - одинаково из окна и при пакетной
+    обработке: C_stat (по флагу), графики PNG с графиками циклов (figures - ResultFigures
+    с уже подставленными данными), таблицу Excel и протокол Word.
+    sample - словарь name, width, length, height, mass, protocol.
+    Возвращает пути (таблица Excel, протокол).
+    """
+    if save_C_stat:
+        processor.C_stat(save_path)
+    cycle_images = figures.save(save_path, processor, decimate_cycles)
+    excel_path = save_modulus_table(processor.E1, processor.Eps1, processor.Pr,
+                                    os.path.join(save_path, file_name), processor.cycles.to_frame(),
+                                    processor.modulus_at(processor.modulus_levels))
+    generator = report_generator or VibraTableReportGenerator()
+    docx_path = generator.generate_protocol(sample['name'], sample['width'], sample['length'], sample['height'],
+                                            sample.get('mass'), sample.get('protocol'), save_path,
+                                            cycle_images, template_name)
+    return excel_path, docx_path
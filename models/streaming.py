@@ -0,0 +1,307 @@
+import numpy as np
+
+
+class RunningStats:
+    """Потоковые среднее и дисперсия (объединение по блокам, алгоритм Чана)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, data):
+        data = data[~np.isnan(data)]
+        n = len(data)
+        if n == 0:
+            return
+        mean = float(np.mean(data))
+        m2 = float(np.sum((data - mean) ** 2))
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta ** 2 * self.count * n / total
+        self.count = total
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2 / self.count) if self.count else 0.0
+
+
+class CycleTracker:
+    """
+    Инкрементальный поиск верхних и нижних пиков (зигзаг с порогом prominence).
+    Пик подтверждается, когда сигнал отходит от экстремума больше чем на prominence,
+    поэтому данные можно подавать произвольными блоками.
+    """
+
+    def __init__(self, prominence, block=8192):
+        self.prominence = prominence
+        self.block = block
+        self.rising = True
+        self.ext_val = None
+        self.ext_idx = 0
+
+    def feed(self, values, offset):
+        """
+        Обрабатывает очередной блок (offset - глобальный индекс values[0]).
+        Возвращает список событий ('peak' | 'valley', глобальный индекс).
+        """
+        events = []
+        n = len(values)
+        pos = 0
+        if self.ext_val is None and n:
+            self.ext_val = values[0]
+            self.ext_idx = offset
+            pos = 1
+        while pos < n:
+            seg = values[pos:pos + self.block]
+            if self.rising:
+                run = np.maximum(np.maximum.accumulate(seg), self.ext_val)
+                turn = np.flatnonzero(seg < run - self.prominence)
+            else:
+                run = np.minimum(np.minimum.accumulate(seg), self.ext_val)
+                turn = np.flatnonzero(seg > run + self.prominence)
+
+            head = seg if turn.size == 0 else seg[:turn[0]]
+            if head.size:
+                j = int(np.argmax(head) if self.rising else np.argmin(head))
+                if (head[j] > self.ext_val) if self.rising else (head[j] < self.ext_val):
+                    self.ext_val = head[j]
+                    self.ext_idx = offset + pos + j
+
+            if turn.size == 0:
+                pos += len(seg)
+                continue
+
+            t = int(turn[0])
+            events.append(('peak' if self.rising else 'valley', self.ext_idx))
+            self.rising = not self.rising
+            self.ext_val = seg[t]
+            self.ext_idx = offset + pos + t
+            pos += t + 1
+        return events
+
+
+class CycleAccumulator:
+    """
+    Итоги непрерывного отрезка записи, накапливаемые блоками: максимумы, работа F dS
+    (сумма трапеций), первый и последний отсчёты для замыкания петли, точка
+    максимума перемещения (пик цикла) с работой до неё и первый минимум перемещения
+    после пика (впадина, как в CycleTable.find_valleys).
+    """
+
+    def __init__(self, start):
+        self.start = start
+        self.end = start
+        self.first = None  # (F, S) первого отсчёта
+        self.last = None  # (F, S) последнего отсчёта
+        self.max_force = -np.inf
+        self.max_displacement = -np.inf
+        self.work = 0.0
+        self.peak = None  # (индекс, F, S, работа от начала отрезка)
+        self.lowest = None  # (индекс, S) минимума всего отрезка
+        self.valley = None  # (индекс, S) минимума после пика
+
+    def add(self, block):
+        """Дописывает отсчёты block (строки F, S, t), идущие сразу за self.end"""
+        if not len(block):
+            return
+        force, displacement = block[:, 0], block[:, 1]
+        steps = np.empty(len(block))
+        steps[1:] = np.diff(displacement) * (force[1:] + force[:-1]) / 2
+        if self.last is None:
+            self.first = (force[0], displacement[0])
+            steps[0] = 0.0
+        else:
+            steps[0] = (displacement[0] - self.last[1]) * (force[0] + self.last[0]) / 2
+        work = np.cumsum(steps)
+        j = int(np.argmax(displacement))
+        k = int(np.argmin(displacement))
+        if self.peak is None or displacement[j] > self.peak[2]:
+            self.peak = (self.end + j, force[j], displacement[j], self.work + work[j])
+            m = j + int(np.argmin(displacement[j:]))
+            self.valley = (self.end + m, displacement[m])
+        elif displacement[k] < self.valley[1]:
+            self.valley = (self.end + k, displacement[k])
+        if self.lowest is None or displacement[k] < self.lowest[1]:
+            self.lowest = (self.end + k, displacement[k])
+        self.work += work[-1]
+        self.max_force = max(self.max_force, np.max(force))
+        self.max_displacement = max(self.max_displacement, np.max(displacement))
+        self.last = (force[-1], displacement[-1])
+        self.end += len(block)
+
+    def merge(self, other):
+        """Дописывает отрезок other, начинающийся сразу за self.end"""
+        if other.last is None:
+            return
+        if self.last is None:
+            self.__dict__.update(other.__dict__)
+            return
+        joint = self.work + (other.first[1] - self.last[1]) * (other.first[0] + self.last[0]) / 2
+        if other.peak[2] > self.peak[2]:
+            index, force, displacement, work = other.peak
+            self.peak = (index, force, displacement, joint + work)
+            self.valley = other.valley
+        elif other.lowest[1] < self.valley[1]:
+            self.valley = other.lowest
+        if other.lowest[1] < self.lowest[1]:
+            self.lowest = other.lowest
+        self.work = joint + other.work
+        self.max_force = max(self.max_force, other.max_force)
+        self.max_displacement = max(self.max_displacement, other.max_displacement)
+        self.last = other.last
+        self.end = other.end
+
+    def summary(self, number, initial_height, area_m2):
+        """Строка таблицы циклов (столбцы как в CycleTable.to_frame)"""
+        peak, peak_force, peak_displacement, loading = self.peak
+        # Петля замыкается отрезком от последней точки цикла к первой
+        closing = (self.first[1] - self.last[1]) * (self.first[0] + self.last[0]) / 2
+        loop_area = abs(self.work + closing)
+        delta_S = peak_displacement - self.first[1]
+        return {
+            'Цикл': number,
+            'Начало': self.start,
+            'Пик': peak,
+            'Впадина': self.valley[0],
+            'Конец': self.end,
+            'Макс. нагрузка, Н': float(self.max_force),
+            'Макс. перемещение, мм': float(self.max_displacement),
+            'Макс. удельное давление, МПа': float(self.max_force / area_m2 * 1e-6),
+            'Макс. отн. деформация, %': float(self.max_displacement / initial_height) * 100,
+            'Площадь петли, Н·мм': float(loop_area),
+            'Рассеянная энергия, Дж': float(loop_area) / 1000,
+            'Работа нагружения, Дж': float(loading) / 1000,
+            'Секущая жёсткость, Н/мм': float((peak_force - self.first[0]) / delta_S) if delta_S != 0 else np.nan,
+        }
+
+
+class CycleStream:
+    """
+    Циклы нагружения по блокам обрезанной записи с теми же границами, что у
+    DataProcessor.find_peaks/CycleTable: впадина (CycleTracker) сдвигается к первой
+    следующей точке, где производная деформации положительна (как adjust_lower_peaks),
+    и с этой точки начинается следующий цикл. Отсчёты сворачиваются в итоги, как только
+    ясно, какому циклу они принадлежат; пока граница не определена (разгрузка, выдержка),
+    хвост после возможной границы копится в отдельном накопителе, а не в буфере,
+    поэтому память не зависит от длины записи и длительности выдержек.
+    """
+
+    def __init__(self, prominence, initial_height, area_m2):
+        self.tracker = CycleTracker(prominence)
+        self.initial_height = initial_height
+        self.area_m2 = area_m2
+        self.current = CycleAccumulator(0)
+        self.has_peak = False
+        self.limbo = None  # итоги после точки подъёма за впадиной-кандидатом
+        self.limbo_valley = None
+        self.tail = np.empty((0, 3))  # ещё не свёрнутые отсчёты с индекса tail_start
+        self.tail_start = 0
+        self.rises = np.empty(0, dtype=np.int64)  # точки подъёма с индексами >= tail_start
+        self.context = np.empty(0)  # два последних перемещения для производной на стыке блоков
+        self.events = []
+        self.rows = []
+        self.total = 0
+
+    def feed(self, offset, chunk):
+        """Обрабатывает очередной блок (offset - индекс chunk[0] после обрезки)"""
+        displacement = chunk[:, 1]
+        self.total = offset + len(chunk)
+        # Производная в точке i - знак S[i+1] - S[i-1] (np.gradient), в первой точке - S[1] - S[0].
+        # Последняя точка блока ждёт следующего блока
+        values = np.concatenate((self.context, displacement))
+        first = offset - len(self.context) + 1
+        rising = np.flatnonzero(values[2:] > values[:-2]) + first
+        if offset == 0 and len(values) > 1 and values[1] > values[0]:
+            rising = np.insert(rising, 0, 0)
+        self.context = values[-2:]
+        self.rises = np.concatenate((self.rises, rising))
+        self.tail = np.concatenate((self.tail, chunk))
+
+        self.events.extend(self.tracker.feed(displacement / self.initial_height, offset))
+        self.drain()
+        self.fold()
+
+    def finish(self):
+        """Закрывает последний цикл (если у него есть пик) и возвращает строки таблицы"""
+        values = self.context
+        if len(values) == 2 and values[1] > values[0]:
+            self.rises = np.append(self.rises, self.total - 1)
+        self.drain()
+        if self.limbo is not None:
+            self.current.merge(self.limbo)
+            self.limbo = None
+        self.current.add(self.tail)
+        self.tail = self.tail[:0]
+        if self.has_peak:
+            # Впадина без подъёма после неё не закрывает цикл (как в adjust_lower_peaks)
+            self.close()
+        return self.rows
+
+    def drain(self):
+        """Закрывает циклы по подтверждённым впадинам, пока известны точки подъёма за ними"""
+        while self.events:
+            kind, index = self.events[0]
+            if kind == 'peak':
+                self.has_peak = True
+            elif self.limbo is not None and index == self.limbo_valley:
+                following = self.limbo
+                self.limbo = None
+                self.close(following)
+            else:
+                self.release_limbo()
+                j = np.searchsorted(self.rises, index)
+                if j == len(self.rises):
+                    # Подъём ещё не виден - ждём следующего блока
+                    return
+                split = int(self.rises[j])
+                self.fold_to(split)
+                self.close(CycleAccumulator(split))
+            self.events.pop(0)
+
+    def fold(self):
+        """Сворачивает хвост блока, которому уже ясен цикл"""
+        if self.events:
+            # Граница впадины не раньше последней точки с неизвестной производной
+            self.fold_to(self.total - 1)
+        elif self.has_peak and not self.tracker.rising:
+            valley = self.tracker.ext_idx
+            if self.limbo is not None and valley == self.limbo_valley:
+                self.limbo.add(self.tail)
+                self.fold_to(self.total, keep=False)
+                return
+            self.release_limbo()
+            j = np.searchsorted(self.rises, valley)
+            if j == len(self.rises):
+                self.fold_to(self.total - 1)
+                return
+            # Граница - split или позже, если впадина сместится: тогда хвост отойдёт текущему циклу
+            split = int(self.rises[j])
+            self.fold_to(split)
+            self.limbo = CycleAccumulator(split)
+            self.limbo.add(self.tail)
+            self.limbo_valley = valley
+            self.fold_to(self.total, keep=False)
+        else:
+            self.fold_to(self.total)
+
+    def fold_to(self, index, keep=True):
+        """Переносит отсчёты хвоста до index в текущий цикл (keep=False - просто отбрасывает)"""
+        count = index - self.tail_start
+        if keep:
+            self.current.add(self.tail[:count])
+        self.tail = self.tail[count:]
+        self.tail_start = index
+        self.rises = self.rises[self.rises >= index]
+
+    def release_limbo(self):
+        """Впадина сместилась дальше: накопленный после неё хвост принадлежит текущему циклу"""
+        if self.limbo is not None:
+            self.current.merge(self.limbo)
+            self.limbo = None
+
+    def close(self, following=None):
+        self.rows.append(self.current.summary(len(self.rows) + 1, self.initial_height, self.area_m2))
+        self.current = following
+        self.has_peak = False
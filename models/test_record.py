@@ -0,0 +1,69 @@
+import numpy as np
+
+# Исходные каналы (на всю длину файла) и расчётные (после обрезки)
+RAW_CHANNELS = ('force', 'displacement', 'time')
+DERIVED_CHANNELS = ('strain', 'stress', 'strain_percent', 'young_modulus', 'strain_smooth')
+
+
+def _channel(block, index):
+    """Именованное представление строки блока (без копирования)"""
+    def get(self):
+        data = getattr(self, block)
+        return data[index, self.start:] if block == 'raw' else data[index]
+    return property(get)
+
+
+class TestRecord:
+    """
+    Запись одного испытания в двух непрерывных блоках: исходные каналы
+    (нагрузка, перемещение, время) и расчётные (деформация, давление, модуль...).
+    Исходные каналы хранятся уже со сдвигом начала отсчёта, поэтому обрезанные
+    данные - представления [start:], а не копии. dtype=np.float32 вдвое уменьшает
+    объём; расчёты, чувствительные к точности, ведутся во float64 на временных массивах.
+    """
+
+    __slots__ = ('raw', 'derived', 'origin', 'start', 'dtype')
+
+    def __init__(self, columns, dtype=np.float64):
+        """columns - массив (каналы x отсчёты) в порядке RAW_CHANNELS"""
+        self.dtype = np.dtype(dtype)
+        self.raw = np.array(columns, dtype=self.dtype)
+        self.origin = np.zeros(len(RAW_CHANNELS))
+        self.start = 0
+        self.derived = np.empty((len(DERIVED_CHANNELS), 0), dtype=self.dtype)
+
+    force = _channel('raw', 0)
+    displacement = _channel('raw', 1)
+    time = _channel('raw', 2)
+    strain = _channel('derived', 0)
+    stress = _channel('derived', 1)
+    strain_percent = _channel('derived', 2)
+    young_modulus = _channel('derived', 3)
+    strain_smooth = _channel('derived', 4)
+
+    @property
+    def length(self):
+        """Число отсчётов в файле (до обрезки)"""
+        return self.raw.shape[1]
+
+    def trim(self, start):
+        """Начало испытания с отсчёта start: сдвиг каналов на месте, расчётные каналы заново"""
+        shift = self.raw[:, start].astype(float)
+        self.raw -= shift.astype(self.dtype)[:, None]
+        self.origin += shift
+        self.start = start
+        self.derived = np.empty((len(DERIVED_CHANNELS), self.length - start), dtype=self.dtype)
+
+    @property
+    def nbytes(self):
+        return self.raw.nbytes + self.derived.nbytes
+
+    def footprint(self):
+        """
+        Память записи и оценка прежней раскладки: DataFrame float64 плюс отдельные
+        float64-копии обрезанных исходных и расчётных каналов. Возвращает (байты, байты).
+        """
+        trimmed = self.length - self.start
+        legacy = 8 * (len(RAW_CHANNELS) * self.length
+                      + (len(RAW_CHANNELS) + len(DERIVED_CHANNELS)) * trimmed)
+        return self.nbytes, legacy
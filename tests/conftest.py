@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+
+def loading_record(cycles=6, points=400, hold=200, seed=0):
+    """
+    Синтетическое испытание: hold отсчётов без нагрузки, затем cycles циклов
+    нагружения по points отсчётов (перемещение - косинус, нагрузка - петля с гистерезисом).
+    Возвращает (нагрузка Н, перемещение мм, время с).
+    """
+    rng = np.random.default_rng(seed)
+    phase = np.linspace(0, 2 * np.pi * cycles, cycles * points, endpoint=False)
+    displacement = 2 * (1 - np.cos(phase)) + rng.normal(0, 0.002, phase.size)
+    force = 2000 * displacement + 300 * np.sin(phase) + 100 + rng.normal(0, 0.5, phase.size)
+    displacement = np.concatenate((np.zeros(hold), displacement))
+    force = np.concatenate((np.full(hold, 2.0), force))
+    time = np.arange(len(force)) * 0.01
+    return force, displacement, time
+
+
+def machine_lines(force, displacement, time, decimal=','):
+    """Строки .txt испытательной машины: нагрузка, (не используется), перемещение, время"""
+    lines = []
+    for row in zip(force, np.zeros(len(force)), displacement, time):
+        lines.append('\t'.join(f'{v:.4f}'.replace('.', decimal) for v in row) + '\n')
+    return lines
+
+
+@pytest.fixture
+def record():
+    return loading_record()
+
+
+@pytest.fixture
+def test_file(tmp_path, record):
+    """Файл испытания с записью record (десятичная запятая)"""
+    path = tmp_path / 'specimen.txt'
+    path.write_text(''.join(machine_lines(*record)))
+    return str(path)
+
+
+@pytest.fixture
+def processor():
+    """DataProcessor без дискового кэша"""
+    from models.data_processor import DataProcessor
+    processor = DataProcessor()
+    processor.loader.cache.max_size_mb = 0
+    return processor
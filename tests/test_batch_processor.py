@@ -0,0 +1,70 @@
+import os
+import pandas as pd
+import pytest
+from models.batch_processor import process_specimen, run_batch
+from models.data_processor import DataProcessor
+
+
+def test_settings_round_trip():
+    source = DataProcessor()
+    source.median_filter_size = 9
+    source.modulus_kernel = 'savgol'
+    source.despike = True
+    source.modulus_engine.overlap = 0.5
+    target = DataProcessor()
+    target.apply_settings(source.settings())
+    assert target.settings() == source.settings()
+    with pytest.raises(ValueError):
+        target.apply_settings({'median_size': 3})
+
+
+def test_specimen_uses_window_settings(test_file, tmp_path):
+    processor = DataProcessor()
+    processor.c_stat_thresholds = [(625, 8750), (100, 2000)]
+    processor.load_threshold = 50
+    params = {'width': 100, 'length': 100, 'height': 25, 'mass': 1.0,
+              'settings': processor.settings(), 'style': {'is_title': False}, 'save_C_stat': True}
+    summary = process_specimen(test_file, params, str(tmp_path))
+    assert summary['Ошибка'] == ''
+
+    files = set(os.listdir(tmp_path / 'Результаты_specimen'))
+    cycles = {f'Цикл_{k}.png' for k in range(1, summary['Циклов'] + 1)}
+    assert {'Основные_графики.png', 'Циклы_нагружения.png', 'Модуль_упругости.png', 'Нагруж.png',
+            'specimen.xlsx', 'результаты_циклов.xlsx'} | cycles <= files
+    assert any(name.endswith('.docx') for name in files)
+    c_stat = pd.read_excel(tmp_path / 'Результаты_specimen' / 'результаты_циклов.xlsx')
+    assert list(c_stat.columns) == ['Результат 625-8750 Н', 'Результат 100-2000 Н']
+
+
+def test_run_batch_summary(tmp_path, test_file):
+    summary = run_batch(os.path.dirname(test_file), {'width': 100, 'length': 100, 'height': 25},
+                        output_dir=str(tmp_path / 'out'), workers=1)
+    assert list(summary['Образец']) == ['specimen']
+    assert (tmp_path / 'out' / 'Сводная_таблица.xlsx').exists()
+
+
+def test_window_and_batch_save_the_same_files(test_file, tmp_path, monkeypatch):
+    pytest.importorskip('PyQt5.QtWidgets')
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication, QFileDialog, QMessageBox
+    app = QApplication.instance() or QApplication([])
+    from views.main_window import YoungModulusApp
+    window = YoungModulusApp()
+    window.file_path = test_file
+    window.processor.loader.cache.max_size_mb = 0
+    window.processor.analyze(test_file, *window.sample_geometry())
+    window.results_ready = True
+    window.render_plots()
+    monkeypatch.setattr(QFileDialog, 'getExistingDirectory', lambda *args, **kwargs: str(tmp_path / 'gui'))
+    monkeypatch.setattr(QMessageBox, 'information', lambda *args, **kwargs: None)
+    window.save_plots()
+    window.close()
+    app.processEvents()
+
+    params = {'width': 100, 'length': 100, 'height': 25, 'mass': 1.0,
+              'settings': window.processor.settings(), 'style': window.plot_style()}
+    summary = process_specimen(test_file, params, str(tmp_path / 'batch'))
+    assert summary['Ошибка'] == ''
+    saved = sorted(os.listdir(tmp_path / 'gui' / 'Результаты_specimen'))
+    assert [name for name in saved if not name.endswith('.docx')] == \
+        [name for name in sorted(os.listdir(tmp_path / 'batch' / 'Результаты_specimen')) if not name.endswith('.docx')]
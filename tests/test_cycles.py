@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+from models.cycles import CycleTable
+
+
+def reference(force, displacement, peaks_upper, peaks_lower):
+    """Итоги по циклам прежним кодом: отдельный срез на каждый цикл"""
+    n = min(len(peaks_upper), len(peaks_lower))
+    rows = []
+    for k in range(n):
+        start, peak = peaks_lower[k], peaks_upper[k]
+        end = peaks_lower[k + 1] if k + 1 < n else len(force)
+        x, y = displacement[start:end], force[start:end]
+        unloading = displacement[peak:end]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            secant = (force[peak] - force[start]) / (displacement[peak] - displacement[start])
+        rows.append({
+            'max_force': np.max(y),
+            'max_displacement': np.max(x),
+            'loop_area': abs(np.trapezoid(np.append(y, y[0]), np.append(x, x[0]))),
+            'loading_energy': np.trapezoid(force[start:peak + 1], displacement[start:peak + 1]),
+            'secant_stiffness': secant,
+            'valley': peak + np.argmin(unloading) if unloading.size else end - 1,
+        })
+    return rows
+
+
+def loading_cycles(cycles=6, points=400, seed=0):
+    """Петли нагрузка-перемещение с шумом и границы циклов по ним"""
+    rng = np.random.default_rng(seed)
+    phase = np.linspace(0, 2 * np.pi * cycles, cycles * points, endpoint=False)
+    displacement = 2 * (1 - np.cos(phase)) + rng.normal(0, 0.01, phase.size)
+    force = 500 * displacement + 80 * np.sin(phase) + rng.normal(0, 1, phase.size)
+    lower = np.arange(cycles) * points
+    upper = lower + points // 2
+    return force, displacement, upper, lower
+
+
+def check_against_reference(table, expected):
+    assert len(table) == len(expected)
+    for name in expected[0]:
+        np.testing.assert_allclose(getattr(table, name), [row[name] for row in expected], rtol=1e-9,
+                                   err_msg=name)
+
+
+def test_aggregates_match_per_slice_code():
+    force, displacement, upper, lower = loading_cycles()
+    table = CycleTable(upper, lower, len(force))
+    table.summarize(force, displacement, force, displacement)
+    check_against_reference(table, reference(force, displacement, upper, lower))
+
+
+def test_random_boundaries_match_per_slice_code():
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        n = int(rng.integers(50, 500))
+        force, displacement = rng.normal(size=n), rng.normal(size=n)
+        lower = np.sort(rng.choice(n, int(rng.integers(1, 8)), replace=False))
+        upper = np.sort(rng.integers(0, n, len(lower)))
+        table = CycleTable(upper, lower, n)
+        table.summarize(force, displacement, force, displacement)
+
+        expected = reference(force, displacement, upper, lower)
+        np.testing.assert_array_equal(table.max_force, [row['max_force'] for row in expected])
+        np.testing.assert_array_equal(table.valley, [row['valley'] for row in expected])
+
+
+def test_flat_loading_has_no_secant_stiffness():
+    force = np.arange(20, dtype=float)
+    displacement = np.zeros(20)
+    table = CycleTable([5, 15], [0, 10], 20)
+    table.summarize(force, displacement, force, displacement)
+    assert np.isnan(table.secant_stiffness).all()
+    np.testing.assert_array_equal(table.loop_area, [0, 0])
+
+
+def test_repeated_starts_are_dropped():
+    # Совпавшие впадины дали бы reduceat отрезок из одной точки
+    table = CycleTable([5, 15, 25, 35], [0, 10, 10, 30], 40)
+    np.testing.assert_array_equal(table.start, [0, 10, 30])
+    np.testing.assert_array_equal(table.peak, [5, 15, 35])
+    np.testing.assert_array_equal(table.end, [10, 30, 40])
+
+    force = np.arange(40, dtype=float)
+    table.summarize(force, force, force, force)
+    np.testing.assert_array_equal(table.max_force, [9, 29, 39])
+
+
+def test_valley_with_nan_matches_argmin():
+    displacement = np.array([0, 1, 2, 3, 2, np.nan, 1, 0.5, 1, 2, 3, 2, 1, 0, 1], dtype=float)
+    table = CycleTable([3, 10], [0, 8], len(displacement))
+    table.summarize(displacement, displacement, displacement, displacement)
+    assert table.valley[0] == 5
+    assert table.valley[1] == 13
+
+
+@pytest.mark.parametrize('upper, lower', [([], []), ([5], []), ([], [0])])
+def test_empty_table(upper, lower):
+    table = CycleTable(upper, lower, 10)
+    table.summarize(*[np.zeros(10)] * 4)
+    assert len(table) == 0
+    assert len(table.to_frame()) == 0
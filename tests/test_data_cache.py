@@ -0,0 +1,69 @@
+import os
+import numpy as np
+from models.data_cache import DataCache
+
+
+def write(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+    return str(path)
+
+
+def test_round_trip(tmp_path):
+    cache = DataCache(str(tmp_path / "cache"))
+    data = np.arange(12, dtype=float).reshape(3, 4)
+    cache.put("key", data)
+
+    cached = cache.get("key")
+    assert isinstance(cached, np.memmap)
+    np.testing.assert_array_equal(cached, data)
+    assert cache.get("missing") is None
+
+
+def test_key_follows_content(tmp_path):
+    cache = DataCache(str(tmp_path / "cache"))
+    first = write(tmp_path / "a.txt", "1,0\t2,0\n")
+    same = write(tmp_path / "b.txt", "1,0\t2,0\n")
+    other = write(tmp_path / "c.txt", "1,0\t2,5\n")
+
+    assert cache.key(first) == cache.key(same)
+    assert cache.key(first) != cache.key(other)
+    assert cache.key(first).endswith(f"_{os.path.getsize(first)}")
+
+
+def test_eviction_drops_oldest(tmp_path):
+    # Лимит чуть больше двух записей по ~80 КБ
+    cache = DataCache(str(tmp_path / "cache"), max_size_mb=0.17)
+    data = np.zeros((10, 1000))
+    for age, key in enumerate(("old", "middle")):
+        cache.put(key, data)
+        os.utime(cache.path(key), (age, age))
+    cache.put("new", data)
+
+    assert cache.get("old") is None
+    assert cache.get("middle") is not None
+    assert cache.get("new") is not None
+    assert cache.size_bytes() <= cache.max_size_mb * 1024 * 1024
+
+
+def test_get_refreshes_access_time(tmp_path):
+    cache = DataCache(str(tmp_path / "cache"), max_size_mb=0.17)
+    data = np.zeros((10, 1000))
+    for age, key in enumerate(("first", "second")):
+        cache.put(key, data)
+        os.utime(cache.path(key), (age, age))
+    # Прочитанная запись становится самой свежей и переживает вытеснение
+    assert cache.get("first") is not None
+    cache.put("third", data)
+
+    assert cache.get("first") is not None
+    assert cache.get("second") is None
+
+
+def test_disabled_and_clear(tmp_path):
+    cache = DataCache(str(tmp_path / "cache"), max_size_mb=0)
+    assert not cache.enabled
+    cache.max_size_mb = 10
+    cache.put("key", np.ones((2, 3)))
+    cache.clear()
+    assert cache.entries() == []
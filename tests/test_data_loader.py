@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from models.data_cache import DataCache
+from models.data_loader import DataLoader
+from conftest import loading_record, machine_lines
+
+
+@pytest.fixture
+def loader(tmp_path):
+    return DataLoader(cache=DataCache(str(tmp_path / 'cache'), max_size_mb=0))
+
+
+@pytest.fixture
+def record():
+    return loading_record(cycles=2, points=300, hold=50)
+
+
+def write(path, lines):
+    path.write_text(''.join(lines))
+    return str(path)
+
+
+def test_decimal_comma(loader, tmp_path, record):
+    path = write(tmp_path / 'comma.txt', machine_lines(*record))
+    df = loader.parse(path)
+    assert list(df.columns) == [0, 2, 3]
+    np.testing.assert_allclose(df.values.T, record, atol=5e-5)
+
+
+def test_decimal_point_falls_back(loader, tmp_path, record):
+    comma = machine_lines(*record)
+    point = machine_lines(*record, decimal='.')
+    # Точка только в части строк: быстрый парсер падает, медленный читает всё
+    path = write(tmp_path / 'mixed.txt', comma[:400] + point[400:])
+    np.testing.assert_array_equal(loader.parse(path).values,
+                                  loader.parse(write(tmp_path / 'comma.txt', comma)).values)
+
+
+def test_chunks_fall_back_after_first_block(loader, tmp_path, record):
+    lines = machine_lines(*record)
+    lines[500:] = machine_lines(*(channel[500:] for channel in record), decimal='.')
+    path = write(tmp_path / 'mixed.txt', lines)
+    chunks = list(loader.iter_chunks(path, chunksize=128))
+    np.testing.assert_array_equal(np.concatenate(chunks), loader.parse(path).values)
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+from models.data_processor import DataProcessor
+
+
+def test_adjust_lower_peaks_matches_loop():
+    rng = np.random.default_rng(0)
+    data = np.cumsum(rng.normal(size=2000))
+    peaks = np.sort(rng.choice(2000, 40, replace=False))
+    # Прежний код: градиент и поиск подъёма заново для каждой впадины
+    expected = []
+    for peak in peaks:
+        rise_point = np.where(np.gradient(data)[peak:] > 0)[0]
+        if len(rise_point) > 0:
+            expected.append(peak + rise_point[0])
+    np.testing.assert_array_equal(DataProcessor().adjust_lower_peaks(data, peaks), expected)
+
+
+def test_valley_without_rise_is_dropped():
+    data = np.array([3, 2, 1, 2, 3, 2, 1, 0], dtype=float)
+    # В симметричной впадине градиент нулевой - подъём с соседней точки
+    np.testing.assert_array_equal(DataProcessor().adjust_lower_peaks(data, np.array([2, 6])), [3])
+
+
+def test_unchanged_rerun_recomputes_nothing(processor, test_file):
+    assert processor.analyze(test_file, 100, 100, 25) == set(processor.stage_keys)
+    assert processor.analyze(test_file, 100, 100, 25) == set()
+
+
+def test_only_dependent_stages_are_recomputed(processor, test_file):
+    processor.analyze(test_file, 100, 100, 25)
+    modulus = processor.young_modulus_final.copy()
+    processor.median_filter_size = 9
+    assert processor.analyze(test_file, 100, 100, 25) == {'modulus'}
+    assert not np.array_equal(processor.young_modulus_final, modulus)
+
+    # Новая геометрия: загрузка и обрезка остаются, модуль по окнам зависит от площади
+    recomputed = processor.analyze(test_file, 100, 50, 25)
+    assert recomputed == {'stress_strain', 'modulus', 'peaks', 'cycles', 'strain_filter', 'windowed_modulus'}
+
+    processor.load_threshold = 50
+    assert {'load', 'despike'}.isdisjoint(processor.analyze(test_file, 100, 50, 25))
+
+
+
+def first_crossing(data, threshold, start, stop, length=5):
+    for i in range(start, stop):
+        if np.all(data[i:i + length] > threshold):
+            return i
+    return -1
+
+
+def test_static_stiffness_matches_cycle_loop(processor, test_file):
+    processor.analyze(test_file, 100, 100, 25)
+    pairs = [(625, 5000), (200, 3000), (1000, 1000), (625, 8750)]
+    stiffness = processor.static_stiffness(pairs)
+    assert stiffness.shape == (len(pairs), len(processor.cycles))
+
+    force, displacement = processor.forse__, processor.displacement__
+    for (low, high), row in zip(pairs, stiffness):
+        for k, value in enumerate(row):
+            start, stop = processor.cycles.start[k] + 1, processor.cycles.peak[k] - 5
+            i, j = first_crossing(force, low, start, stop), first_crossing(force, high, start, stop)
+            if low == high or i < 0 or j < 0:
+                # Пара нулевой ширины и недостигнутый порог - без результата
+                assert np.isnan(value)
+            else:
+                expected = (high - low) / ((displacement[j] - displacement[i]) * processor.area)
+                assert value == pytest.approx(expected, rel=1e-6)
+    assert np.isfinite(stiffness[:2, 1:]).all()
+
+
+def test_c_stat_writes_one_column_per_pair(processor, test_file, tmp_path):
+    processor.analyze(test_file, 100, 100, 25)
+    processor.c_stat_thresholds = [(625, 5000), (200, 3000)]
+    df = processor.C_stat(str(tmp_path))
+    assert list(df.columns) == ['Результат 625-5000 Н', 'Результат 200-3000 Н']
+    assert (tmp_path / 'результаты_циклов.xlsx').exists()
+
+
+def test_modulus_at_levels(processor, test_file):
+    processor.analyze(test_file, 100, 100, 25)
+    # на короткой записи окон модуля нет - уровни не достигнуты
+    windows = processor.modulus_at([1, 2])
+    assert list(windows['Уровень']) == [1, 2]
+    assert windows.iloc[:, 1:].isna().all().all()
+
+    per_cycle = processor.modulus_at([5, 1000], per_cycle=True)
+    cycles = len(processor.cycles)
+    assert list(per_cycle['Цикл']) == [k for k in range(1, cycles + 1) for _ in range(2)]
+    reached = per_cycle[per_cycle['Уровень'] == 5]
+    np.testing.assert_allclose(reached['Отн. деформация, %'], 5, rtol=1e-5)
+    assert per_cycle[per_cycle['Уровень'] == 1000].iloc[:, 2:].isna().all().all()
+
+    stress = processor.modulus_at([0.05], by='stress', per_cycle=True)
+    np.testing.assert_allclose(stress['Удельное давление, МПа'], 0.05, rtol=1e-5)
@@ -0,0 +1,44 @@
+import numpy as np
+from utils.helpers import minmax_indices, visible_slice
+
+
+def test_short_series_are_not_decimated():
+    assert minmax_indices(100, 5000, np.zeros(100)) == slice(None)
+    assert minmax_indices(10_000, 0, np.zeros(10_000)) == slice(None)
+    # Точек меньше, чем нужно на одну корзину
+    assert minmax_indices(4, 2, np.zeros(4), np.zeros(4)) == slice(None)
+
+
+def test_extrema_and_last_point_are_kept():
+    rng = np.random.default_rng(0)
+    x = np.arange(10_007, dtype=float)
+    y = rng.normal(size=x.size)
+    y[1234], y[9876] = 50, -50
+    index = minmax_indices(len(x), 300, x, y)
+
+    assert len(index) <= 300 + 5
+    assert np.all(np.diff(index) > 0)
+    assert index[0] == 0 and index[-1] == len(x) - 1
+    assert {1234, 9876} <= set(index.tolist())
+
+
+def test_single_bucket():
+    y = np.array([3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0, 6.0])
+    index = minmax_indices(len(y), 3, y)
+    np.testing.assert_array_equal(index, [0, 1, 5, 7])
+
+
+def test_visible_slice_ordered():
+    x = np.arange(10, dtype=float)
+    assert visible_slice(x, 3, 5) == slice(2, 7)
+    # Края записи и диапазон целиком вне данных
+    assert visible_slice(x, -5, 1) == slice(0, 3)
+    assert visible_slice(x, 8.5, 20) == slice(8, 10)
+    assert visible_slice(x, 20, 30) == slice(9, 10)
+    assert visible_slice(x, 4.2, 4.8) == slice(4, 6)
+
+
+def test_visible_slice_unordered():
+    x = np.array([0, 2, 4, 6, 4, 2, 0], dtype=float)
+    assert visible_slice(x, 3, 5, ordered=False) == slice(1, 6)
+    assert visible_slice(x, 10, 20, ordered=False) == slice(0, 0)
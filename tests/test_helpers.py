@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+from utils.helpers import find_sustained_crossings, interpolate_at, interpolate_nans, remove_spikes
+
+
+def first_crossing(data, threshold, start, stop, length=5):
+    """Прежний поиск: цикл по точкам, все data[i:i+length] выше порога"""
+    for i in range(start, stop):
+        if np.all(data[i:i + length] > threshold):
+            return i
+    return -1
+
+
+def test_crossings_match_point_loop():
+    rng = np.random.default_rng(0)
+    data = np.cumsum(rng.normal(size=3000))
+    thresholds = [-20, 0, 5, 30, 1000]
+    starts = np.sort(rng.integers(0, 3000, 12))
+    stops = starts + rng.integers(1, 600, 12)
+    result = find_sustained_crossings(data, thresholds, starts=starts, stops=stops)
+    expected = [[first_crossing(data, t, a, b) for a, b in zip(starts, stops)] for t in thresholds]
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_short_excursions_are_ignored():
+    data = np.zeros(30)
+    data[5:9] = 10  # 4 точки - меньше length
+    data[20:25] = 10
+    np.testing.assert_array_equal(find_sustained_crossings(data, [5]), [[20]])
+
+
+def test_window_shortens_at_the_end():
+    data = np.array([0, 0, 0, 9, 9, 9], dtype=float)
+    np.testing.assert_array_equal(find_sustained_crossings(data, [5], starts=[0, 4]), [[3, 4]])
+    np.testing.assert_array_equal(find_sustained_crossings(data, [10]), [[-1]])
+
+
+def first_reach(key, target, values):
+    """Прежний поиск: первая точка, где key не меньше уровня, интерполяция с предыдущей"""
+    for i, k in enumerate(key):
+        if k >= target:
+            if i == 0:
+                return values[0] if k == target else np.nan
+            w = (target - key[i - 1]) / (k - key[i - 1])
+            return values[i - 1] + w * (values[i] - values[i - 1])
+    return np.nan
+
+
+def test_interpolate_at_matches_scan():
+    rng = np.random.default_rng(2)
+    key = np.cumsum(rng.normal(0.1, 1, 500))
+    values = rng.normal(size=500)
+    targets = [-5, key[0], 0.5, 3, 17.25, 40, 1e6]
+    result = interpolate_at(key, targets, {'values': values, 'key': key})
+    expected = [first_reach(key, t, values) for t in targets]
+    np.testing.assert_allclose(result['values'], expected, rtol=1e-12)
+    reached = ~np.isnan(expected)
+    np.testing.assert_allclose(result['key'][reached], np.array(targets)[reached], rtol=1e-12)
+
+
+def test_interpolate_at_empty_key():
+    result = interpolate_at([], [1, 2], {'a': []})
+    assert np.isnan(result['a']).all()
+
+
+def test_clean_data_is_not_copied():
+    data = np.array([1.0, 2.0, 3.0])
+    assert interpolate_nans(data) is data
+
+
+def test_interior_gaps_are_linear():
+    data = np.array([0.0, np.nan, np.nan, 3.0, np.nan, 7.0])
+    np.testing.assert_allclose(interpolate_nans(data), [0, 1, 2, 3, 5, 7])
+    # Исходный массив не меняется без inplace
+    assert np.isnan(data[1])
+
+
+def test_edges_are_extrapolated_from_two_points():
+    data = np.array([np.nan, np.nan, 2.0, 4.0, 5.0, np.nan])
+    np.testing.assert_allclose(interpolate_nans(data), [-2, 0, 2, 4, 5, 6])
+
+
+def test_single_valid_point_fills_everything():
+    np.testing.assert_allclose(interpolate_nans([np.nan, 3.0, np.nan]), [3, 3, 3])
+
+
+def test_all_nan_stays_nan():
+    assert np.isnan(interpolate_nans([np.nan, np.nan])).all()
+
+
+def test_infinities():
+    data = np.array([1.0, np.inf, 3.0, np.nan, 5.0])
+    np.testing.assert_allclose(interpolate_nans(data), [1, 2, 3, 4, 5])
+    kept = interpolate_nans(data, inf='keep')
+    assert np.isinf(kept[1])
+    assert kept[3] == pytest.approx(4.0)
+
+
+def test_inplace():
+    data = np.array([1.0, np.nan, 3.0])
+    assert interpolate_nans(data, inplace=True) is data
+    assert data[1] == 2.0
+
+
+def test_spikes_are_replaced_by_median():
+    t = np.linspace(0, 10, 2000)
+    signal = np.sin(t) + np.random.default_rng(0).normal(0, 0.01, t.size)
+    spiky = signal.copy()
+    spiky[[300, 1200, 1201]] += [5.0, -4.0, -4.0]
+
+    cleaned, count = remove_spikes(spiky)
+    assert count == 3
+    assert np.abs(cleaned - signal).max() < 0.1
+    # Без inplace исходные данные не меняются
+    assert spiky[300] > 4
+
+
+def test_clean_signal_is_untouched():
+    t = np.linspace(0, 10, 2000)
+    # Излом и ступенька квантования - не выбросы
+    signal = np.round(np.abs(t - 5), 2)
+    cleaned, count = remove_spikes(signal)
+    assert count == 0
+    np.testing.assert_array_equal(cleaned, signal)
+
+
+def test_spikes_inplace():
+    data = np.zeros(100)
+    data[50] = 100.0
+    cleaned, count = remove_spikes(data, inplace=True)
+    assert count == 1
+    assert cleaned is data and data[50] == 0.0
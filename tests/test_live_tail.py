@@ -0,0 +1,93 @@
+import os
+import numpy as np
+import pytest
+from models.live_tail import LiveTail, MinMaxDecimator
+from conftest import machine_lines
+
+
+def test_growing_record_keeps_extrema():
+    rng = np.random.default_rng(1)
+    force = np.cumsum(rng.normal(size=200_000))
+    displacement = rng.normal(size=force.size)
+    decimator = MinMaxDecimator(600, series=2)
+
+    length = 0
+    for step in (100, 2_000, 15_000, 60_000, 122_900):
+        length += step
+        index = decimator.update(force[:length], displacement[:length])
+        if isinstance(index, slice):
+            assert length <= 600
+            continue
+        assert len(index) <= 600 + 5
+        assert np.all(np.diff(index) > 0) and index[-1] == length - 1
+        for values in (force[:length], displacement[:length]):
+            assert values[index].max() == values.max()
+            assert values[index].min() == values.min()
+
+
+def test_decimator_restarts_after_rewrite():
+    decimator = MinMaxDecimator(30, series=1)
+    decimator.update(np.arange(1000, dtype=float))
+    values = np.zeros(100)
+    values[42] = 1
+    index = decimator.update(values)
+    assert 42 in index and index[-1] == 99
+
+
+def test_tail_matches_whole_file(tmp_path, record, processor):
+    lines = machine_lines(*record)
+    path = tmp_path / 'live.txt'
+    tail = LiveTail(str(path), 100, 100, 25)
+    # Файл дописывается кусками, последняя строка - не целиком
+    with open(path, 'w') as f:
+        for begin in range(0, len(lines), 337):
+            chunk = ''.join(lines[begin:begin + 337])
+            f.write(chunk[:-3])
+            f.flush()
+            tail.poll()
+            f.write(chunk[-3:])
+            f.flush()
+    tail.poll()
+
+    processor.analyze(str(path), 100, 100, 25)
+    # Запись в процессоре хранится во float32
+    np.testing.assert_allclose(tail.force, processor.forse__, rtol=1e-6, atol=1e-4)
+    np.testing.assert_allclose(tail.time, processor.time, rtol=1e-6, atol=1e-5)
+    np.testing.assert_allclose(tail.strain_percent, processor.strain_percent, rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(tail.stress, processor.stress, rtol=1e-5, atol=1e-6)
+
+
+@pytest.fixture
+def window(tmp_path):
+    pytest.importorskip('PyQt5.QtWidgets')
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    from views.main_window import YoungModulusApp
+    window = YoungModulusApp()
+    yield window
+    window.stop_follow()
+    window.close()
+    app.processEvents()
+
+
+def test_follow_survives_figure_rebuild(window, tmp_path, record):
+    lines = machine_lines(*record)
+    path = tmp_path / 'live.txt'
+    path.write_text(''.join(lines[:1500]))
+    window.file_path = str(path)
+    window.follow_button.setChecked(True)
+    assert len(window.lines['stress'].get_xdata()) > 0
+
+    # Применение настроек пересоздаёт фигуры, слежение должно рисовать в новые линии
+    window.create_figures()
+    stress = window.lines['stress']
+    assert window.live_lines['stress'] is stress
+    assert stress.figure is window.figure1
+    shown = len(stress.get_xdata())
+    assert shown > 0
+
+    with open(path, 'a') as f:
+        f.writelines(lines[1500:])
+    window.update_live()
+    assert len(stress.get_xdata()) > shown
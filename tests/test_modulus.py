@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+from scipy.signal import find_peaks
+from models.modulus import SecantModulusEngine, rolling_slope, savgol_slope
+
+
+def reference_windows(force, displacement, time, area, initial_height):
+    """Модуль по окнам в 2 секунды на втором цикле прежним циклом по окнам"""
+    values = np.column_stack((force, displacement, time))
+    k = np.argmax(force > 0)
+    M = values[k:] - values[k]
+    sr = len(M) / M[-1, 2] if M[-1, 2] != 0 else 10
+    F, S = M[:, 0], M[:, 1]
+
+    peaks, _ = find_peaks(S, height=0.5 * np.max(S))
+    cycle_length = peaks[1] - peaks[0]
+    Start = peaks[1] - cycle_length + 1
+    Finish = peaks[1]
+    F1, S1 = F[Start:Finish + 1], S[Start:Finish + 1]
+
+    w = int(np.ceil(sr * 2))
+    n = len(F1) // w
+    Pr, E1, Eps1 = np.zeros(n), np.zeros(n), np.zeros(n)
+    for i in range(n):
+        idx1 = i * w
+        idx2 = min((i + 1) * w - 1, len(F1) - 1)
+        Pr[i] = (F1[idx1] + F1[idx2]) / 2 / area * 1e-6
+        delta_F = F1[idx2] - F1[idx1]
+        delta_S = S1[idx2] - S1[idx1]
+        if delta_S != 0:
+            E1[i] = (delta_F / area * 1e-6) / (delta_S / initial_height)
+        Eps1[i] = (S1[idx1] + S1[idx2]) / 2 / initial_height
+    Pr = Pr - Pr[0]
+
+    Pr, E1, Eps1 = Pr[3:], E1[3:], Eps1[3:]
+    half = int(len(Pr) / 2)
+    Pr, E1, Eps1 = Pr[half:], E1[half:], Eps1[half:]
+    if Pr.size > 2:
+        Eps1 = Eps1 - Eps1[0]
+        Pr = Pr - np.min(Pr)
+    return E1 * 1_000_000, Eps1 * 100, Pr * 1_000_000
+
+
+@pytest.fixture
+def slow_record():
+    # Гладкая запись (пики перемещения ищутся без prominence), 30 с на цикл - 15 окон по 2 с
+    phase = np.linspace(0, 8 * np.pi, 12000, endpoint=False)
+    displacement = 2 * (1 - np.cos(phase))
+    force = 2000 * displacement + 300 * np.sin(phase) + 100
+    return force, displacement, np.arange(len(force)) * 0.01
+
+
+def test_engine_matches_window_loop(slow_record):
+    expected = reference_windows(*slow_record, 1e4, 25)
+    result = SecantModulusEngine().run(*slow_record, 1e4, 25)
+    assert len(expected[0]) > 3
+    for values, reference in zip(result, expected):
+        np.testing.assert_allclose(values, reference, rtol=1e-12, atol=1e-9)
+
+
+def test_shifted_force_origin(slow_record):
+    force, displacement, time = slow_record
+    expected = SecantModulusEngine().run(force, displacement, time, 1e4, 25)
+    # Каналы записи после обрезки сдвинуты, сдвиг нагрузки передаётся отдельно
+    result = SecantModulusEngine().run(force - force[10], displacement - displacement[10], time - time[10],
+                                       1e4, 25, force_origin=force[10])
+    for values, reference in zip(result, expected):
+        np.testing.assert_allclose(values, reference, rtol=1e-9, atol=1e-6)
+
+
+def test_overlap_doubles_windows(slow_record):
+    plain = SecantModulusEngine().run(*slow_record, 1e4, 25)
+    dense = SecantModulusEngine(overlap=0.5).run(*slow_record, 1e4, 25)
+    assert len(dense[0]) > 1.5 * len(plain[0])
+
+
+def test_too_few_peaks():
+    time = np.arange(1000) * 0.01
+    assert SecantModulusEngine().run(np.ones(1000), np.linspace(0, 1, 1000), time, 1e4, 25) is None
+
+
+def test_rolling_slope_matches_polyfit():
+    rng = np.random.default_rng(0)
+    x = np.cumsum(rng.uniform(0.5, 1.5, 300))
+    y = 3 * x + np.sin(x) + rng.normal(0, 0.1, x.size)
+    window = 21
+    slope = rolling_slope(x, y, window)
+    for i in range(x.size):
+        part = slice(max(i - window // 2, 0), i + (window - 1) // 2 + 1)
+        np.testing.assert_allclose(slope[i], np.polyfit(x[part], y[part], 1)[0], rtol=1e-8)
+
+
+def test_rolling_slope_flat_x_is_nan():
+    x = np.concatenate((np.arange(50.0), np.full(50, 49.0)))
+    slope = rolling_slope(x, 2 * x, 11)
+    np.testing.assert_allclose(slope[:40], 2)
+    assert np.isnan(slope[-20:]).all()
+
+
+def test_savgol_slope_matches_gradient():
+    x = np.linspace(0, 2, 2001)
+    y = np.exp(x)
+    slope = savgol_slope(x, y, 51)
+    # Вдали от краёв - как производная np.gradient по гладкой кривой
+    np.testing.assert_allclose(slope[100:-100], np.gradient(y, x)[100:-100], rtol=1e-4)
+    assert np.isnan(savgol_slope(x[:10], y[:10], 51)).all()
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+from models.streaming import CycleStream
+from conftest import loading_record, machine_lines
+
+
+def compare_with_analyze(processor, path, chunksize):
+    processor.compact_storage = False
+    processor.analyze(path, 100, 100, 25)
+    expected = processor.cycles.to_frame()
+    result = processor.process_stream(path, 100, 100, 25, chunksize=chunksize)
+    assert len(expected) > 1
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, rtol=1e-9)
+
+
+@pytest.mark.parametrize('chunksize', [97, 1000, 200_000])
+def test_stream_matches_analyze(processor, test_file, chunksize):
+    compare_with_analyze(processor, test_file, chunksize)
+
+
+def test_stream_matches_analyze_with_hold(processor, tmp_path):
+    # Выдержка без нагрузки посреди испытания: впадина ждёт подъёма много блоков
+    force, displacement, time = loading_record(cycles=3, seed=2)
+    hold = len(force) - 300
+    rng = np.random.default_rng(3)
+    force = np.concatenate((force[:hold], 100 + rng.normal(0, 0.5, 5000), force[hold:]))
+    displacement = np.concatenate((displacement[:hold], 0.05 + rng.normal(0, 0.002, 5000),
+                                   displacement[hold:]))
+    path = tmp_path / 'hold.txt'
+    path.write_text(''.join(machine_lines(force, displacement, np.arange(len(force)) * 0.01)))
+    compare_with_analyze(processor, str(path), 250)
+
+
+def test_hold_keeps_memory_bounded():
+    stream = CycleStream(0.5, 1.0, 1e-4)
+    phase = np.linspace(0, 4 * np.pi, 400)
+    displacement = np.concatenate((1 - np.cos(phase[:300]), np.full(100_000, 1.0)))
+    # Разгрузка до впадины и долгая выдержка чуть выше неё
+    displacement[300:] += np.abs(np.sin(np.arange(100_000)))
+    displacement = np.concatenate((displacement, 1 - np.cos(phase)))
+    data = np.column_stack((displacement * 1000, displacement, np.arange(len(displacement))))
+    for offset in range(0, len(data), 500):
+        stream.feed(offset, data[offset:offset + 500])
+        assert len(stream.tail) <= 1
+    rows = stream.finish()
+    assert len(rows) >= 2
+    assert rows[0]['Конец'] == rows[1]['Начало']
+
+
+def test_batch_stream_writes_cycle_table(test_file, tmp_path):
+    from models.batch_processor import process_specimen
+    params = {'width': 100, 'length': 100, 'height': 25, 'stream': True}
+    summary = process_specimen(test_file, params, str(tmp_path / 'out'))
+    assert summary['Ошибка'] == ''
+    table = pd.read_excel(tmp_path / 'out' / 'Результаты_specimen' / 'specimen_циклы.xlsx')
+    assert len(table) == summary['Циклов'] == 6
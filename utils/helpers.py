@@ -1,22 +1,157 @@
 import numpy as np
-from scipy.interpolate import interp1d
-
-def interpolate_nans(data):
-    """Интерполяция NaN значений в массиве"""
-    mask = ~np.isnan(data)
-    indices = np.arange(len(data))
-    interp = interp1d(indices[mask], data[mask], kind='linear', fill_value="extrapolate")
-    return interp(indices)
-
-def remove_spikes(data, threshold=0.2):
-    """Удаление выбросов из данных"""
-    temp_data = data.copy()
-    temp_data[np.isinf(temp_data)] = np.nan
-    interpolated = np.copy(temp_data)
-    nans = np.isnan(interpolated)
-
-    interpolated[nans] = np.interp(
-        np.flatnonzero(nans),
-        np.flatnonzero(~nans),
-        interpolated[~nans])
-    return temp_data
\ No newline at end of file
+
+def interpolate_nans(data, inf='nan', inplace=False):
+    """
+    Интерполяция NaN значений в массиве (линейно, за краями - линейная экстраполяция
+    по двум крайним точкам). inf: 'nan' - бесконечности заполняются так же, как NaN,
+    'keep' - остаются как есть. Без пропусков массив возвращается без копирования;
+    inplace=True - заполнение прямо в data.
+    """
+    data = np.asarray(data, dtype=float)
+    bad = ~np.isfinite(data) if inf == 'nan' else np.isnan(data)
+    if not bad.any():
+        return data
+    if not inplace:
+        data = data.copy()
+
+    good = np.flatnonzero(~bad)
+    if good.size == 0:
+        return data
+    missing = np.flatnonzero(bad)
+    values = data[good]
+    data[missing] = np.interp(missing, good, values)
+
+    if good.size > 1:
+        # np.interp за краями держит крайнее значение - продолжаем крайние отрезки
+        head = missing[missing < good[0]]
+        tail = missing[missing > good[-1]]
+        slope = (values[1] - values[0]) / (good[1] - good[0])
+        data[head] = values[0] + slope * (head - good[0])
+        slope = (values[-1] - values[-2]) / (good[-1] - good[-2])
+        data[tail] = values[-1] + slope * (tail - good[-1])
+    return data
+
+def remove_spikes(data, threshold=5.0, window=11, inplace=False):
+    """
+    Удаление выбросов фильтром Хампеля: точка, отклоняющаяся от скользящей медианы
+    окна window больше чем на threshold масштабированных MAD, заменяется медианой.
+    Возвращает (данные, число исправленных точек).
+    """
+    from scipy.ndimage import median_filter
+
+    data = np.asarray(data)
+    median = median_filter(data, size=window, mode='nearest')
+    deviation = np.abs(data - median)
+    # 1.4826 * MAD - оценка СКО для нормального шума
+    scale = 1.4826 * median_filter(deviation, size=window, mode='nearest')
+    # На ровных и гладких участках MAD почти 0: нижняя граница по типичному шуму
+    # записи и 0.1 % размаха сигнала, чтобы изломы и шаг квантования не считались выбросами
+    floor = max(float(np.median(scale)), 1e-3 * float(np.ptp(data)))
+    np.maximum(scale, floor, out=scale)
+    spikes = deviation > threshold * scale
+    count = int(np.count_nonzero(spikes))
+    if count:
+        if not inplace:
+            data = data.copy()
+        data[spikes] = median[spikes]
+    return data, count
+
+def sustained_minimum(data, length=5):
+    """Минимум по окну data[i:i+length] (в конце массива окно укорачивается)"""
+    window_min = np.array(data, dtype=float)
+    for shift in range(1, length):
+        np.minimum(window_min[:-shift], data[shift:], out=window_min[:-shift])
+    return window_min
+
+
+def find_sustained_crossings(data, thresholds, length=5, starts=(0,), stops=None, window_min=None):
+    """
+    Первые индексы i из [start, stop), где все data[i:i+length] больше порога,
+    для каждого порога и каждого отрезка. Минимум по окну считается один раз
+    на весь сигнал, дальше для каждого порога - векторный поиск по всем отрезкам.
+    Возвращает массив (пороги x отрезки), -1 - порог на отрезке не достигнут.
+    """
+    if window_min is None:
+        window_min = sustained_minimum(data, length)
+    starts = np.asarray(starts, dtype=int)
+    stops = np.full(len(starts), len(window_min)) if stops is None else np.asarray(stops, dtype=int)
+
+    result = np.full((len(thresholds), len(starts)), -1, dtype=int)
+    for k, threshold in enumerate(thresholds):
+        above = np.flatnonzero(window_min > threshold)
+        if not len(above):
+            continue
+        j = np.searchsorted(above, starts)
+        idx = above[np.minimum(j, len(above) - 1)]
+        found = (j < len(above)) & (idx < stops)
+        result[k] = np.where(found, idx, -1)
+    return result
+
+
+def interpolate_at(key, targets, columns):
+    """
+    Значения столбцов columns (dict имя -> массив) там, где key впервые достигает
+    каждого уровня из targets, с линейной интерполяцией между соседними отсчётами.
+    Накопленный максимум key упорядочен, поэтому все уровни ищутся одним searchsorted.
+    Возвращает dict имя -> массив по targets (NaN - уровень не достигнут).
+    """
+    key = np.asarray(key, dtype=float)
+    targets = np.atleast_1d(np.asarray(targets, dtype=float))
+    result = {name: np.full(len(targets), np.nan) for name in columns}
+    if not len(key):
+        return result
+
+    running = np.fmax.accumulate(key)
+    i = np.searchsorted(running, targets, side='left')
+    # Уровень ниже первого отсчёта не пересекается снизу
+    found = (i < len(key)) & ((i > 0) | (targets == key[0]))
+    i = i[found]
+    prev = np.maximum(i - 1, 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight = np.where(i > 0, (targets[found] - key[prev]) / (key[i] - key[prev]), 0.0)
+    for name, values in columns.items():
+        values = np.asarray(values, dtype=float)
+        result[name][found] = values[prev] + weight * (values[i] - values[prev])
+    return result
+
+
+def minmax_indices(length, max_points, *series):
+    """
+    Индексы точек для вывода на экран не более ~max_points на линию: отсчёты делятся
+    на корзины, в каждой остаются первая точка и минимум/максимум каждого ряда
+    из series, поэтому пики и экстремумы не теряются. Если прореживать не нужно -
+    slice(None) (представление без копии).
+    """
+    per_bucket = 1 + 2 * len(series)
+    if max_points <= 0 or length <= max(max_points, per_bucket):
+        return slice(None)
+    buckets = max(1, max_points // per_bucket)
+    size = -(-length // buckets)
+    full = length // size
+    starts = np.arange(0, length, size)
+    picks = [starts, [length - 1]]
+    for values in series:
+        values = np.asarray(values)
+        head = values[:full * size].reshape(full, size)
+        picks += [starts[:full] + head.argmin(axis=1), starts[:full] + head.argmax(axis=1)]
+        if full * size < length:
+            tail = values[full * size:]
+            picks.append([full * size + tail.argmin(), full * size + tail.argmax()])
+    return np.unique(np.concatenate(picks))
+
+
+def visible_slice(x, lo, hi, ordered=True):
+    """
+    Срез отсчётов, видимых в диапазоне [lo, hi] по x, с одной точкой запаса с каждой
+    стороны (линия доходит до края графика). Для возрастающего x - searchsorted,
+    иначе (петли циклов) - от первой до последней точки внутри диапазона.
+    """
+    if ordered:
+        start = np.searchsorted(x, lo, side='left')
+        stop = np.searchsorted(x, hi, side='right')
+    else:
+        inside = np.flatnonzero((x >= lo) & (x <= hi))
+        if not inside.size:
+            return slice(0, 0)
+        start, stop = inside[0], inside[-1] + 1
+    return slice(max(int(start) - 1, 0), min(int(stop) + 1, len(x)))
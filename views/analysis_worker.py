@@ -0,0 +1,74 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+from models.data_processor import AnalysisCancelled
+from models.batch_processor import run_batch
+
+
+class AnalysisWorker(QObject):
+    """
+    DataProcessor.analyze в отдельном потоке (объект переносится в QThread).
+    Графики строятся в GUI-потоке по сигналу finished: matplotlib и виджеты Qt
+    из других потоков трогать нельзя. Прерывание - между этапами расчёта.
+    """
+    progress = pyqtSignal(str, int, int)  # этап, выполнено этапов, всего
+    finished = pyqtSignal(object)  # множество пересчитанных этапов
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, processor, file_path, width, length, initial_height):
+        super().__init__()
+        self.processor = processor
+        self.args = (file_path, width, length, initial_height)
+        self.abort = False
+
+    def cancel(self):
+        """Просьба прервать расчёт (вызывается из GUI-потока)"""
+        self.abort = True
+
+    def is_cancelled(self):
+        return self.abort
+
+    def run(self):
+        try:
+            recomputed = self.processor.analyze(*self.args, on_stage=self.progress.emit,
+                                                should_cancel=self.is_cancelled)
+        except AnalysisCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.finished.emit(recomputed)
+
+
+class BatchWorker(QObject):
+    """
+    Пакетная обработка папки (run_batch) в отдельном потоке: окно не зависает,
+    пока пул процессов обрабатывает образцы. Прерывание снимает ещё не начатые образцы.
+    """
+    progress = pyqtSignal(int, int, str)  # готово, всего, образец
+    finished = pyqtSignal(object)  # сводная таблица
+    failed = pyqtSignal(str)
+
+    def __init__(self, folder, params):
+        super().__init__()
+        self.folder = folder
+        self.params = params
+        self.abort = False
+
+    def cancel(self):
+        """Просьба прервать обработку (вызывается из GUI-потока)"""
+        self.abort = True
+
+    def is_cancelled(self):
+        return self.abort
+
+    def report(self, done, total, summary):
+        self.progress.emit(done, total, summary['Образец'])
+
+    def run(self):
+        try:
+            summary = run_batch(self.folder, self.params, progress=self.report,
+                                should_cancel=self.is_cancelled)
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.finished.emit(summary)
@@ -6,39 +6,88 @@ class CustomNavigationToolbar(NavigationToolbar):
         super().__init__(canvas, parent, coordinates)
         self.coordinates_label = QLabel("")
         self.addWidget(self.coordinates_label)
-        
+
     def mouse_move(self, event):
         if event.inaxes:
             x, y = event.xdata, event.ydata
         super().mouse_move(event)
 
+    def view_changed(self):
+        handler = getattr(self.canvas, 'zoom_handler', None)
+        if handler is not None:
+            handler.notify()
+
+    # Кнопки "Домой"/"Назад"/"Вперёд" меняют пределы без событий мыши
+    def home(self, *args):
+        super().home(*args)
+        # Слежение за файлом снова подстраивает пределы под растущую запись
+        for ax in self.canvas.figure.axes:
+            ax.set_autoscale_on(True)
+        self.view_changed()
+
+    def back(self, *args):
+        super().back(*args)
+        self.view_changed()
+
+    def forward(self, *args):
+        super().forward(*args)
+        self.view_changed()
+
 class ZoomPanHandler:
-    def __init__(self, canvas):
+    """
+    Масштаб колесом мыши и сдвиг левой кнопкой на всех осях холста (вместе с twinx).
+    on_view_changed(figure) вызывается после масштабирования, по окончании сдвига
+    и после зума/сдвига кнопками тулбара - чтобы заново проредить видимый участок.
+    Обработчик хранится в canvas.zoom_handler: matplotlib держит на него только слабые ссылки.
+    """
+    def __init__(self, canvas, on_view_changed=None):
         self.canvas = canvas
+        self.on_view_changed = on_view_changed
         self.ax = None
         self.press = None
         self.cur_xlim = None
         self.cur_ylim = None
         self.xpress = None
         self.ypress = None
-        self._id_drag = None
-        self._id_scroll = None
+        self._ids = []
+        canvas.zoom_handler = self
         self.connect()
 
     def connect(self):
-        self._id_drag = self.canvas.mpl_connect('button_press_event', self.on_press)
-        self._id_scroll = self.canvas.mpl_connect('scroll_event', self.on_scroll)
-        self.canvas.mpl_connect('button_release_event', self.on_release)
-        self.canvas.mpl_connect('motion_notify_event', self.on_motion)
+        self._ids = [
+            self.canvas.mpl_connect('button_press_event', self.on_press),
+            self.canvas.mpl_connect('scroll_event', self.on_scroll),
+            self.canvas.mpl_connect('button_release_event', self.on_release),
+            self.canvas.mpl_connect('motion_notify_event', self.on_motion),
+        ]
+
+    def axes_at(self, event):
+        """Все оси под курсором (у twinx-графика их две с общей осью X)"""
+        return [ax for ax in self.canvas.figure.axes if ax.get_visible() and ax.in_axes(event)]
+
+    def toolbar_busy(self):
+        """Включён режим зума/сдвига тулбара - события мыши обрабатывает он"""
+        toolbar = getattr(self.canvas, 'toolbar', None)
+        return toolbar is not None and bool(toolbar.mode)
+
+    def save_view(self):
+        """Исходные пределы - в историю тулбара, чтобы работали кнопки Домой и Назад"""
+        toolbar = getattr(self.canvas, 'toolbar', None)
+        if toolbar is not None:
+            if toolbar._nav_stack() is None:
+                toolbar.push_current()
+            return toolbar
+
+    def notify(self):
+        if self.on_view_changed is not None:
+            self.on_view_changed(self.canvas.figure)
+        self.canvas.draw_idle()
 
     def on_scroll(self, event):
-        if not event.inaxes or self.ax != event.inaxes:
+        if not event.inaxes or self.toolbar_busy():
             return
 
         base_scale = 1.1
-        xdata = event.xdata
-        ydata = event.ydata
-
         if event.button == 'up':
             scale_factor = 1 / base_scale
         elif event.button == 'down':
@@ -46,54 +95,100 @@ class ZoomPanHandler:
         else:
             return
 
-        xlim = self.ax.get_xlim()
-        ylim = self.ax.get_ylim()
-
-        new_xlim = [
-            xdata - (xdata - xlim[0]) * scale_factor,
-            xdata + (xlim[1] - xdata) * scale_factor
-        ]
-        new_ylim = [
-            ydata - (ydata - ylim[0]) * scale_factor,
-            ydata + (ylim[1] - ydata) * scale_factor
-        ]
-
-        self.ax.set_xlim(new_xlim)
-        self.ax.set_ylim(new_ylim)
-        self.canvas.draw_idle()
+        toolbar = self.save_view()
+        for ax in self.axes_at(event):
+            # Координаты курсора в данных именно этой оси
+            xdata, ydata = ax.transData.inverted().transform((event.x, event.y))
+            xlim = ax.get_xlim()
+            ylim = ax.get_ylim()
+            ax.set_xlim([
+                xdata - (xdata - xlim[0]) * scale_factor,
+                xdata + (xlim[1] - xdata) * scale_factor
+            ])
+            ax.set_ylim([
+                ydata - (ydata - ylim[0]) * scale_factor,
+                ydata + (ylim[1] - ydata) * scale_factor
+            ])
+        if toolbar is not None:
+            toolbar.push_current()
+        self.notify()
 
     def on_press(self, event):
-        if event.inaxes != self.ax or event.button != 1:
+        if not event.inaxes or event.button != 1 or self.toolbar_busy():
             return
-            
+
+        self.save_view()
+        self.ax = self.axes_at(event)
         self.press = event.xdata, event.ydata
         self.xpress, self.ypress = event.x, event.y
-        self.cur_xlim = self.ax.get_xlim()
-        self.cur_ylim = self.ax.get_ylim()
+        self.cur_xlim = [ax.get_xlim() for ax in self.ax]
+        self.cur_ylim = [ax.get_ylim() for ax in self.ax]
 
     def on_motion(self, event):
-        if self.press is None or event.inaxes != self.ax:
+        if self.press is None:
             return
-            
-        dx = event.x - self.xpress
-        dy = event.y - self.ypress
-        
-        dx = dx / self.canvas.width() * (self.cur_xlim[1] - self.cur_xlim[0])
-        dy = dy / self.canvas.height() * (self.cur_ylim[1] - self.cur_ylim[0])
-        
-        new_xlim = self.cur_xlim[0] - dx, self.cur_xlim[1] - dx
-        new_ylim = self.cur_ylim[0] + dy, self.cur_ylim[1] + dy
-        
-        self.ax.set_xlim(new_xlim)
-        self.ax.set_ylim(new_ylim)
+
+        for ax, xlim, ylim in zip(self.ax, self.cur_xlim, self.cur_ylim):
+            # Сдвиг в пикселях переводится в доли размера области осей
+            dx = (event.x - self.xpress) / ax.bbox.width * (xlim[1] - xlim[0])
+            dy = (event.y - self.ypress) / ax.bbox.height * (ylim[1] - ylim[0])
+            ax.set_xlim(xlim[0] - dx, xlim[1] - dx)
+            ax.set_ylim(ylim[0] - dy, ylim[1] - dy)
         self.canvas.draw_idle()
 
     def on_release(self, event):
+        if self.press is None and not self.toolbar_busy():
+            return
+        # Прореживание обновляется один раз в конце сдвига, а не на каждом движении
+        toolbar = getattr(self.canvas, 'toolbar', None)
+        if self.press is not None and toolbar is not None:
+            toolbar.push_current()
         self.press = None
-        self.canvas.draw_idle()
+        self.ax = None
+        self.notify()
 
     def disconnect(self):
-        if self._id_drag:
-            self.canvas.mpl_disconnect(self._id_drag)
-        if self._id_scroll:
-            self.canvas.mpl_disconnect(self._id_scroll)
\ No newline at end of file
+        for cid in self._ids:
+            self.canvas.mpl_disconnect(cid)
+        self._ids = []
+
+
+class BlitManager:
+    """
+    Накладываемые элементы (маркеры пиков, их легенда) рисуются поверх сохранённого
+    фона холста без перерисовки осей и линий. Элементы помечаются animated=True:
+    при обычной отрисовке matplotlib их пропускает, после неё фон запоминается и они
+    дорисовываются здесь. При сохранении в файл animated-элементы рисуются как обычные.
+    """
+    def __init__(self, canvas, artists=()):
+        self.canvas = canvas
+        self.background = None
+        self.artists = []
+        for artist in artists:
+            self.add_artist(artist)
+        self._id_draw = canvas.mpl_connect('draw_event', self.on_draw)
+
+    def add_artist(self, artist):
+        artist.set_animated(True)
+        self.artists.append(artist)
+
+    def on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self.draw_artists()
+
+    def draw_artists(self):
+        figure = self.canvas.figure
+        for artist in self.artists:
+            if artist.get_visible() and artist.axes.get_visible():
+                figure.draw_artist(artist)
+
+    def update(self):
+        """Перерисовывает только накладываемые элементы"""
+        if self.background is None:
+            # Холст ещё не отрисовывался (вкладка не открывалась) - фона нет
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        self.draw_artists()
+        self.canvas.blit(self.canvas.figure.bbox)
+        self.canvas.flush_events()
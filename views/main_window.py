@@ -1,28 +1,27 @@
 import os
+import weakref
+from collections import OrderedDict
 import numpy as np
-import pandas as pd
 from PyQt5.QtWidgets import QAction 
-import math
-from docxtpl import DocxTemplate, InlineImage
-from docx.shared import Cm
-import datetime
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QLabel, QLineEdit, QPushButton, QFileDialog, QTabWidget,
                              QGroupBox, QMessageBox, QCheckBox, QComboBox, QSpinBox, QDoubleSpinBox,
-                             QGridLayout, QDialog, QRadioButton,QButtonGroup)
+                             QGridLayout, QDialog, QRadioButton,QButtonGroup, QProgressBar,
+                             QProgressDialog)
 from PyQt5.QtGui import QIcon, QPalette, QColor
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer, QThread
 from PyQt5.QtWidgets import QShortcut
 from PyQt5.QtGui import QKeySequence
-from models.data_processor import DataProcessor
-from models.report_generator import VibraTableReportGenerator
-from views.custom_widgets import CustomNavigationToolbar
-from scipy.ndimage import median_filter, gaussian_filter1d
-from scipy.signal import find_peaks
-from pathlib import Path
-from utils.helpers import interpolate_nans
+from models.data_processor import DataProcessor, STAGE_TITLES
+from models.live_tail import LiveTail, MinMaxDecimator
+from models.batch_processor import SUMMARY_FILE
+from models.report_generator import VibraTableReportGenerator, save_results
+from models.figures import ResultFigures
+from views.custom_widgets import CustomNavigationToolbar, ZoomPanHandler, BlitManager
+from views.analysis_worker import AnalysisWorker, BatchWorker
+from utils.helpers import minmax_indices, visible_slice
 from views.settings_window import SettingsDialog
 
 
@@ -52,27 +51,43 @@ class YoungModulusApp(QMainWindow):
         self.file_path = ""
         self.selected_template = "ДС"
         self.save_C_stat = False
-        self.df = None
-        self.young_modulus_final = None
-        self.stress = None
-        self.strain = None
-        self.time = None
-        self.time_ = None
-        self.strain_ = None
-        self.pic_data = self.strain_
-        self.form_factor = None
-        self.locs = []
         self.fontsize = 10
         self.linewidth = 2
         self.fontweight = 'bold'
         self.show_peaks = False
-        self.median_filter_size = 50
-        self.gaussian_sigma = 2
-        self.median_filter_size_dist = 1
-        self.gaussian_sigma_dist_value = 0.1
         self.figure_width = 16
         self.figure_height = 11
-        self.cycle_figures = []
+        self.cache_size_mb = self.processor.loader.cache.max_size_mb
+        # Фигуры вкладок циклов: индекс цикла -> (вкладка, тулбар, холст), не больше cycle_cache_size
+        self.cycle_cache = OrderedDict()
+        self.cycle_cache_size = 8
+        # Прореживание линий на экране (точек на линию, 0 - все точки)
+        self.display_points = 5000
+        self.export_full_resolution = True  # сохранять графики по всем точкам
+        self.full_data = weakref.WeakKeyDictionary()  # линия -> полные ряды
+        # Постоянные оси и линии графиков (создаются в create_figures, дальше set_data)
+        self.axes = {}
+        self.lines = {}
+
+        # Слежение за дописываемым файлом
+        self.live_tail = None
+        self.live_lines = {}
+        self.live_decimator = None
+        self.live_fps = 5
+        self.live_timer = QTimer(self)
+        self.live_timer.timeout.connect(self.update_live)
+
+        # Фоновый расчёт (AnalysisWorker в QThread)
+        self.analysis_thread = None
+        self.analysis_worker = None
+        self.pending_analysis = False  # перезапустить расчёт после прерывания текущего
+        self.results_ready = False  # графики построены по полному расчёту, данные процессора согласованы
+
+        # Пакетная обработка папки (BatchWorker в QThread)
+        self.batch_thread = None
+        self.batch_worker = None
+        self.batch_folder = ""
+        self.batch_progress = None
         
         self.initUI()
         self.apply_styles()
@@ -115,10 +130,16 @@ class YoungModulusApp(QMainWindow):
         file_menu.addAction(open_action)
 
         # Действие "Сохранить"
-        save_action = QAction(QIcon('save.png'), 'Сохранить', self)
-        save_action.setShortcut('Ctrl+S')
-        save_action.triggered.connect(self.save_plots)
-        file_menu.addAction(save_action)
+        self.save_action = QAction(QIcon('save.png'), 'Сохранить', self)
+        self.save_action.setShortcut('Ctrl+S')
+        self.save_action.triggered.connect(self.save_plots)
+        self.save_action.setEnabled(False)
+        file_menu.addAction(self.save_action)
+
+        # Действие "Пакетная обработка"
+        self.batch_action = QAction('Пакетная обработка...', self)
+        self.batch_action.triggered.connect(self.run_batch_dialog)
+        file_menu.addAction(self.batch_action)
 
         # Разделитель
         file_menu.addSeparator()
@@ -262,9 +283,25 @@ class YoungModulusApp(QMainWindow):
         self.save_button.setIcon(QIcon('save.png'))
         self.save_button.clicked.connect(self.save_plots)
         self.save_button.setEnabled(False)
+
+        self.follow_button = QPushButton("Следить за файлом")
+        self.follow_button.setCheckable(True)
+        self.follow_button.toggled.connect(self.toggle_follow)
+        
+        self.cancel_button = QPushButton("Прервать расчёт")
+        self.cancel_button.clicked.connect(self.cancel_analysis)
+        self.cancel_button.setEnabled(False)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, len(STAGE_TITLES))
+        self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("")
         
         button_layout.addWidget(self.plot_button)
         button_layout.addWidget(self.save_button)
+        button_layout.addWidget(self.follow_button)
+        button_layout.addWidget(self.cancel_button)
+        button_layout.addWidget(self.progress_bar)
 
 
         # Добавление элементов на панель управления
@@ -278,6 +315,7 @@ class YoungModulusApp(QMainWindow):
         
         # Создание вкладок
         self.tabs = QTabWidget()
+        self.tabs.currentChanged.connect(self.on_tab_changed)
         self.settings_tab = QWidget()
  
         # Создаем фигуры и холсты
@@ -323,6 +361,7 @@ class YoungModulusApp(QMainWindow):
     def create_figures(self):
         """Создает фигуры с текущими размерами и добавляет тулбары"""
         # Удаляем старые вкладки (кроме настроек)
+        self.cycle_cache.clear()
         for i in range(self.tabs.count()-1, -1, -1):
             if self.tabs.widget(i) != self.settings_tab:
                 self.tabs.removeTab(i)
@@ -331,27 +370,98 @@ class YoungModulusApp(QMainWindow):
         self.figure1 = Figure(figsize=(self.figure_width, self.figure_height))
         self.canvas1 = FigureCanvas(self.figure1)
         self.toolbar1 = CustomNavigationToolbar(self.canvas1, self)
+        ZoomPanHandler(self.canvas1, self.redisplay_figure)
 
         self.figure3 = Figure(figsize=(self.figure_width, self.figure_height))
         self.canvas3 = FigureCanvas(self.figure3)
         self.toolbar3 = CustomNavigationToolbar(self.canvas3, self)
+        ZoomPanHandler(self.canvas3, self.redisplay_figure)
 
         self.figure4 = Figure(figsize=(self.figure_width, self.figure_height))
         self.canvas4 = FigureCanvas(self.figure4)
         self.toolbar4 = CustomNavigationToolbar(self.canvas4, self)
+        ZoomPanHandler(self.canvas4, self.redisplay_figure)
 
         self.figure6 = Figure(figsize=(self.figure_width, self.figure_height))
         self.canvas6 = FigureCanvas(self.figure6)
         self.toolbar6 = CustomNavigationToolbar(self.canvas6, self)
+        ZoomPanHandler(self.canvas6, self.redisplay_figure)
 
         # Создаем контейнеры для вкладок
         self.tabs.addTab(self.create_tab_container(self.canvas1, self.toolbar1), "Основные графики")
         self.tabs.addTab(self.create_tab_container(self.canvas6, self.toolbar6), "Нагрузочные циклы")
         self.tabs.addTab(self.create_tab_container(self.canvas3, self.toolbar3), "Модуль упругости")
         self.tabs.addTab(self.create_tab_container(self.canvas4, self.toolbar4), "Полные")
+        self.setup_axes()
+        if self.live_tail is not None:
+            # Слежение продолжается в новых фигурах
+            self.bind_live_lines()
+            self.update_live(redraw=True)
 
-        if self.df is not None:
-            self.plot_data()    
+    def setup_axes(self):
+        """
+        Оси и линии графиков (ResultFigures) создаются один раз на фигуру, при новом
+        расчёте линиям только подставляются данные (с прореживанием для экрана).
+        Маркеры пиков и их легенды рисуются поверх фона (blit), поэтому переключение
+        пиков не перерисовывает графики.
+        """
+        self.full_data.clear()
+        self.figures = ResultFigures(self.figure1, self.figure3, self.figure4, self.figure6,
+                                     self.plot_style(), self.bind_data)
+        self.axes = self.figures.axes
+        self.lines = self.figures.lines
+        self.overlays = BlitManager(self.canvas1, self.figures.overlays)
+
+    def plot_style(self):
+        """Оформление графиков из настроек окна (общее с пакетной обработкой)"""
+        return {
+            'fontsize': self.fontsize,
+            'linewidth': self.linewidth,
+            'fontweight': self.fontweight,
+            'is_title': self.is_title,
+            'is_filling': self.is_filling,
+            'line_modul_y': self.radio_button_line_modul_y,
+        }
+
+    def set_line(self, name, x, y):
+        """Новые данные постоянной линии (с прореживанием для экрана)"""
+        self.bind_data(self.lines[name], x, y)
+
+    def display(self, *series):
+        """
+        Ряды одной линии, прореженные для экрана (min-max по корзинам, пики сохраняются).
+        При display_points = 0 - без изменений.
+        """
+        index = minmax_indices(len(series[0]), self.display_points, *series)
+        return tuple(values[index] for values in series)
+
+    def bind_data(self, line, x, y):
+        """Подставляет в линию прореженные ряды; полные запоминаются, если точек стало меньше"""
+        self.full_data.pop(line, None)
+        line.set_data(*self.display(x, y))
+        if len(line.get_xdata()) < len(x):
+            self.full_data[line] = (x, y, bool(np.all(np.diff(x) >= 0)))
+
+    def redisplay(self, line):
+        """Прореживает заново только видимый по X участок полных рядов линии"""
+        x, y, ordered = self.full_data[line]
+        lo, hi = sorted(line.axes.get_xlim())
+        visible = visible_slice(x, lo, hi, ordered)
+        line.set_data(*self.display(x[visible], y[visible]))
+
+    def redisplay_figure(self, figure):
+        """После зума или сдвига: в увеличенном участке видны все реальные отсчёты"""
+        for line in list(self.full_data.keys()):
+            if line.figure is figure:
+                self.redisplay(line)
+
+    def set_full_resolution(self, enabled):
+        """Подставляет в прореженные линии все точки (перед сохранением) или возвращает прореживание"""
+        for line, (x, y, ordered) in list(self.full_data.items()):
+            if enabled:
+                line.set_data(x, y)
+            else:
+                self.redisplay(line)
 
     def create_tab_container(self, canvas, toolbar):
         """Создает контейнер для вкладки с графиком"""
@@ -374,165 +484,281 @@ class YoungModulusApp(QMainWindow):
             "Текстовые файлы (*.txt);;Все файлы (*)"
         )
         if file_name:
+            # Расчёт по прежнему файлу больше не нужен
+            self.pending_analysis = False
+            self.cancel_analysis()
+            if self.follow_button.isChecked():
+                self.follow_button.blockSignals(True)
+                self.follow_button.setChecked(False)
+                self.follow_button.blockSignals(False)
+                self.stop_follow()
             self.file_path = file_name
             self.file_path_edit.setText(file_name)
-            
-    def load_data(self):
+
+    def sample_geometry(self):
+        """Ширина, длина и высота образца (мм) из полей ввода"""
+        width = float(self.width_edit.text().replace(',', '.'))
+        length = float(self.length_edit.text().replace(',', '.'))
+        initial_height = float(self.height_edit.text().replace(',', '.'))
+        return width, length, initial_height
+
+    def run_batch_dialog(self):
+        """
+        Обрабатывает все .txt файлы выбранной папки с текущей геометрией образца и настройками.
+        Обработка идёт в фоновом потоке, ход - в окне прогресса, итог - в on_batch_finished.
+        """
+        if self.batch_thread is not None:
+            return
+        folder = QFileDialog.getExistingDirectory(self, "Выберите папку с файлами испытаний", "")
+        if not folder:
+            return
         try:
-            self.df = pd.read_csv(self.file_path, sep="\t", header=None)
-            self.df.replace(",", ".", regex=True, inplace=True)
-            self.df = self.df.astype(float)
-            return True
+            width, length, initial_height = self.sample_geometry()
+            mass = float(self.mass_sample.text().replace(',', '.'))
         except Exception as e:
-            QMessageBox.critical(
-                self, 
-                "Ошибка", 
-                f"Не удалось загрузить файл:\n{str(e)}"
-            )
-            return False
-            
-    def save_exel(self, E1, Eps1, Pr, file_name):
+            QMessageBox.critical(self, "Ошибка", str(e))
+            return
+        # Образцы обрабатываются с текущими настройками расчёта и оформления
+        params = {
+            'width': width,
+            'length': length,
+            'height': initial_height,
+            'mass': mass,
+            'template': self.selected_template,
+            'settings': self.processor.settings(),
+            'style': self.plot_style(),
+            'save_C_stat': self.save_C_stat,
+        }
+
+        self.batch_folder = folder
+        self.batch_progress = QProgressDialog("Пакетная обработка...", "Прервать", 0, 0, self)
+        self.batch_progress.setWindowTitle("Пакетная обработка")
+        self.batch_progress.setMinimumDuration(0)
+        self.batch_progress.setAutoClose(False)
+        self.batch_progress.setAutoReset(False)
+
+        self.batch_thread = QThread(self)
+        self.batch_worker = BatchWorker(folder, params)
+        self.batch_worker.moveToThread(self.batch_thread)
+        self.batch_thread.started.connect(self.batch_worker.run)
+        self.batch_worker.progress.connect(self.on_batch_progress)
+        self.batch_worker.finished.connect(self.on_batch_finished)
+        self.batch_worker.failed.connect(self.on_batch_failed)
+        for signal in (self.batch_worker.finished, self.batch_worker.failed):
+            signal.connect(self.batch_thread.quit)
+        self.batch_thread.finished.connect(self.on_batch_thread_done)
+        self.batch_progress.canceled.connect(self.cancel_batch)
+        self.batch_action.setEnabled(False)
+        self.batch_thread.start()
+        self.batch_progress.show()
+
+    def cancel_batch(self):
+        """Просит пакетную обработку не начинать оставшиеся образцы"""
+        if self.batch_worker is not None:
+            self.batch_worker.cancel()
+            self.batch_progress.setLabelText("Прерывание: дожидаемся начатых образцов...")
+
+    def on_batch_progress(self, done, total, name):
+        self.batch_progress.setMaximum(total)
+        self.batch_progress.setValue(done)
+        self.batch_progress.setLabelText(f"{name} ({done}/{total})")
+
+    def on_batch_finished(self, summary):
+        self.batch_progress.hide()
+        failed = int((summary['Ошибка'] != '').sum()) if len(summary) else 0
+        title = "Пакетная обработка прервана" if self.batch_worker.abort else "Пакетная обработка завершена"
+        QMessageBox.information(
+            self,
+            title,
+            f"Обработано образцов: {len(summary)} (с ошибками: {failed})\n"
+            f"Сводная таблица: {os.path.join(self.batch_folder, SUMMARY_FILE)}"
+        )
+
+    def on_batch_failed(self, message):
+        self.batch_progress.hide()
+        QMessageBox.critical(self, "Ошибка", f"Пакетная обработка не выполнена:\n{message}")
+
+    def on_batch_thread_done(self):
+        """Поток пакетной обработки остановлен: освобождаем его"""
+        self.batch_progress.deleteLater()
+        self.batch_worker.deleteLater()
+        self.batch_thread.deleteLater()
+        self.batch_progress = None
+        self.batch_worker = None
+        self.batch_thread = None
+        self.batch_action.setEnabled(True)
+
+    def toggle_follow(self, checked):
+        """Включает/выключает слежение за файлом, который ещё записывается"""
+        if not checked:
+            self.stop_follow()
+            # После остановки строим полный анализ по всей записи
+            if self.file_path:
+                self.plot_data()
+            return
+
+        if not self.file_path:
+            QMessageBox.warning(self, "Внимание", "Сначала выберите файл данных")
+            self.follow_button.setChecked(False)
+            return
+
+        width, length, initial_height = self.sample_geometry()
+        self.pending_analysis = False
+        self.cancel_analysis()
+        self.live_tail = LiveTail(self.file_path, width, length, initial_height)
+        self.bind_live_lines()
+
+        self.tabs.setCurrentIndex(0)
+        self.live_timer.start(int(1000 / self.live_fps))
+        self.update_live()
+
+    def bind_live_lines(self):
+        """
+        Слежение рисует в постоянные линии основных графиков. Вызывается при включении
+        слежения и после пересоздания фигур (create_figures), чтобы кадры не уходили
+        в линии удалённых фигур.
+        """
+        # Давление пропорционально нагрузке, деформация - перемещению: min-max по двум
+        # исходным рядам сохраняет экстремумы всех четырёх линий
+        self.live_decimator = MinMaxDecimator(self.display_points, series=2)
+        self.figures.show_view('main')
+        self.live_lines = {
+            'stress': self.lines['stress'],
+            'strain': self.lines['strain'],
+            'peaks_upper': self.lines['strain_upper'],
+            'peaks_lower': self.lines['strain_lower'],
+            'displacement': self.lines['displacement'],
+            'force': self.lines['force'],
+        }
+        for name in ('stress', 'strain', 'stress_upper', 'stress_lower', 'strain_upper', 'strain_lower',
+                     'displacement', 'force'):
+            self.full_data.pop(self.lines[name], None)
+            self.lines[name].set_data([], [])
+        for name in ('stress', 'strain', 'displacement', 'force'):
+            # Пределы снова следуют за растущей записью (прежний зум и ylim обзора сбрасываются)
+            self.axes[name].set_autoscale_on(True)
+        self.axes['stress'].set_title(
+            f'{self.name_sample.text()} Коэффициент формы q = {self.live_tail.form_factor:.2f}' if self.is_title else '',
+            fontsize=self.fontsize, fontweight=self.fontweight)
+
+    def stop_follow(self):
+        self.live_timer.stop()
+        self.live_tail = None
+        self.live_lines = {}
+        self.live_decimator = None
+
+    def update_live(self, redraw=False):
         """
-        Сохраняет данные в Excel файл
-        :param E1: Удельная нагрузка (МПа)
-        :param Eps1: Относительная деформация (%)
-        :param Pr: Модуль упругости (Estat, МПа)
+        Кадр слежения: дочитывает хвост файла и обновляет линии без полного перестроения.
+        redraw=True - перерисовать уже прочитанную запись, даже если новых точек нет.
         """
+        if self.live_tail is None:
+            return
         try:
-            # Создаем DataFrame с данными
-            data = {
-                'Удельная нагрузка, МПа': E1,
-                'Отн. деф-я, %': Eps1,
-                'Estat, МПа': Pr
-            }
-            df = pd.DataFrame(data)
-            
-            # Задаем формат чисел (2 знака после запятой)
-            df = df
-            
-            if file_name:
-                # Добавляем расширение, если его нет
-                if not file_name.endswith('.xlsx'):
-                    file_name += '.xlsx'
-                
-                # Сохраняем в Excel
-                df.to_excel(file_name, index=False)
-                if self.auto_open_file:
-                    # Открываем файл после сохранения
-                    if os.path.exists(file_name):
-                        os.startfile(file_name)
-                        return True
-            return False
-            
+            new_points = self.live_tail.poll()
         except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить файл:\n{str(e)}")
-            return False
+            self.follow_button.setChecked(False)
+            QMessageBox.critical(self, "Ошибка", f"Не удалось прочитать файл:\n{str(e)}")
+            return
+        if not new_points and not (redraw and self.live_tail.samples.size):
+            return
+
+        tail = self.live_tail
+        time = tail.time
+        strain = tail.strain_percent
+        # Прореживание дополняется только новыми точками, полные ряды - для зума
+        index = self.live_decimator.update(tail.force, tail.displacement)
+        for name, values in (('stress', tail.stress), ('strain', strain),
+                             ('displacement', tail.displacement), ('force', tail.force)):
+            self.bind_live(self.live_lines[name], time, values, index)
+        self.figures.set_peaks_visible(self.show_peaks)
+        # При слежении пики отмечаются только на деформации
+        for artist in (self.lines['stress_upper'], self.lines['stress_lower'], self.axes['stress'].get_legend()):
+            artist.set_visible(False)
+        if self.show_peaks:
+            upper = np.asarray(tail.peaks_upper, dtype=int)
+            lower = np.asarray(tail.peaks_lower, dtype=int)
+            self.live_lines['peaks_upper'].set_data(time[upper], strain[upper])
+            self.live_lines['peaks_lower'].set_data(time[lower], strain[lower])
+
+        # Увеличенные пользователем оси не сбрасываются, в них прореживается видимый участок
+        for name in ('stress', 'strain', 'displacement', 'force'):
+            if self.axes[name].get_autoscale_on():
+                self.figures.rescale(name)
+            elif self.live_lines[name] in self.full_data:
+                self.redisplay(self.live_lines[name])
+        self.canvas1.draw_idle()
+        self.canvas4.draw_idle()
+
+    def bind_live(self, line, x, y, index):
+        """Кадр слежения: прореженные точки по готовым индексам, полные ряды - для зума"""
+        line.set_data(x[index], y[index])
+        if isinstance(index, slice):
+            self.full_data.pop(line, None)
+        else:
+            # Время растёт монотонно - видимый участок ищется через searchsorted
+            self.full_data[line] = (x, y, True)
             
-        
     def toggle_peaks(self, state):
-        """Переключает отображение пиков на графиках"""
+        """Переключает отображение пиков на графиках (только накладываемые маркеры)"""
         self.show_peaks = state == Qt.Checked
-        if self.df is not None:  # Если данные уже загружены, перерисовываем графики
-            self.plot_data()
+        if self.processor.stress is not None and not self.live_timer.isActive():
+            self.figures.set_peaks_visible(self.show_peaks)
+            self.overlays.update()
         
     def plot_selected_peak(self):
         """Отрисовывает график с выбранным пиком"""
+        p = self.processor
         self.tabs.setCurrentIndex(0)
-        if not hasattr(self, 'stress') or not hasattr(self, 'strain'):
+        if not self.results_ready or p.stress is None or p.strain is None:
             return
             
         # Получаем выбранные пики
         upper_idx = self.peak_combo_upper.currentIndex()
         lower_idx = self.peak_combo_lower.currentIndex()
 
-        # Очищаем предыдущие графики
-        self.figure1.clear()
-        ax1 = self.figure1.add_subplot(211)
-        ax3 = self.figure1.add_subplot(212)
-        
-        l =  self.peaks_lower
-        u =  self.peaks_upper
+        l =  p.peaks_lower
+        u =  p.peaks_upper
 
         uu = u[upper_idx]
         ll = l[lower_idx]
 
         if lower_idx == -1:
             ll = None
-        
-        if self.form_factor is not None:
-            q_str = f"{self.form_factor:.2f}"
-        else:
-            q_str = "—"
-        # Отрисовываем основной график
-        if self.is_title:
-            ax1.set_title(f'{self.name_sample.text()} Коэффициент формы q = {self.form_factor:.2f}', fontsize=self.fontsize, fontweight=self.fontweight)
-        ax1.plot(self.stress[ll:uu], self.strain_pocent[ll:uu], 'k-', linewidth=self.linewidth, label="Данные")
-        
-        # Отрисовываем выбранные пики
-        if self.show_peaks:
-            ax1.legend()
-            if upper_idx >= 0 and upper_idx < len(self.peaks_upper):
-                peak = self.peaks_upper[upper_idx]
-                ax1.plot(self.stress[peak], self.strain_pocent[peak], 'ro', 
-                       label=f"Верхний пик {upper_idx+1}")
-            
-            if lower_idx >= 0 and lower_idx < len(self.peaks_lower):
-                peak = self.peaks_lower[lower_idx]
-                ax1.plot(self.stress[peak], self.strain_pocent[peak], 'go', 
-                       label=f"Нижний пик {lower_idx+1}")
-        
-        # Настраиваем график
-        ax1.set_xlabel('Удельное давление, МПа', fontsize=self.fontsize, fontweight=self.fontweight)
-        ax1.set_ylabel('Относительная деформация, %', fontsize=self.fontsize, fontweight=self.fontweight)
-        
-        ax1.grid(True)
-        
 
-        ax3.plot(self.stress[ll:uu], self.young_modulus_final[ll:uu], 'k-', linewidth=self.linewidth, label="Данные")
-        # Отрисовываем выбранные пики
-        if self.show_peaks:
-            ax3.legend()
-            if upper_idx >= 0 and upper_idx < len(self.peaks_upper):
-                peak = self.peaks_upper[upper_idx]
-                ax3.plot(self.stress[peak], self.young_modulus_final[peak], 'ro', 
-                       label=f"Верхний пик {upper_idx+1}")
-
-            if lower_idx >= 0 and lower_idx < len(self.peaks_lower):
-                peak = self.peaks_lower[lower_idx]
-                ax3.plot(self.stress[peak], self.young_modulus_final[peak], 'go', 
-                       label=f"Нижний пик {lower_idx+1}")
-        
-        ax3.set_ylabel('Модуль упругости, МПа', fontsize=self.fontsize, fontweight=self.fontweight)
-        ax3.set_xlabel('Удельное давление, МПа', fontsize=self.fontsize, fontweight=self.fontweight)
-        ax3.grid(True)
+        self.figures.show_view('peak')
+        if self.is_title:
+            self.axes['peak_strain'].set_title(f'{self.name_sample.text()} Коэффициент формы q = {p.form_factor:.2f}', fontsize=self.fontsize, fontweight=self.fontweight)
+        else:
+            self.axes['peak_strain'].set_title('')
+
+        # Участок между пиками и выбранные пики
+        upper = [p.peaks_upper[upper_idx]] if 0 <= upper_idx < len(p.peaks_upper) else []
+        lower = [p.peaks_lower[lower_idx]] if 0 <= lower_idx < len(p.peaks_lower) else []
+        for name, values in (('peak_strain', p.strain_pocent), ('peak_modulus', p.young_modulus_final)):
+            self.set_line(name, p.stress[ll:uu], values[ll:uu])
+            self.lines[f'{name}_upper'].set_data(p.stress[upper], values[upper])
+            self.lines[f'{name}_lower'].set_data(p.stress[lower], values[lower])
+            # Подпись пика - только если он выбран, иначе его пункт легенды скрыт
+            legend = self.axes[name].get_legend()
+            for i, (selected, text) in enumerate(((upper, f"Верхний пик {upper_idx+1}"),
+                                                  (lower, f"Нижний пик {lower_idx+1}")), 1):
+                if selected:
+                    legend.get_texts()[i].set_text(text)
+                legend.get_texts()[i].set_visible(bool(selected))
+                legend.legend_handles[i].set_visible(bool(selected))
+        self.figures.set_peaks_visible(self.show_peaks)
+        self.figures.rescale('peak_strain', 'peak_modulus')
+        self.toolbar1.update()
 
         self.canvas1.draw()
 
 
-    def find_coordinat(self, target_values, stress, strain):
-            stress_array = np.array(strain)
-            for target in target_values:
-                inx = np.where(np.abs(stress_array - target) < 1)[0]  # Ищем близкие к target (±0.1)
-                if len(inx) > 0:
-                    inx_50 = inx[0]
-                    y_7 = stress[inx_50]
-                    x_7 = strain[inx_50]
-                    return y_7, x_7
-
-
     def save_plots(self):
-        tamplate = ''
-        index_save_tamplate = self.selected_template
-        ABS_PATH = Path(__file__).parent
-        list_cycle = []
-        if index_save_tamplate == 'ДС':
-            tamplate = 'VibraTable_Template_DS.docx'
-        else:
-            tamplate = 'VibraTable_Template_NIISF.docx'
+        p = self.processor
+        if self.selected_template != 'ДС':
             self.selected_template = 'НИИСФ'
-        template = ABS_PATH / tamplate
-        doc = DocxTemplate(template)
-        if not hasattr(self, 'figure1') or not self.file_path:
+        if not hasattr(self, 'figure1') or not self.file_path or not self.results_ready:
             return
         
         options = QFileDialog.Options()
@@ -543,9 +769,6 @@ class YoungModulusApp(QMainWindow):
             options=options
         )
 
-        
-
-        
         if not save_dir:
             return
             
@@ -553,83 +776,31 @@ class YoungModulusApp(QMainWindow):
         file_name = os.path.splitext(os.path.basename(self.file_path))[0]
         save_path = os.path.join(save_dir, f"Результаты_{file_name}")
         os.makedirs(save_path, exist_ok=True) 
-        if self.save_C_stat:
-            self.C_stat(save_path)          
-        # Сохраняем все графики
-        fig_size = (14, 9)
-        self.figure1.set_size_inches(fig_size)
-        self.figure1.savefig(os.path.join(save_path, "Основные_графики.png"), dpi=300, bbox_inches='tight')
-        self.figure6.set_size_inches(fig_size)
-        self.figure6.savefig(os.path.join(save_path, "Циклы_нагружения.png"), dpi=300, bbox_inches='tight')
-        self.figure3.set_size_inches(fig_size)
-        self.figure3.savefig(os.path.join(save_path, "Модуль_упругости.png"), dpi=300, bbox_inches='tight')
-        self.figure4.set_size_inches(fig_size)
-        self.figure4.savefig(os.path.join(save_path, "Нагруж.png"), dpi=300, bbox_inches='tight')     
-        # Сохранение в word файл   
-        if hasattr(self, 'cycle_figures'):
-            for i, fig in enumerate(self.cycle_figures, 1):
-
-                cycle_path = os.path.join(save_path, f"Цикл_{i}.png")
-                fig.set_size_inches(fig_size)
-                fig.savefig(cycle_path, dpi=300, bbox_inches='tight')
-                list_cycle.append({'image':InlineImage(doc, cycle_path, width=Cm(20)), 'count':i})  # Уменьшил ширину для лучшего размещения
-
-                        
-        def transform_date(date):
-            months = ['января', 'февраля', 'марта', 'апреля', 'мая', 'июня',
-                'июля', 'августа', 'сентября', 'октября', 'ноября', 'декабря']
-            year,month,day = date.split('-')
-            return f'«{day}» {months[int(month) - 1]} {year}'
-                
-        def number_protocol(date):
-            year,month,day = date.split('-')
-            if index_save_tamplate == 'ДС':
-                return f'ДС-0{month}-{year}-'
-            else:       
-                return f'0{month}-{year}-'
-            
-        current_date = datetime.datetime.now().strftime('%Y-%m-%d')
-        def vibraTable_DocGenerator(name,
-                            a,
-                            b,
-                            h,
-                            mass,
-                            protocol,
-                            savedir):
-            test_date = datetime.datetime.now().strftime('%Y-%m-%d')
-            name_pic = ['Модуль_упругости', 'Основные_графики', 'Нагруж']
-            context = {
-                'name':name,
-                'test_date': transform_date(test_date),
-                'a':a,
-                'b':b,
-                'h':h,
-                'mass': mass,
-                'loads':name_pic,
-                'protocol': protocol,
-                'num_protocol': (number_protocol(current_date)),
-                'load_pic' : InlineImage(doc, savedir + f'/Модуль_упругости.png', width=Cm(20)),  #, height=Cm(10)
-                'cycles_pic': InlineImage(doc, savedir + f'/Нагруж.png', width=Cm(20)),  #, height=Cm(10)
-                'elastic_pic': InlineImage(doc, savedir + f'/Основные_графики.png', width=Cm(20)),
-                'list_cyrcle' : list_cycle,           
-            }           
-            doc.render(context=context)
-            if protocol != None:
-                doc.save(f'{savedir}/ДС-003-{test_date[:4]}-В{protocol}.docx')
-                if self.auto_open_file:
-                    os.startfile(f'{savedir}/ДС-003-{test_date[:4]}-В{protocol}.docx')
-            else:
-                doc.save(f'{savedir}/ДС-003-{test_date[:4]}-В_{name}.docx')         
-        name = self.name_sample.text()
-        a = float(self.width_edit.text().replace(',', '.'))
-        b = float(self.length_edit.text().replace(',', '.'))
-        h = float(self.height_edit.text().replace(',', '.'))
-        mass = float(self.mass_sample.text().replace(',', '.'))
-        protocol = self.num_protocol.text()     
-        savedir = save_path         
-
-        self.save_exel(self.E1, self.Eps1,self.Pr, (savedir + '/' + file_name))
-        vibraTable_DocGenerator(name, a, b, h, mass,protocol, savedir)
+        sample = {
+            'name': self.name_sample.text(),
+            'width': float(self.width_edit.text().replace(',', '.')),
+            'length': float(self.length_edit.text().replace(',', '.')),
+            'height': float(self.height_edit.text().replace(',', '.')),
+            'mass': float(self.mass_sample.text().replace(',', '.')),
+            'protocol': self.num_protocol.text(),
+        }
+        # Сохраняем все графики (по всем точкам, если прореживание для экрана не нужно в файлах)
+        if self.export_full_resolution:
+            self.set_full_resolution(True)
+        try:
+            excel_path, docx_path = save_results(p, self.figures, save_path, file_name, sample,
+                                                 self.selected_template, self.save_C_stat,
+                                                 decimate_cycles=not self.export_full_resolution,
+                                                 report_generator=self.report_generator)
+        except Exception as e:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить результаты:\n{str(e)}")
+            return
+        finally:
+            if self.export_full_resolution:
+                self.set_full_resolution(False)
+        if self.auto_open_file:
+            os.startfile(excel_path)
+            os.startfile(docx_path)
 
         # Сообщение об успешном сохранении
         QMessageBox.information(
@@ -639,104 +810,6 @@ class YoungModulusApp(QMainWindow):
         )
 
 
-    def process_data_(self):
-        if self.df is None:
-            print("Данные не загружены!")
-            return False
-        
-        width_edit = self.width_edit.text()
-        length_edit = self.length_edit.text()
-        height_edit = self.height_edit.text()
-
-        width = float(width_edit.replace(',', '.'))
-        length = float(length_edit.replace(',', '.'))
-        initial_height = float(height_edit.replace(',', '.'))
-
-
-
-        area = float(width) * float(length)
-
-        k = np.argmax(self.df[0].values > 0)
-        M = self.df.values[k:, :4] - self.df.values[k, :4]
-        sr = len(M) / M[-1, 3] if M[-1, 3] != 0 else 10
-
-        print(sr, 'Частота дискедитации')
-
-        F = M[:, 0]
-        S = M[:, 2]
-        T = np.arange(len(F)) / sr
-
-        peaks, _ = find_peaks(S, height=0.5 * np.max(S))
-        if len(peaks) < 3:
-            print("Недостаточно пиков для анализа (3 минимум)")
-            return False
-
-        Defl = S[peaks[0]]
-        V = Defl / T[peaks[0]]
-
-        if len(peaks) >= 4:
-            cycle_index = 3
-        else:
-            cycle_index = 2
-
-        cycle_index = 1
-
-        cycle_length = peaks[cycle_index] - peaks[cycle_index - 1]
-        Start = peaks[cycle_index] - cycle_length + 1
-        Finish = peaks[cycle_index]
-
-        print(Start, 'Start')
-        print(Finish, 'Finish')
-
-        F1 = F[Start:Finish + 1]
-        S1 = S[Start:Finish + 1]
-
-        w = int(np.ceil(sr * 2))
-        n = len(F1) // w
-        
-        print(w, 'Ширина окна')
-        print(n, 'Количество циклов')
-
-        Pr = np.zeros(n)
-        E1 = np.zeros(n)
-        Eps1 = np.zeros(n)
-
-        for i in range(n):
-            idx1 = i * w
-            idx2 = (i + 1) * w - 1
-            if idx2 >= len(F1):
-                idx2 = len(F1) - 1
-            Pr[i] = (F1[idx1] + F1[idx2]) / 2 / area * 1e-6
-            delta_F = F1[idx2] - F1[idx1]
-            delta_S = S1[idx2] - S1[idx1]
-            if delta_S != 0:
-                E1[i] = (delta_F / area * 1e-6) / (delta_S / initial_height)
-            Eps1[i] = (S1[idx1] + S1[idx2]) / 2 / initial_height
-
-        if len(Pr) > 0:
-            Pr = Pr - Pr[0]
-
-        Pr, E1, Eps1 = Pr[3:], E1[3:], Eps1[3:]
-        f = 0
-        self.Eps1 = Eps1[int(len(Eps1)/2)+f:] 
-        self.E1 = E1[int(len(E1)/2)+f:]  
-        self.Pr = Pr[int(len(Pr)/2)+f:] 
-
-        if self.Pr.size > 2:
-            min_Pr = np.min(self.Pr)
-            self.Eps1 = self.Eps1 - self.Eps1[0]
-            Pr_ = self.Pr + (-min_Pr)
-        else:
-            Pr_ = self.Pr
-
-        print(len(Pr), 'Pr')
-
-
-        self.E1 = self.E1[:] * 1_000_000
-        self.Eps1 = self.Eps1[:] * 100 
-        self.Pr = Pr_[:] * 1_000_000
-
-
     def find_loading_starts(self, data, threshold, min_interval=10):
         """Находит индексы начала всех циклов нагружения"""
         above_threshold = data > threshold
@@ -767,300 +840,184 @@ class YoungModulusApp(QMainWindow):
 
 
     def plot_data(self):
+        p = self.processor
         if not self.file_path:
             QMessageBox.warning(self, "Внимание", "Сначала выберите файл данных")
             return
 
-        if not self.load_data():
+        try:
+            width, length, initial_height = self.sample_geometry()
+        except Exception as e:
+            QMessageBox.critical(self, "Ошибка", str(e))
+            return
+
+        if self.analysis_thread is not None:
+            # Идёт расчёт: прерываем его, новый запустится после остановки потока
+            self.pending_analysis = True
+            self.cancel_analysis()
             return
 
-        if not self.process_data():
+        # Расчёт в фоновом потоке, графики - в on_analysis_finished.
+        # Пересчитываются только этапы, входные данные которых изменились.
+        # До конца расчёта этапы процессора обновлены частично
+        self.results_ready = False
+        self.analysis_thread = QThread(self)
+        self.analysis_worker = AnalysisWorker(p, self.file_path, width, length, initial_height)
+        self.analysis_worker.moveToThread(self.analysis_thread)
+        self.analysis_thread.started.connect(self.analysis_worker.run)
+        self.analysis_worker.progress.connect(self.on_analysis_progress)
+        self.analysis_worker.finished.connect(self.on_analysis_finished)
+        self.analysis_worker.failed.connect(self.on_analysis_failed)
+        self.analysis_worker.cancelled.connect(self.on_analysis_cancelled)
+        for signal in (self.analysis_worker.finished, self.analysis_worker.failed,
+                       self.analysis_worker.cancelled):
+            signal.connect(self.analysis_thread.quit)
+        self.analysis_thread.finished.connect(self.on_analysis_thread_done)
+        self.set_busy(True)
+        self.analysis_thread.start()
+
+    def set_busy(self, busy):
+        """
+        Пока идёт расчёт, данные процессора неполные: сохранять и перестраивать пики нельзя.
+        После прерванного расчёта часть этапов уже новая, часть - прежняя, поэтому
+        действия остаются выключенными до следующего полного расчёта (results_ready).
+        """
+        ready = not busy and self.results_ready
+        self.cancel_button.setEnabled(busy)
+        self.save_button.setEnabled(ready)
+        self.save_action.setEnabled(ready)
+        self.plot_selected_peak_button.setEnabled(ready and self.peak_combo_upper.count() > 0)
+        if busy:
+            self.progress_bar.setValue(0)
+            self.progress_bar.setFormat("Расчёт...")
+
+    def cancel_analysis(self):
+        """Просит фоновый расчёт остановиться перед следующим этапом"""
+        if self.analysis_worker is not None:
+            self.analysis_worker.cancel()
+            self.progress_bar.setFormat("Прерывание...")
+
+    def on_analysis_progress(self, stage, done, total):
+        self.progress_bar.setValue(done)
+        self.progress_bar.setFormat(f"{STAGE_TITLES[stage]} ({done}/{total})")
+
+    def on_analysis_finished(self, recomputed):
+        # Расчёт мог дойти до конца уже после прерывания (выбран другой файл,
+        # включено слежение, которое рисует в те же линии) - такие данные не показываем
+        if self.pending_analysis or self.analysis_worker.abort or self.live_timer.isActive():
             return
+        self.results_ready = True
+        self.render_plots()
+        self.progress_bar.setFormat("Готово")
+
+    def on_analysis_failed(self, message):
+        self.progress_bar.setFormat("Ошибка")
+        QMessageBox.critical(self, "Ошибка", message)
+
+    def on_analysis_cancelled(self):
+        self.progress_bar.setFormat("Прервано")
+
+    def on_analysis_thread_done(self):
+        """Поток остановлен: освобождаем его и при необходимости запускаем новый расчёт"""
+        self.analysis_worker.deleteLater()
+        self.analysis_thread.deleteLater()
+        self.analysis_worker = None
+        self.analysis_thread = None
+        self.set_busy(False)
+        if self.pending_analysis:
+            self.pending_analysis = False
+            self.plot_data()
 
-  
-        self.stress = self.stress
-
-        self.time = self.time   
-        self.pic_data = self.strain_    
-        # Получение всех пиков с дополнительными параметрами для лучшего обнаружения
-        self.peaks_upper, _ = find_peaks(self.pic_data, prominence=np.nanstd(self.pic_data)/2)  
-        # Сначала находим впадины как обычно
-        self.peaks_lower, _ = find_peaks(-self.pic_data, prominence=np.nanstd(self.pic_data)/2) 
-                    # Точки пересечения нуля снизу вверх
-        zero_crossings = np.where((self.pic_data[:-1] <= 0) & (self.pic_data[1:] > 0))[0]   
-        # Локальные минимумы
-        local_minima, _ = find_peaks(-self.pic_data, prominence=np.nanstd(self.pic_data)/2) 
-        # Объединяем и удаляем дубликаты
-        self.peaks_lower_ = np.unique(np.concatenate((zero_crossings, local_minima)))   
-
-        window_size = 5 
-        # Для каждой впадины ищем ближайшую точку подъёма
-
-        adjusted_peaks = []
-        for peak in self.peaks_lower:
-            # Ищем первую точку после peak, где производная становится положительной
-            grad = np.gradient(self.pic_data)
-            rise_point = np.where(grad[peak:] > 0)[0]
-            if len(rise_point) > 0:
-                adjusted_peaks.append(peak + rise_point[0])  # сдвигаем пик к подъёму   
-        self.peaks_lower = np.array(adjusted_peaks)
-        self.peaks_lower = np.insert(self.peaks_lower, 0, 0)   
+    def closeEvent(self, event):
+        # Поток должен завершиться до удаления окна
+        if self.analysis_thread is not None:
+            self.pending_analysis = False
+            self.cancel_analysis()
+            self.analysis_thread.wait()
+        if self.batch_thread is not None:
+            self.cancel_batch()
+            self.batch_thread.wait()
+        super().closeEvent(event)
+
+    def render_plots(self):
+        """Подставляет уже рассчитанные данные в постоянные линии и перерисовывает холсты"""
         # Обновляем выпадающие списки пиков
-        self.update_peaks_comboboxes()      
-        # Фильтрация NaN и бесконечных значений
-        # valid = ~np.isnan(self.stress) & ~np.isnan(self.strain_) & ~np.isinf(self.stress) & ~np.isinf(self.strain)        
-        strain__ = self.translate_units(self.strain, 100)
-        window_size = min(self.median_filter_size_dist, len(strain__)//4 or 1)
-        strain_median = median_filter(strain__, size=window_size)
-        self.strain_pocent = gaussian_filter1d(strain_median, sigma=self.gaussian_sigma_dist_value)
-
-        # Очистка всех фигур
-        self.figure1.clear()
-        self.figure3.clear()
-        self.figure4.clear()        
-
-        # График 2: Относительная деформация vs Время (все данные)
-        ax3 = self.figure1.add_subplot(211)
-        ax8 = self.figure1.add_subplot(212)
-        ax8.plot(self.time, self.strain * 100, 'k-', linewidth=self.linewidth)            
-        if self.show_peaks and len(self.peaks_upper) > 0 and len(self.peaks_lower) > 0:
-            peaks_upper = [p for p in self.peaks_upper if p < len(self.strain* 100)]
-            peaks_lower = [p for p in self.peaks_lower if p < len(self.strain* 100)]
-            ax8.plot(self.time[peaks_upper], self.strain[peaks_upper], 
-                    'ro', label='Верхние пики')
-            ax8.plot(self.time[peaks_lower], self.strain[peaks_lower], 
-                    'go', label='Нижние пики')
-            ax8.legend()        
-        ax8.set_xlabel('Время, С', fontsize=self.fontsize, fontweight=self.fontweight)
-        ax8.set_ylabel('Относительная деформация, %', fontsize=self.fontsize, fontweight=self.fontweight)
-        ax8.grid(True, linestyle='--', alpha=0.6)   
-        if self.is_title:
-            ax3.set_title(f'{self.name_sample.text()} Коэффициент формы q = {self.form_factor:.2f}', fontsize=self.fontsize, fontweight=self.fontweight)  
-        ax3.plot(self.time, self.stress, 'k-', linewidth=self.linewidth)     
-        if self.show_peaks and len(self.peaks_upper) > 0 and len(self.peaks_lower) > 0:
-            peaks_upper = [p for p in self.peaks_upper if p < len(self.stress)]
-            peaks_lower = [p for p in self.peaks_lower if p < len(self.stress)]
-            ax3.plot(self.time[peaks_upper], self.stress[peaks_upper], 
-                    'ro', label='Верхние пики')
-            ax3.plot(self.time[peaks_lower], self.stress[peaks_lower], 
-                    'go', label='Нижние пики')
-            ax3.legend()        
-        ax3.set_xlabel('Время, С', fontsize=self.fontsize, fontweight=self.fontweight)
-        ax3.set_ylabel('Удельное давление, МПа', fontsize=self.fontsize, fontweight=self.fontweight)
-        ax3.grid(True, linestyle='--', alpha=0.6)           
-        # График 3: Дополнительные графики
-        ax4 = self.figure3.add_subplot(211)
-        ax5 = self.figure3.add_subplot(212)     
-        self.process_data_() 
-        # График 3.1: Модуль Юнга vs Время
-        ax4.plot(self.Pr, self.E1,'k-', linewidth=self.linewidth)
-        if self.is_title:
-            ax4.set_title(f'{self.name_sample.text()} Коэффициент формы q = {self.form_factor:.2f}', fontsize=self.fontsize, fontweight=self.fontweight)  
-        ax4.set_xlabel('Удельное давление, МПа', fontsize=self.fontsize, fontweight=self.fontweight)
-        ax4.set_ylabel('Модуль упругости, МПа', fontsize=self.fontsize, fontweight=self.fontweight)
-        ax4.grid(True, linestyle='--', alpha=0.6)
-        ax4.set_xlim(left=0)
-        ax4.set_ylim(bottom=0)      
-        # График 3.2: Относительная деформация vs Удельное давление (все данные)
-        ax5.plot(self.Pr, self.Eps1, 'k-', linewidth=self.linewidth)
-        ax5.set_xlabel('Удельное давление, МПа', fontsize=self.fontsize, fontweight=self.fontweight)
-        ax5.set_ylabel('Относительная деформация, %', fontsize=self.fontsize, fontweight=self.fontweight)
-        ax5.grid(True, linestyle='--', alpha=0.6)
-
-        if self.radio_button_line_modul_y:
-            if self.Eps1.size > 0:
-                if max(self.Eps1) > 30 and self.Eps1.size > 15:
-                    stress = self.Pr
-                    strain = self.Eps1  
-                    x_7, y_7 = self.find_coordinat([7,8,9,10,11,12,6,13,5],stress, strain)
-                    x_20, y_20 = self.find_coordinat([20, 19, 18, 21,22,23],stress, strain)
-                    ax5.axvline(x=x_20)
-                    ax5.axvline(x=x_7)  
-                    end_graff_x = stress[-1]
-                    end_graff_y = strain[-1]
-                    start_graff_x = stress[0]
-                    start_graff_y = strain[0]
-                    ax5.plot([x_7,x_20], [y_7, y_20], 'r')
-                    ax5.plot([x_20,end_graff_x], [y_20, end_graff_y], 'g'  )
-                    ax5.plot([start_graff_x,x_7], [start_graff_y,y_7], 'y') 
-        ax5.set_xlim(left=0)
-        ax5.set_ylim(bottom=0)      
-        self.figure3.tight_layout()     
-        # График 4: Циклы нагружения
-        self.plot_overview()  
-        self.plot_w()      
+        self.update_peaks_comboboxes()
+        self.figures.render(self.processor, self.name_sample.text(), self.show_peaks)
+        self.plot_w()
+        # Новые данные - прежняя история зума не нужна
+        for toolbar in (self.toolbar1, self.toolbar3, self.toolbar4, self.toolbar6):
+            toolbar.update()
         # Обновление всех холстов
-        self.canvas1.draw()
+        for canvas in (self.canvas1, self.canvas3, self.canvas4, self.canvas6):
+            canvas.draw()
 
-        self.canvas3.draw()
-        self.canvas4.draw() 
-
-        # Активируем кнопку сохранения
-        self.save_button.setEnabled(True)
-
- 
-    def translate_units(self, data, utits):
-        current_data = []
-        for i in data:
-            current_data.append(i * utits)
-        return np.array(current_data)
-    
-    def plot_overview(self):
-       if len(self.locs) < 1:
-           print(f"Недостаточно данных для построения графика {os.path.basename(self.file_path)}")
-           return   
-       def colors_labels(locs):
-           base_colors = ['k', 'g', 'r', 'b', 'm', 'c', 'c', 'c']
-           n = min(len(locs)+2, len(base_colors)+2)
-           labels = [f'Цикл {i+1}' for i in range(n)]
-           return base_colors[:n], labels       
-       Forse, Disp, Time = self.forse__, self.displacement__, self.time
-       delta_l = [np.max(Disp)]     
-       n_locs_rang = min(6, len(self.locs))
-       colors, labels = colors_labels(self.locs)
-       base_len = self.locs[0] if len(self.locs) > 0 else len(Disp)     
-       # Очищаем фигуру перед построением
-       self.figure4.clear() 
-       self.figure6.clear() 
-       # Создаем 2 subplot'а: верхний для временных данных, нижний для циклов
-       ax1 = self.figure4.add_subplot(1, 1, 1)  # верхний график
-       ax2 = self.figure6.add_subplot(1, 1, 1)  # верхний график
-       ax1.plot(Time, Disp, 'b', label='Смещение (мм)', linewidth=self.linewidth)
-       ax1.set_ylabel('Перемещение, мм', fontsize=self.fontsize, 
-                     fontweight=self.fontweight, color='blue')
-       ax1.set_xlabel('Время, с', fontsize=self.fontsize, fontweight=self.fontweight)
-       ax1.grid(True)
-       ax1.set_ylim([0, math.ceil(delta_l[0] + 0.5)])   
-       # График силы на той же оси (дополнительная ось Y)
-       ax1_force = ax1.twinx()
-       ax1_force.plot(Time, Forse, 'r', label='Нагрузка (Н)', linewidth=self.linewidth)
-       ax1_force.set_ylabel('Нагрузка, Н', fontsize=self.fontsize, 
-                           fontweight=self.fontweight, color='red') 
-       # Общий заголовок для верхнего графика
-       if self.is_title:
-        ax1.set_title(f'{self.name_sample.text()} Коэффициент формы q = {self.form_factor:.2f}', fontsize=self.fontsize, fontweight=self.fontweight)  
-       # ======= НИЖНЯЯ ЧАСТЬ: Циклы нагружения =======
-       lower_ =  (self.peaks_lower)
-       upper_ =  (self.peaks_upper)
-
-       for i in range(len(upper_) + 1):
-
-           if i == 0:
-               pass
-           else:
-               # Создаем новую фигуру и холст для каждого цикла
-               figure = Figure(figsize=(self.figure_width, self.figure_height))
-           
-               if i == len(upper_):
-                   start_idx = lower_[i-1]
-                   x = self.displacement__[start_idx:]
-                   y = self.forse__[start_idx:]
-                   ax2.plot(x, y, colors[i-1], label=labels[i-1], linewidth=self.linewidth)  
-               else:
-                   start_idx = lower_[i-1]
-                   end_idx = lower_[i]
-                   x = self.displacement__[start_idx:end_idx]
-                   y = self.forse__[start_idx:end_idx]
-                   ax2.plot(x, y, colors[i-1], label=labels[i-1], linewidth=self.linewidth)  
- 
-
-       ax2.set_xlabel('Перемещение, мм', fontsize=self.fontsize, fontweight=self.fontweight)
-       ax2.set_ylabel('Нагрузка, Н', fontsize=self.fontsize, fontweight=self.fontweight)
-       ax2.grid(True, linestyle='--', alpha=0.6)
-       ax2.legend(loc='lower right')
-       if self.is_title:
-          ax2.set_title('Циклы нагружения', fontsize=self.fontsize, fontweight=self.fontweight)   
-       # Общий заголовок для всей фигуры    
-       # Регулировка расположения элементов
-
-       self.canvas6.draw()
-       self.canvas4.draw()
-    
     def plot_w(self):
-        self.cycle_figures = []
-        if len(self.locs) < 1:
+        """
+        Вкладки циклов - пустые заготовки; фигура цикла строится при первом показе
+        вкладки (show_cycle), поэтому число циклов не влияет на время перерисовки.
+        """
+        p = self.processor
+        current = self.tabs.currentIndex()
+        # Пока вкладки пересоздаются, переключение не должно строить фигуры
+        self.tabs.blockSignals(True)
+        self.clear_cycle_tabs()
+        for k in range(len(p.cycles)):
+            tab = QWidget()
+            tab.setLayout(QVBoxLayout())
+            tab.cycle_index = k
+            self.tabs.addTab(tab, f"Цикл {k + 1}")
+        self.tabs.blockSignals(False)
+        if len(p.cycles) < 1:
             print(f"Недостаточно данных для построения графика {os.path.basename(self.file_path)}")
             return
 
-        def colors_labels(locs):
-            base_colors = ['k', 'g', 'r', 'b', 'm', 'c','y','w']
-            n = min(len(locs)+1, len(base_colors))
-            labels = [f'Цикл {i+1}' for i in range(n)]
-            return base_colors[:n], labels
+        # Если открыта вкладка цикла - строим её сразу
+        self.tabs.setCurrentIndex(min(current, self.tabs.count() - 1))
+        self.on_tab_changed(self.tabs.currentIndex())
 
-        # Получаем данные из DataFrame
-        Force = self.df[0].values  # Сила
-        Disp = self.df[2].values   # Перемещение
-
-        # Удаляем старые вкладки циклов
+    def clear_cycle_tabs(self):
+        """Удаляет вкладки циклов и построенные для них фигуры"""
+        self.cycle_cache.clear()
         for i in range(self.tabs.count()-1, -1, -1):
-            if self.tabs.tabText(i).startswith("Цикл"):
+            tab = self.tabs.widget(i)
+            if hasattr(tab, 'cycle_index'):
                 self.tabs.removeTab(i)
+                tab.deleteLater()
 
-        colors, labels = colors_labels(self.locs)
-        
-        # Базовый размер окна для каждого цикла
-
-        lower_ =  (self.peaks_lower)
-        upper_ =  (self.peaks_upper)
-
-        x = []
-        y = []
-
-        for i in range(len(upper_) + 1):
-            if i == 0:
-                pass
-            else:
-                # Создаем новую фигуру и холст для каждого цикла
-                figure = Figure(figsize=(self.figure_width, self.figure_height))
-                canvas = FigureCanvas(figure)
-                toolbar = CustomNavigationToolbar(canvas, self)
-            
-
-                if i == len(upper_):
-                    start_idx = lower_[i-1]
-                    x = self.displacement__[start_idx:]
-                    y = self.forse__[start_idx:]
-                else:
-                    start_idx = lower_[i-1]
-                    end_idx = lower_[i]
-                    x = self.displacement__[start_idx:end_idx]
-                    y = self.forse__[start_idx:end_idx]
-                    
-                
-                ax = figure.add_subplot(111)
-
-                ax.plot(x, y, color=colors[i-1], label=labels[i-1], linewidth=self.linewidth)
-                x = list(x)
-                x.append(x[0])
-                y = list(y) 
-                y.append(y[0])
+    def on_tab_changed(self, index):
+        # Во время расчёта таблица циклов процессора может не совпадать с вкладками
+        if not self.results_ready:
+            return
+        tab = self.tabs.widget(index)
+        if tab is not None and hasattr(tab, 'cycle_index'):
+            self.show_cycle(tab)
 
-                if self.is_filling:
-                    # Заливка с дополнительными точками
-                    ax.fill_between(x, y, color=colors[i-1], alpha=0.2, linewidth=0)
-                
-                # Вычисляем площадь по оригинальным точкам
-                area = abs(np.trapezoid(y, x))
-                
- 
-                # Настройки графика
-                if self.is_title:
-                    ax.set_title(f'Цикл {i} (Площадь: {area:.2f})', fontsize=self.fontsize, fontweight=self.fontweight)
-                ax.set_xlabel('Перемещение, мм', fontsize=self.fontsize, fontweight=self.fontweight)
-                ax.set_ylabel('Сила, Н', fontsize=self.fontsize, fontweight=self.fontweight)
-                 
-                ax.grid(True, linestyle='--', alpha=0.7)
-
-                # Оптимизируем расположение
-                figure.tight_layout(pad=3.0)
-                self.cycle_figures.append(figure)
-                
-                # Создаем контейнер и добавляем вкладку
-                tab_container = self.create_tab_container(canvas, toolbar)
-                self.tabs.addTab(tab_container, f"Цикл {i}")
-  
+    def show_cycle(self, tab):
+        """
+        Строит фигуру цикла во вкладке-заготовке. Построенные фигуры хранятся в LRU
+        не больше cycle_cache_size: самая давно открытая удаляется, её вкладка снова
+        становится заготовкой.
+        """
+        k = tab.cycle_index
+        if k in self.cycle_cache:
+            self.cycle_cache.move_to_end(k)
+            return
 
+        figure = Figure(figsize=(self.figure_width, self.figure_height))
+        canvas = FigureCanvas(figure)
+        toolbar = CustomNavigationToolbar(canvas, self)
+        ZoomPanHandler(canvas, self.redisplay_figure)
+        self.figures.draw_cycle(figure, self.processor, k)
+        tab.layout().addWidget(toolbar)
+        tab.layout().addWidget(canvas)
+        self.cycle_cache[k] = (tab, toolbar, canvas)
+
+        while len(self.cycle_cache) > self.cycle_cache_size:
+            _, (old_tab, old_toolbar, old_canvas) = self.cycle_cache.popitem(last=False)
+            for widget in (old_toolbar, old_canvas):
+                old_tab.layout().removeWidget(widget)
+                widget.deleteLater()
 
     def apply_styles(self):
         self.setStyleSheet( """
@@ -1124,171 +1081,24 @@ class YoungModulusApp(QMainWindow):
         }
     """)
 
-    def process_data(self):
-            # Получение параметров образца
-            width_edit = self.width_edit.text()
-            length_edit = self.length_edit.text()
-            height_edit = self.height_edit.text()
-
-            width = float(width_edit.replace(',', '.'))
-            length = float(length_edit.replace(',', '.'))
-            initial_height = float(height_edit.replace(',', '.'))
-
-            self.form_factor = float( width / initial_height)
-            
-            # Данные со столбцов
-            force = self.df[0].values  # нагрузка (Н)
-            displacement = self.df[2].values  # перемещение (мм)
-            self.time_ = self.df[3].values  # время (с)
-
-            threshold = 20  # порог нагрузки в Ньютонах
-
-            # Находим первый индекс, где нагрузка превышает порог И продолжает расти
-            start_index = 0
-            for i in range(1, len(force)):
-                if force[i] > threshold and np.all(force[i:i+5] > threshold):  # проверяем 5 следующих точек
-                    start_index = i
-                    break
-
-            # Обрезаем все данные до start_index
-            self.time_ = self.time_[start_index:]
-            displacement = displacement[start_index:]
-            force = force[start_index:]
-
-            self.time_ =  self.time_  - self.time_[0]
-            displacement =  displacement - displacement[0]
-            force =  force - force[0]
-            self.forse__ = force
-            self.displacement__ = displacement
-            print(len(self.displacement__), 'displacement__')
-
-            print(f"Обрезано {start_index} начальных точек. Начальная нагрузка: {force[0]:.2f} Н")
-
-            # Параметры образца
-            area = width * length  # мм²
-            area_m2 = area * 1e-6  # м²
-            self.area = area
-    
-
-            # Расчет деформации и напряжения
-            with np.errstate(divide='ignore', invalid='ignore'):
-                self.strain_ = displacement / initial_height  # относительная деформация
-                
-                stress = (force / area_m2) * 1e-6  # удельное давление (Па)
-            strain_ = displacement / initial_height  # удельное давление (Па)
-            
-            # Применяем маску ко всем соответствующим массивам
-            self.strain = strain_
-            self.stress = stress
-            self.time = self.time_
-
-            self.strain = (self.strain)
-            self.stress = (self.stress)
-            # Проверяем, что все массивы имеют одинаковую длину
-
-            # Расчет модуля Юнга (производная σ по ε)
-            with np.errstate(divide='ignore', invalid='ignore'):
-                young_modulus = np.gradient(self.stress, self.strain)
-
-            young_modulus_interp = interpolate_nans(young_modulus)
-            # Сглаживание
-            
-            window_size = min(self.median_filter_size, len(young_modulus_interp)//4 or 1)
-            young_modulus_median = median_filter(young_modulus_interp, size=window_size)
-            young_modulus_smooth = gaussian_filter1d(young_modulus_median, sigma=self.gaussian_sigma)
-            self.young_modulus_final = young_modulus_smooth
-           
-            # Находим циклы нагружения
-            self.find_loading_cycles()
-
-            return True
-        
-    def find_loading_cycles(self):
-        """Находит циклы нагружения в данных"""
-        # Находим пики в данных силы
-        peaks, _ = find_peaks(self.df[0].values, prominence=np.std(self.df[0].values)/2)
-        self.locs = peaks.tolist()
-        
-        # Если пиков слишком много, берем только первые 5
-        if len(self.locs) > 5:
-            self.locs = self.locs[:5]
-
     def update_peaks_comboboxes(self):
         """Обновляет выпадающие списки пиков"""
+        p = self.processor
         self.peak_combo_upper.clear()
         self.peak_combo_lower.clear()
         
-        if len(self.peaks_upper) > 0:
-            for i, peak in enumerate(self.peaks_upper):
+        if len(p.peaks_upper) > 0:
+            for i, peak in enumerate(p.peaks_upper):
                 # Преобразуем numpy.int64 в int и форматируем строку
                 peak_idx = int(peak)
-                if peak_idx < len(self.stress):
-                    self.peak_combo_upper.addItem(f"Пик {i+1} (x={peak_idx}, y={self.stress[peak_idx]:.2f})")
+                if peak_idx < len(p.stress):
+                    self.peak_combo_upper.addItem(f"Пик {i+1} (x={peak_idx}, y={p.stress[peak_idx]:.2f})")
         
-        if len(self.peaks_lower) > 0:
-            for i, peak in enumerate(self.peaks_lower):
+        if len(p.peaks_lower) > 0:
+            for i, peak in enumerate(p.peaks_lower):
                 # Преобразуем numpy.int64 в int и форматируем строку
                 peak_idx = int(peak)
-                if peak_idx < len(self.stress):
-                    self.peak_combo_lower.addItem(f"Пик {i+1} (x={peak_idx}, y={self.stress[peak_idx]:.2f})")
+                if peak_idx < len(p.stress):
+                    self.peak_combo_lower.addItem(f"Пик {i+1} (x={peak_idx}, y={p.stress[peak_idx]:.2f})")
         
-        self.plot_selected_peak_button.setEnabled(len(self.peaks_upper) > 0 or len(self.peaks_lower) > 0)
-
-
-    def C_stat(self, save_dir):
-        low = self.peaks_lower
-        low = np.insert(low, 0, 0) 
-        lower_p = list(low)
-        upper_p = list(self.peaks_upper)
-        force = self.forse__
-        displacement = self.displacement__
-        
-        # Создаем список для хранения результатов всех циклов
-        results = []
-        
-        for io in range(len(upper_p)):
-            force__ = force[lower_p[io]:upper_p[io]]
-            displacement__ = displacement[lower_p[io]:upper_p[io]]
-            threshold_GOST = 625  # порог нагрузки в Ньютонах
-            
-            # Находим первый индекс, где нагрузка превышает порог И продолжает расти
-            start_index_GOST = None
-            for i in range(1, len(force__) - 5):
-                if force__[i] > threshold_GOST and np.all(force__[i:i+5] > threshold_GOST):
-                    start_index_GOST = i
-                    break
-                    
-            if len(upper_p) == io+1:
-                list_max = force[lower_p[io]:]
-            else:
-                list_max = force[lower_p[io]:lower_p[io+1]]
-                
-            # max_forse = (max(list_max))
-            max_forse = int(8750)
-
-            max_forse_ = None
-            for i in range(1, len(force__) - 5):
-                if force__[i] > max_forse and np.all(force__[i:i+5] > max_forse):
-                    max_forse_ = i
-                    break
-
-            pp = (max_forse - threshold_GOST) / ((displacement__[max_forse_] - displacement__[start_index_GOST]) * self.area)
-            
-            # Добавляем результат цикла в список
-            results.append(pp)
-            
-            print(f"Цикл: {str(io+1)}", pp, 'H/mm2\nЗначение находится когда нагрузка возрастает')
-        
-            try:
-                # Создаем DataFrame с двумя столбцами
-                df = pd.DataFrame({
-                    'Результат': [f"{result:.3f}".replace('.', ',') for result in results]
-                })
-                
-                
-                # Сохранение в Excel
-                save_path = save_dir + '/результаты_циклов.xlsx'
-                df.to_excel(save_path, index=False)
-                
-            except PermissionError as e:
-                print(f"Ошибка доступа к файлу: {e}")
+        self.plot_selected_peak_button.setEnabled(len(p.peaks_upper) > 0 or len(p.peaks_lower) > 0)
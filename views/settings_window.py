@@ -6,6 +6,7 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QToolTip 
 from PyQt5.QtGui import QFont, QPalette
+from models.modulus import MODULUS_KERNELS
 
 
 
@@ -33,7 +34,7 @@ class SettingsDialog(QDialog):
         self.median_filter_spin = QSpinBox()
         self.median_filter_spin.setButtonSymbols(QAbstractSpinBox.NoButtons)
         self.median_filter_spin.setRange(1, 1000)
-        self.median_filter_spin.setValue(self.main_window.median_filter_size)
+        self.median_filter_spin.setValue(self.main_window.processor.median_filter_size)
         median_layout.addWidget(self.median_filter_spin)
         filter_layout.addLayout(median_layout)
         
@@ -44,9 +45,91 @@ class SettingsDialog(QDialog):
         self.gaussian_sigma_spin.setButtonSymbols(QAbstractSpinBox.NoButtons)
         self.gaussian_sigma_spin.setRange(0.1, 10.0)
         self.gaussian_sigma_spin.setSingleStep(0.1)
-        self.gaussian_sigma_spin.setValue(self.main_window.gaussian_sigma)
+        self.gaussian_sigma_spin.setValue(self.main_window.processor.gaussian_sigma)
         gaussian_layout.addWidget(self.gaussian_sigma_spin)
         filter_layout.addLayout(gaussian_layout)
+
+        # Ядро производной для модуля упругости
+        kernel_layout = QHBoxLayout()
+        kernel_layout.addWidget(QLabel("Расчёт модуля упругости:"))
+        self.modulus_kernel_combo = QComboBox()
+        for key, label in MODULUS_KERNELS.items():
+            self.modulus_kernel_combo.addItem(label, key)
+        self.modulus_kernel_combo.setCurrentIndex(
+            self.modulus_kernel_combo.findData(self.main_window.processor.modulus_kernel))
+        kernel_layout.addWidget(self.modulus_kernel_combo)
+        filter_layout.addLayout(kernel_layout)
+
+        derivative_layout = QHBoxLayout()
+        derivative_layout.addWidget(QLabel("Окно производной (точек):"))
+        self.derivative_window_spin = QSpinBox()
+        self.derivative_window_spin.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        self.derivative_window_spin.setRange(3, 10000)
+        self.derivative_window_spin.setValue(self.main_window.processor.derivative_window)
+        derivative_layout.addWidget(self.derivative_window_spin)
+        filter_layout.addLayout(derivative_layout)
+
+        # Фильтр выбросов нагрузки и перемещения до расчёта
+        processor = self.main_window.processor
+        despike_layout = QHBoxLayout()
+        despike_layout.addWidget(QLabel("Фильтр выбросов (Хампель):"))
+        self.despike_radio_yes = QRadioButton("Да")
+        self.despike_radio_no = QRadioButton("Нет")
+        despike_buttons = QButtonGroup(self)
+        despike_buttons.addButton(self.despike_radio_yes)
+        despike_buttons.addButton(self.despike_radio_no)
+        if processor.despike:
+            self.despike_radio_yes.setChecked(True)
+        else:
+            self.despike_radio_no.setChecked(True)
+        despike_layout.addWidget(self.despike_radio_yes)
+        despike_layout.addWidget(self.despike_radio_no)
+        filter_layout.addLayout(despike_layout)
+
+        despike_params_layout = QHBoxLayout()
+        despike_params_layout.addWidget(QLabel("Окно (точек) / порог (MAD):"))
+        self.despike_window_spin = QSpinBox()
+        self.despike_window_spin.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        self.despike_window_spin.setRange(3, 1001)
+        self.despike_window_spin.setValue(processor.despike_window)
+        despike_params_layout.addWidget(self.despike_window_spin)
+        self.despike_threshold_spin = QDoubleSpinBox()
+        self.despike_threshold_spin.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        self.despike_threshold_spin.setRange(1.0, 100.0)
+        self.despike_threshold_spin.setSingleStep(0.5)
+        self.despike_threshold_spin.setValue(processor.despike_threshold)
+        despike_params_layout.addWidget(self.despike_threshold_spin)
+        filter_layout.addLayout(despike_params_layout)
+
+        # Окна секущего модуля на выбранном цикле
+        engine = self.main_window.processor.modulus_engine
+        window_layout = QHBoxLayout()
+        window_layout.addWidget(QLabel("Окно расчёта модуля по циклу (с):"))
+        self.modulus_window_spin = QDoubleSpinBox()
+        self.modulus_window_spin.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        self.modulus_window_spin.setRange(0.1, 60.0)
+        self.modulus_window_spin.setSingleStep(0.1)
+        self.modulus_window_spin.setValue(engine.window_seconds)
+        window_layout.addWidget(self.modulus_window_spin)
+        filter_layout.addLayout(window_layout)
+
+        overlap_layout = QHBoxLayout()
+        overlap_layout.addWidget(QLabel("Перекрытие окон (%):"))
+        self.modulus_overlap_spin = QSpinBox()
+        self.modulus_overlap_spin.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        self.modulus_overlap_spin.setRange(0, 95)
+        self.modulus_overlap_spin.setValue(int(round(engine.overlap * 100)))
+        overlap_layout.addWidget(self.modulus_overlap_spin)
+        filter_layout.addLayout(overlap_layout)
+
+        cycle_layout = QHBoxLayout()
+        cycle_layout.addWidget(QLabel("Цикл для расчёта модуля:"))
+        self.modulus_cycle_spin = QSpinBox()
+        self.modulus_cycle_spin.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        self.modulus_cycle_spin.setRange(2, 1000)
+        self.modulus_cycle_spin.setValue(engine.cycle_index + 1)
+        cycle_layout.addWidget(self.modulus_cycle_spin)
+        filter_layout.addLayout(cycle_layout)
         
         # Настройки графиков
         plot_group = QGroupBox("Настройки графиков")
@@ -89,6 +172,32 @@ class SettingsDialog(QDialog):
         title_seek_layout.addWidget(self.title_seek_radio_no)
         plot_layout.addWidget(title_seek_group)
 
+        # Прореживание линий на экране
+        display_layout = QHBoxLayout()
+        display_layout.addWidget(QLabel("Точек на линию на экране (0 - все):"))
+        self.display_points_spin = QSpinBox()
+        self.display_points_spin.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        self.display_points_spin.setRange(0, 1000000)
+        self.display_points_spin.setValue(self.main_window.display_points)
+        display_layout.addWidget(self.display_points_spin)
+        plot_layout.addLayout(display_layout)
+
+        export_group = QGroupBox("Сохранять графики по всем точкам:")
+        export_layout = QHBoxLayout()
+        export_group.setLayout(export_layout)
+
+        self.export_full_radio_yes = QRadioButton("Да")
+        self.export_full_radio_no = QRadioButton("Нет")
+
+        if self.main_window.export_full_resolution:
+            self.export_full_radio_yes.setChecked(True)
+        else:
+            self.export_full_radio_no.setChecked(True)
+
+        export_layout.addWidget(self.export_full_radio_yes)
+        export_layout.addWidget(self.export_full_radio_no)
+        plot_layout.addWidget(export_group)
+
         # Заливка в циклах 
         fill_seek_group = QGroupBox("Закрасить внутреннюю часть циклов:")
         fill_seek_layout = QHBoxLayout()
@@ -208,6 +317,49 @@ class SettingsDialog(QDialog):
         C_stat_layout.addWidget(self.C_stat_radio_no)
         setting_word_layout.addWidget(C_stat_group)
 
+        # Пороги нагрузки для C stat
+        low, high = self.main_window.processor.c_stat_thresholds[0]
+        C_stat_threshold_layout = QHBoxLayout()
+        C_stat_threshold_layout.addWidget(QLabel("Пороги C stat, Н:"))
+        self.C_stat_low_spin = QSpinBox()
+        self.C_stat_low_spin.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        self.C_stat_low_spin.setRange(0, 1000000)
+        self.C_stat_low_spin.setValue(int(low))
+        C_stat_threshold_layout.addWidget(self.C_stat_low_spin)
+        self.C_stat_high_spin = QSpinBox()
+        self.C_stat_high_spin.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        self.C_stat_high_spin.setRange(1, 1000000)
+        self.C_stat_high_spin.setValue(int(high))
+        C_stat_threshold_layout.addWidget(self.C_stat_high_spin)
+        setting_word_layout.addLayout(C_stat_threshold_layout)
+
+
+        # Кэш разобранных файлов
+        cache_group = QGroupBox("Кэш файлов данных")
+        cache_layout = QHBoxLayout()
+        cache_group.setLayout(cache_layout)
+        cache_layout.addWidget(QLabel("Максимальный размер кэша (МБ, 0 - отключить):"))
+        self.cache_size_spin = QSpinBox()
+        self.cache_size_spin.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        self.cache_size_spin.setRange(0, 100000)
+        self.cache_size_spin.setValue(self.main_window.cache_size_mb)
+        cache_layout.addWidget(self.cache_size_spin)
+
+        # Хранение каналов испытания
+        storage_group = QGroupBox("Хранить данные испытания во float32 (вдвое меньше памяти):")
+        storage_layout = QHBoxLayout()
+        storage_group.setLayout(storage_layout)
+
+        self.float32_radio_yes = QRadioButton("Да")
+        self.float32_radio_no = QRadioButton("Нет")
+
+        if self.main_window.processor.compact_storage:
+            self.float32_radio_yes.setChecked(True)
+        else:
+            self.float32_radio_no.setChecked(True)
+
+        storage_layout.addWidget(self.float32_radio_yes)
+        storage_layout.addWidget(self.float32_radio_no)
 
         # Кнопка применения
         self.apply_button = QPushButton("Применить настройки")
@@ -218,6 +370,8 @@ class SettingsDialog(QDialog):
         main_layout.addWidget(plot_group)
         main_layout.addWidget(size_group)
         main_layout.addWidget(setting_word)
+        main_layout.addWidget(cache_group)
+        main_layout.addWidget(storage_group)
         main_layout.addWidget(self.apply_button)
         main_layout.addStretch()
 
@@ -232,8 +386,13 @@ class SettingsDialog(QDialog):
             current_focus = self.main_window.focusWidget()
             
             # Сохраняем все параметры
-            self.main_window.median_filter_size = self.median_filter_spin.value()
-            self.main_window.gaussian_sigma = self.gaussian_sigma_spin.value()
+            self.main_window.processor.median_filter_size = self.median_filter_spin.value()
+            self.main_window.processor.gaussian_sigma = self.gaussian_sigma_spin.value()
+            self.main_window.processor.despike = self.despike_radio_yes.isChecked()
+            self.main_window.processor.despike_window = self.despike_window_spin.value()
+            self.main_window.processor.despike_threshold = self.despike_threshold_spin.value()
+            self.main_window.processor.modulus_kernel = self.modulus_kernel_combo.currentData()
+            self.main_window.processor.derivative_window = self.derivative_window_spin.value()
             self.main_window.linewidth = self.linewidth_spin.value()
             self.main_window.fontsize = self.fontsize_spin.value()
             self.main_window.figure_width = self.width_spin.value()
@@ -244,7 +403,18 @@ class SettingsDialog(QDialog):
             self.main_window.is_title = self.title_seek_radio_yes.isChecked()
             self.main_window.is_title = self.title_seek_radio_yes.isChecked()
             self.main_window.is_filling = self.fill_seek_radio_yes.isChecked()
+            self.main_window.display_points = self.display_points_spin.value()
+            self.main_window.export_full_resolution = self.export_full_radio_yes.isChecked()
             self.main_window.save_C_stat = self.C_stat_radio_yes.isChecked()
+            C_stat_low, C_stat_high = sorted((self.C_stat_low_spin.value(), self.C_stat_high_spin.value()))
+            self.main_window.processor.c_stat_thresholds = [(C_stat_low, C_stat_high)]
+            self.main_window.processor.modulus_engine.window_seconds = self.modulus_window_spin.value()
+            self.main_window.processor.modulus_engine.overlap = self.modulus_overlap_spin.value() / 100
+            self.main_window.processor.modulus_engine.cycle_index = self.modulus_cycle_spin.value() - 1
+            self.main_window.cache_size_mb = self.cache_size_spin.value()
+            self.main_window.processor.loader.cache.max_size_mb = self.main_window.cache_size_mb
+            self.main_window.processor.loader.cache.evict()
+            self.main_window.processor.compact_storage = self.float32_radio_yes.isChecked()
 
             
 
@@ -254,8 +424,9 @@ class SettingsDialog(QDialog):
             # Пересоздаем фигуры
             self.main_window.create_figures()
             
-            # Перерисовываем данные
-            if hasattr(self.main_window, 'df') and self.main_window.df is not None:
+            # Перерисовываем данные: при смене только оформления расчёт не повторяется.
+            # При слежении за файлом графики обновляет слежение, расчёт - после его остановки
+            if self.main_window.processor.record is not None and self.main_window.live_tail is None:
                 self.main_window.plot_data()
             
             # Восстанавливаем обновление